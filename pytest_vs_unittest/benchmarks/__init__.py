@@ -0,0 +1,31 @@
+"""Benchmarks for the employee APIs (run from ``pytest_vs_unittest/``)."""
+
+import copy
+import random
+
+# --app choices: the module of each implementation
+APPS = {"pytest": "flask_pytest_app.app", "unittest": "flask_unittest_app.app"}
+
+
+def populate(module, count, seed, vary=None):
+    """Replace an app's employees with ``count`` copies of its first seed employee.
+
+    Every copy gets its own id and email; ``vary(rng, emp_id)`` may return
+    more fields to change per employee, drawn from a ``random.Random(seed)``.
+    The indexes are rebuilt. Returns the records as plain dictionaries.
+    """
+    rng = random.Random(seed)
+    template = copy.deepcopy(module.SEED[0] if hasattr(module, "SEED") else module.empleados[0])
+    records = []
+    for emp_id in range(1, count + 1):
+        record = dict(template, id=emp_id, email=f"empleado{emp_id}@empresa.com")
+        if vary is not None:
+            record.update(vary(rng, emp_id))
+        records.append(record)
+    if hasattr(module, "empleados"):
+        module.empleados[:] = [dict(r, version=1) for r in records]
+        module.reindex()
+    else:
+        module.store.employees[:] = [module.Employee(**r) for r in records]
+        module.store.reindex()
+    return records
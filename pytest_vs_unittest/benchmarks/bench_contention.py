@@ -0,0 +1,80 @@
+"""Write throughput of If-Match compare-and-swap updates under concurrent writers.
+
+Each writer thread has its own Flask test client and repeats GET + PUT with
+If-Match, retrying on 412, until it has applied ``--updates`` increments. In
+``spread`` mode writers target different employees; in ``hot`` mode they all
+update employee 1, so most of the cost is conflicts and retries.
+
+Usage (from pytest_vs_unittest/):
+    python -m benchmarks.bench_contention --writers 1,4,16,64 --updates 200
+"""
+
+import argparse
+import copy
+import importlib
+import threading
+import time
+
+from benchmarks import APPS
+
+
+def _reset(module, seed):
+    if hasattr(module, "empleados"):
+        module.empleados[:] = copy.deepcopy(seed)
+        module.reindex()
+    else:
+        module.store.employees[:] = copy.deepcopy(seed)
+        module.store.reindex()
+
+
+def run(module, writers, updates, hot):
+    """Return (updates per second, conflicts) for one configuration."""
+    conflicts = [0] * writers
+    start_barrier = threading.Barrier(writers + 1)
+
+    def writer(index):
+        emp_id = 1 if hot else index % 10 + 1
+        with module.app.test_client() as client:
+            start_barrier.wait()
+            for _ in range(updates):
+                while True:
+                    current = client.get(f"/employees/{emp_id}")
+                    payload = {"salario": current.get_json()["salario"] + 1}
+                    resp = client.put(f"/employees/{emp_id}", json=payload, headers={"If-Match": current.headers["ETag"]})
+                    if resp.status_code == 200:
+                        break
+                    conflicts[index] += 1
+
+    threads = [threading.Thread(target=writer, args=(index,)) for index in range(writers)]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return writers * updates / elapsed, sum(conflicts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", choices=sorted(APPS), action="append", help="App to measure (default: both).")
+    parser.add_argument("--writers", default="1,4,16,64", help="Comma-separated writer counts.")
+    parser.add_argument("--updates", type=int, default=200, help="Successful updates per writer.")
+    args = parser.parse_args()
+
+    for name in args.app or sorted(APPS):
+        module = importlib.import_module(APPS[name])
+        module.app.config["TESTING"] = True
+        seed = copy.deepcopy(module.empleados if hasattr(module, "empleados") else module.store.employees)
+        for mode in ("spread", "hot"):
+            for writers in (int(value) for value in args.writers.split(",")):
+                _reset(module, seed)
+                throughput, conflicts = run(module, writers, args.updates, hot=mode == "hot")
+                attempts = writers * args.updates + conflicts
+                print(f"{name:<9} {mode:<6} writers={writers:<4} {throughput:9.0f} updates/s  conflicts={conflicts / attempts:6.1%}")
+        _reset(module, seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Time of date queries answered by the date index versus a scan of every employee.
+
+Populates ``--employees`` employees with seeded random birth and hire dates
+and times, for each query, GET on the indexed endpoint (JSON included)
+against the same filter written as an in-process scan that parses and
+compares every employee's date, which is what the endpoint would do without
+the index.
+
+Usage (from pytest_vs_unittest/):
+    python -m benchmarks.bench_date_index --employees 1000,10000,100000
+"""
+
+import argparse
+import importlib
+import time
+from datetime import date, timedelta
+
+from benchmarks import APPS, populate
+from date_index import parse_date
+QUERIES = {
+    "hired in Q3 2021": ("/employees/hired", "fecha_contratacion", False, "2021-07-01", "2021-09-30"),
+    "birthdays in March": ("/employees/birthdays", "fecha_nacimiento", True, "2025-03-01", "2025-03-31"),
+    "anniversaries at New Year": ("/employees/anniversaries", "fecha_contratacion", True, "2025-12-29", "2026-01-04"),
+}
+
+
+def _random_day(rng, first, last):
+    return (first + timedelta(days=rng.randrange((last - first).days + 1))).isoformat()
+
+
+def _dates(rng, emp_id):
+    return {
+        "fecha_nacimiento": _random_day(rng, date(1960, 1, 1), date(2004, 12, 31)),
+        "fecha_contratacion": _random_day(rng, date(2005, 1, 1), date(2025, 6, 30)),
+    }
+
+
+def _scan(records, field, recurring, start, end):
+    """The query without an index: parse and compare every employee's date."""
+    if not recurring:
+        return [r for r in records if start <= parse_date(r[field]) <= end]
+    days = {(start + timedelta(n)).strftime("%m-%d") for n in range((end - start).days + 1)}
+    return [r for r in records if parse_date(r[field]).strftime("%m-%d") in days]
+
+
+def _best(operation, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        began = time.perf_counter()
+        result = operation()
+        best = min(best, time.perf_counter() - began)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", choices=sorted(APPS), default="pytest")
+    parser.add_argument("--employees", default="1000,10000,100000", help="comma-separated sizes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    module = importlib.import_module(APPS[args.app])
+    client = module.app.test_client()
+    for count in (int(n) for n in args.employees.split(",")):
+        records = populate(module, count, args.seed, _dates)
+        for name, (path, field, recurring, first, last) in QUERIES.items():
+            start, end = parse_date(first), parse_date(last)
+            indexed, response = _best(lambda: client.get(f"{path}?from={first}&to={last}"), args.repeat)
+            scanned, matches = _best(lambda: _scan(records, field, recurring, start, end), args.repeat)
+            if len(response.get_json()) != len(matches):
+                raise SystemExit(f"{name}: index returned {len(response.get_json())}, scan {len(matches)}")
+            print(f"employees={count:<7} {name:<26} matches={len(matches):<6} index={indexed * 1000:8.2f} ms  scan={scanned * 1000:8.2f} ms  ({indexed / scanned:6.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Payload bytes, request count and time for reading many employees.
+
+Compares, for ``--wanted`` random employees out of ``--employees``:
+one GET /employees/<id> per employee, a single GET /employees?ids=... and
+the same multi-get projected to the four fields most consumers use.
+
+Usage (from pytest_vs_unittest/):
+    python -m benchmarks.bench_projection --employees 5000 --wanted 200
+"""
+
+import argparse
+import importlib
+import random
+import time
+
+from benchmarks import APPS, populate
+
+FIELDS = "id,nombre,apellido,departamento"
+
+
+def _salary(rng, emp_id):
+    return {"salario": float(rng.randint(15, 95) * 1000)}
+
+
+def _measure(client, urls, repeat):
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = sum(len(client.get(url).data) for url in urls)
+        best = min(best, time.perf_counter() - start)
+    return len(urls), size, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", choices=sorted(APPS), default="pytest")
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--wanted", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    module = importlib.import_module(APPS[args.app])
+    populate(module, args.employees, args.seed, _salary)
+    ids = random.Random(args.seed).sample(range(1, args.employees + 1), args.wanted)
+    joined = ",".join(map(str, ids))
+    variants = {
+        "one GET per id": [f"/employees/{i}" for i in ids],
+        "multi-get": [f"/employees?ids={joined}"],
+        "multi-get + fields": [f"/employees?ids={joined}&fields={FIELDS}"],
+    }
+    client = module.app.test_client()
+    results = {name: _measure(client, urls, args.repeat) for name, urls in variants.items()}
+    _, base_bytes, base_time = results["one GET per id"]
+    for name, (requests, size, seconds) in results.items():
+        print(f"{name:<20} requests={requests:<5} bytes={size:>9,}  ({size / base_bytes:6.1%})  time={seconds * 1000:8.2f} ms  ({seconds / base_time:6.1%})")
+
+
+if __name__ == "__main__":
+    main()
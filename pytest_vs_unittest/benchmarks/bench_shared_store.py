@@ -0,0 +1,88 @@
+"""Read throughput of the shared employee store as worker processes are added.
+
+Each worker is a separate process that imports the app with
+EMPLOYEES_STORE_PATH set (as ``gunicorn -w N`` would) and issues
+GET /employees/<id> through its own test client for ``--seconds``. A writer
+process can update employees meanwhile (``--writes-per-second``) so readers
+also pay for picking up published changes. Reads scale with the number of
+cores, not past it; the baseline row is the per-process in-memory store.
+
+Usage (from pytest_vs_unittest/):
+    python -m benchmarks.bench_shared_store --workers 1,2,4,8 --seconds 3
+"""
+
+import argparse
+import importlib
+import multiprocessing
+import os
+import tempfile
+import time
+
+from benchmarks import APPS
+
+
+def _reader(module_name, store_path, ready, start, seconds, results):
+    if store_path:
+        os.environ["EMPLOYEES_STORE_PATH"] = store_path
+    module = importlib.import_module(module_name)
+    client = module.app.test_client()
+    client.get("/employees/1")
+    ready.release()
+    start.wait()
+    count, deadline = 0, time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        client.get(f"/employees/{count % 10 + 1}")
+        count += 1
+    results.put(count)
+
+
+def _writer(module_name, store_path, start, seconds, rate):
+    os.environ["EMPLOYEES_STORE_PATH"] = store_path
+    client = importlib.import_module(module_name).app.test_client()
+    start.wait()
+    deadline, count = time.perf_counter() + seconds, 0
+    while time.perf_counter() < deadline:
+        client.put(f"/employees/{count % 10 + 1}", json={"telefono": str(count)})
+        count += 1
+        time.sleep(1 / rate)
+
+
+def run(module_name, workers, seconds, store_path, writes_per_second):
+    """Return total reads per second over ``workers`` reader processes."""
+    ctx = multiprocessing.get_context("spawn")
+    ready, start, results = ctx.Semaphore(0), ctx.Event(), ctx.Queue()
+    processes = [ctx.Process(target=_reader, args=(module_name, store_path, ready, start, seconds, results)) for _ in range(workers)]
+    if store_path and writes_per_second:
+        processes.append(ctx.Process(target=_writer, args=(module_name, store_path, start, seconds, writes_per_second)))
+    for process in processes:
+        process.start()
+    for _ in range(workers):
+        ready.acquire()
+    start.set()
+    total = sum(results.get() for _ in range(workers))
+    for process in processes:
+        process.join()
+    return total / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", choices=sorted(APPS), default="pytest")
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker process counts.")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--writes-per-second", type=float, default=20.0, help="Background update rate (0 disables).")
+    args = parser.parse_args()
+
+    module_name = APPS[args.app]
+    print(f"cpus={os.cpu_count()} app={args.app}")
+    baseline = run(module_name, 1, args.seconds, None, 0)
+    print(f"{'in-memory':<10} workers=1    {baseline:9.0f} reads/s")
+    for workers in (int(value) for value in args.workers.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "employees.json")
+            throughput = run(module_name, workers, args.seconds, path, args.writes_per_second)
+        print(f"{'shared':<10} workers={workers:<4} {throughput:9.0f} reads/s  ({throughput / baseline:4.2f}x in-memory, 1 worker)")
+
+
+if __name__ == "__main__":
+    main()
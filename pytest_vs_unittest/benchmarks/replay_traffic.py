@@ -0,0 +1,55 @@
+"""Replay recorded API traffic and report throughput, latency and mismatches.
+
+Record with ``EMPLOYEES_RECORD_PATH=traffic.ndjson`` on the server, then
+replay the log against either app in-process (``--app``) or a running server
+(``--url``). The report is printed as JSON; the exit status is 1 when any
+request failed or its response differs from the recording.
+
+Usage (from pytest_vs_unittest/):
+    python -m benchmarks.replay_traffic traffic.ndjson --app pytest --speed max --concurrency 8
+    python -m benchmarks.replay_traffic traffic.ndjson --url http://127.0.0.1:8000 --speed 1
+"""
+
+import argparse
+import importlib
+import json
+import sys
+
+from benchmarks import APPS
+from traffic import ClientSender, HttpSender, read_log, replay
+
+
+def _speed(text):
+    """``max`` (as fast as possible), ``1`` (recorded pace) or any factor N > 0."""
+    if text == "max":
+        return None
+    value = float(text.rstrip("x"))
+    if value <= 0:
+        raise argparse.ArgumentTypeError("la velocidad debe ser mayor que 0")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", help="NDJSON file written by the recorder")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--app", choices=sorted(APPS), default="pytest", help="replay through the app's test client")
+    target.add_argument("--url", help="replay over HTTP against this base URL")
+    parser.add_argument("--speed", type=_speed, default=None, help="'max' (default), 1 for the recorded pace, or N times faster")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--compare-bodies", action="store_true", help="also flag responses whose body differs")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency debe ser al menos 1")
+
+    entries = read_log(args.log)
+    send = HttpSender(args.url) if args.url else ClientSender(importlib.import_module(APPS[args.app]).app)
+    report = replay(entries, send, speed=args.speed, concurrency=args.concurrency, compare_bodies=args.compare_bodies)
+    report["target"] = args.url or args.app
+    json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+    print()
+    return 1 if report["errors"] or report["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Hire-date and birthday indexes for the employee APIs.
+
+Dates arrive as ISO strings (``YYYY-MM-DD``). They are parsed and validated
+once, when an employee is written, and kept in two sorted indexes per field:
+
+- by ordinal date, for ranges such as "hired in Q3 2024";
+- by (month, day), for recurring dates such as "birthdays this month" or
+  "anniversaries this week", including windows that wrap past New Year.
+
+Both are plain sorted lists searched with ``bisect``, so a query costs a
+binary search plus the matching entries instead of a scan of every employee.
+Someone born or hired on 29 February celebrates on 28 February in years
+without one.
+"""
+
+import bisect
+import calendar
+import threading
+from datetime import date
+
+DATE_FIELDS = ("fecha_nacimiento", "fecha_contratacion")
+MAX_RECURRING_DAYS = 366
+_FEB_29 = 229
+
+
+def parse_date(value):
+    """Parse a strict ``YYYY-MM-DD`` string; None stays None.
+
+    Raises:
+        ValueError: If the value is not a valid calendar date in that format
+    """
+    if value is None:
+        return None
+    if not isinstance(value, str) or len(value) != 10 or value[4] != "-" or value[7] != "-":
+        raise ValueError(f"Fecha inválida: {value!r}")
+    return date.fromisoformat(value)
+
+
+def parse_dates(data):
+    """Parse the date fields present in ``data``.
+
+    Returns:
+        (dates by field, None) or (None, name of the first invalid field)
+    """
+    dates = {}
+    for field in DATE_FIELDS:
+        if field in data:
+            try:
+                dates[field] = parse_date(data[field])
+            except ValueError:
+                return None, field
+    return dates, None
+
+
+def _day_key(day):
+    return day.month * 100 + day.day
+
+
+class DateIndex:
+    """Sorted date indexes over records (dicts or objects) keyed by employee id."""
+
+    def __init__(self, fields=DATE_FIELDS):
+        self.fields = tuple(fields)
+        self._lock = threading.Lock()
+        self._records = {}
+        self._dates = {}
+        self._by_date = {field: [] for field in self.fields}
+        self._by_day = {field: [] for field in self.fields}
+
+    def _insert(self, emp_id, record, dates):
+        self._records[emp_id] = record
+        self._dates[emp_id] = dates
+        for field, day in dates.items():
+            if day is not None and field in self._by_date:
+                bisect.insort(self._by_date[field], (day.toordinal(), emp_id))
+                bisect.insort(self._by_day[field], (_day_key(day), emp_id))
+
+    def _delete(self, emp_id):
+        self._records.pop(emp_id, None)
+        for field, day in self._dates.pop(emp_id, {}).items():
+            if day is not None and field in self._by_date:
+                for entries, key in ((self._by_date[field], day.toordinal()), (self._by_day[field], _day_key(day))):
+                    position = bisect.bisect_left(entries, (key, emp_id))
+                    if position < len(entries) and entries[position] == (key, emp_id):
+                        del entries[position]
+
+    def rebuild(self, items):
+        """Replace the whole index with ``(emp_id, record, dates)`` items."""
+        with self._lock:
+            self._records.clear()
+            self._dates.clear()
+            for field in self.fields:
+                self._by_date[field].clear()
+                self._by_day[field].clear()
+            for emp_id, record, dates in items:
+                self._insert(emp_id, record, dates)
+
+    def put(self, emp_id, record, dates):
+        """Index a new employee, or merge changed ``dates`` into an indexed one."""
+        with self._lock:
+            merged = {**self._dates.get(emp_id, {}), **dates}
+            self._delete(emp_id)
+            self._insert(emp_id, record, merged)
+
+    def remove(self, emp_id):
+        with self._lock:
+            self._delete(emp_id)
+
+    def between(self, field, start, end):
+        """Records whose ``field`` is within [start, end], ordered by that date."""
+        with self._lock:
+            entries = self._by_date[field]
+            low = bisect.bisect_left(entries, (start.toordinal(),))
+            high = bisect.bisect_left(entries, (end.toordinal() + 1,))
+            return [self._records[emp_id] for _, emp_id in entries[low:high]]
+
+    def recurring(self, field, start, end):
+        """Records whose ``field`` month and day fall within [start, end], by next occurrence.
+
+        Raises:
+            ValueError: If the window is reversed or longer than a year
+        """
+        if end < start or (end - start).days >= MAX_RECURRING_DAYS:
+            raise ValueError("La ventana debe ir hacia adelante y durar como máximo un año")
+        occurrences = {}
+        with self._lock:
+            entries = self._by_day[field]
+            for year in range(start.year, end.year + 1):
+                first = max(start, date(year, 1, 1))
+                last = min(end, date(year, 12, 31))
+                low = bisect.bisect_left(entries, (_day_key(first),))
+                high = bisect.bisect_left(entries, (_day_key(last) + 1,))
+                hits = entries[low:high]
+                # 29 February falls on 28 February in common years
+                if not calendar.isleap(year) and first <= date(year, 2, 28) <= last:
+                    leap_low = bisect.bisect_left(entries, (_FEB_29,))
+                    leap_high = bisect.bisect_left(entries, (_FEB_29 + 1,))
+                    hits += entries[leap_low:leap_high]
+                for key, emp_id in hits:
+                    month, day = divmod(key, 100)
+                    if key == _FEB_29 and not calendar.isleap(year):
+                        day = 28
+                    occurrences.setdefault(emp_id, date(year, month, day))
+            ordered = sorted(occurrences.items(), key=lambda item: (item[1], item[0]))
+            return [self._records[emp_id] for emp_id, _ in ordered]
+
+
+def window(start_text, end_text):
+    """Parse a ``from``/``to`` pair of query parameters.
+
+    Raises:
+        ValueError: If either is missing or invalid, or ``to`` precedes ``from``
+    """
+    start, end = parse_date(start_text), parse_date(end_text)
+    if start is None or end is None or end < start:
+        raise ValueError("Se requieren 'from' y 'to' válidos con from <= to")
+    return start, end
+
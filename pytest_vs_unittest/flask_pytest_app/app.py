@@ -1,6 +1,25 @@
+import os
+import threading
+from contextlib import contextmanager
+
 from flask import Flask, request, jsonify, make_response
 
+from date_index import DateIndex, parse_dates, window
+from shared_store import STORE_PATH_ENV, SharedRecords
+from traffic import record_if_configured
+
 app = Flask(__name__)
+# With EMPLOYEES_RECORD_PATH set, every request is logged for replay (see traffic)
+record_if_configured(app)
+
+# Optimistic concurrency: every employee carries a version, returned as ETag.
+# Writers to different employees only share one of LOCK_STRIPES locks; creates
+# and email changes also take _email_lock because email must be unique.
+# GET /employees/<id> copies the employee under its lock, so body and ETag
+# always match; the full listing is not a consistent snapshot.
+LOCK_STRIPES = 64
+_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+_email_lock = threading.Lock()
 
 # Semilla de 10 empleados (lista en memoria)
 empleados = [
@@ -15,6 +34,15 @@ empleados = [
     {"id": 9, "nombre": "Mateo", "apellido": "Ortega", "fecha_nacimiento": "1996-09-09", "email": "mateo.ortega@empresa.com", "telefono": "901234567", "puesto": "Intern", "salario": 18000.0, "activo": False, "departamento": "Tecnología", "fecha_contratacion": "2023-05-01"},
     {"id": 10, "nombre": "Elena", "apellido": "Ríos", "fecha_nacimiento": "1989-06-25", "email": "elena.rios@empresa.com", "telefono": "012345678", "puesto": "Arquitecto", "salario": 90000.0, "activo": True, "departamento": "Arquitectura", "fecha_contratacion": "2016-02-29"}
 ]
+for _emp in empleados:
+    _emp["version"] = 1
+
+# Multi-worker deployments: with EMPLOYEES_STORE_PATH set, every worker process
+# shares the records through shared_store instead of keeping its own list.
+_shared = SharedRecords(os.environ[STORE_PATH_ENV], seed=empleados) if os.environ.get(STORE_PATH_ENV) else None
+
+
+EMPLOYEE_FIELDS = ("id", "nombre", "apellido", "fecha_nacimiento", "email", "telefono", "puesto", "salario", "activo", "departamento", "fecha_contratacion", "version")
 
 
 def _next_id():
@@ -23,8 +51,98 @@ def _next_id():
     return max(e["id"] for e in empleados) + 1
 
 
+# id -> employee, kept in step with empleados by every write. Lookups go
+# through it instead of scanning the list, which a concurrent delete may be
+# shifting under the iterator.
+_by_id = {}
+
+
 def _find_employee(emp_id):
-    return next((e for e in empleados if e["id"] == emp_id), None)
+    return _by_id.get(emp_id)
+
+
+# Hire-date and birthday indexes, kept in step by every write (see date_index).
+_dates = DateIndex()
+
+
+def reindex():
+    """Rebuild the id and date indexes after replacing ``empleados`` wholesale."""
+    global _by_id
+    _by_id = {e["id"]: e for e in empleados}
+    _dates.rebuild((e["id"], e, parse_dates(e)[0] or {}) for e in empleados)
+
+
+def _replace_employees(records):
+    empleados[:] = records
+    reindex()
+
+
+def _sync():
+    """Pick up writes published by other worker processes (shared store only)."""
+    if _shared is not None:
+        _shared.refresh(_replace_employees)
+
+
+@contextmanager
+def _shared_write():
+    """Run a write against the latest shared records and publish it to all workers."""
+    if _shared is None:
+        yield
+        return
+    with _shared.write() as records:
+        empleados[:] = records
+        reindex()
+        yield
+        records[:] = empleados
+
+
+reindex()
+
+
+def _lock_for(emp_id):
+    return _locks[emp_id % LOCK_STRIPES]
+
+
+def _with_etag(response, emp):
+    response.set_etag(str(emp["version"]))
+    return response
+
+
+def _precondition_failed(if_match, emp):
+    """True when the request has If-Match and it does not name the current version."""
+    return bool(if_match) and not if_match.contains(str(emp["version"]))
+
+
+def _query_list(name):
+    """Comma-separated query parameter as a de-duplicated list (None if absent)."""
+    raw = request.args.get(name)
+    if raw is None:
+        return None
+    return list(dict.fromkeys(part.strip() for part in raw.split(",") if part.strip()))
+
+
+def _read_options():
+    """Parse ``fields=`` and ``ids=``; returns (fields, ids, error response)."""
+    fields = _query_list("fields")
+    if fields is not None:
+        unknown = [f for f in fields if f not in EMPLOYEE_FIELDS]
+        if unknown or not fields:
+            return None, None, make_response(jsonify({"error": "Campos desconocidos", "unknown": unknown}), 400)
+    ids = _query_list("ids")
+    if ids is not None:
+        if not all(i.isdigit() for i in ids):
+            return None, None, make_response(jsonify({"error": "ids inválidos"}), 400)
+        ids = [int(i) for i in ids]
+    return fields, ids, None
+
+
+def _project(emp, fields):
+    # only the requested keys are copied and serialized
+    return emp if fields is None else {f: emp[f] for f in fields}
+
+
+def _invalid_date(field):
+    return make_response(jsonify({"error": "Fecha inválida", "campo": field}), 400)
 
 
 def _validate_required(data):
@@ -40,15 +158,33 @@ def index():
 
 @app.route('/employees', methods=['GET'])
 def list_employees():
-    return jsonify(empleados)
+    """All employees, or ``?ids=1,2,3`` in one pass; ``?fields=id,nombre`` projects."""
+    fields, ids, error = _read_options()
+    if error is not None:
+        return error
+    _sync()
+    if ids is None:
+        return jsonify(empleados if fields is None else [_project(e, fields) for e in empleados])
+    found = [_find_employee(i) for i in ids]
+    return jsonify([_project(e, fields) for e in found if e is not None])
 
 
 @app.route('/employees/<int:emp_id>', methods=['GET'])
 def get_employee(emp_id):
-    emp = _find_employee(emp_id)
-    if emp is None:
-        return make_response(jsonify({"error": "Empleado no encontrado"}), 404)
-    return jsonify(emp)
+    fields, _, error = _read_options()
+    if error is not None:
+        return error
+    _sync()
+    # copy under the lock so the body and the ETag belong to the same version
+    with _lock_for(emp_id):
+        emp = _find_employee(emp_id)
+        if emp is None:
+            return make_response(jsonify({"error": "Empleado no encontrado"}), 404)
+        body = dict(emp) if fields is None else _project(emp, fields)
+        version = emp["version"]
+    response = jsonify(body)
+    response.set_etag(str(version))
+    return response
 
 
 @app.route('/employees', methods=['POST'])
@@ -57,10 +193,22 @@ def create_employee():
     missing = _validate_required(data)
     if missing:
         return make_response(jsonify({"error": "Campos requeridos faltantes", "missing": missing}), 400)
-    # email uniqueness
-    if any(e["email"] == data.get("email") for e in empleados):
-        return make_response(jsonify({"error": "Email ya existe"}), 400)
-    emp = {
+    dates, invalid = parse_dates(data)
+    if invalid:
+        return _invalid_date(invalid)
+    with _shared_write(), _email_lock:
+        # email uniqueness
+        if any(e["email"] == data.get("email") for e in empleados):
+            return make_response(jsonify({"error": "Email ya existe"}), 400)
+        emp = _new_employee(data)
+        empleados.append(emp)
+        _by_id[emp["id"]] = emp
+        _dates.put(emp["id"], emp, dates)
+    return _with_etag(make_response(jsonify(emp), 201), emp)
+
+
+def _new_employee(data):
+    return {
         "id": _next_id(),
         "nombre": data.get("nombre"),
         "apellido": data.get("apellido"),
@@ -71,32 +219,94 @@ def create_employee():
         "salario": data.get("salario", 0.0),
         "activo": data.get("activo", True),
         "departamento": data.get("departamento"),
-        "fecha_contratacion": data.get("fecha_contratacion")
+        "fecha_contratacion": data.get("fecha_contratacion"),
+        "version": 1,
     }
-    empleados.append(emp)
-    return make_response(jsonify(emp), 201)
 
 
 @app.route('/employees/<int:emp_id>', methods=['PUT'])
 def update_employee(emp_id):
-    emp = _find_employee(emp_id)
-    if emp is None:
-        return make_response(jsonify({"error": "Empleado no encontrado"}), 404)
     data = request.get_json() or {}
-    # If email provided, ensure uniqueness
-    if "email" in data and any(e["email"] == data.get("email") and e["id"] != emp_id for e in empleados):
-        return make_response(jsonify({"error": "Email ya existe"}), 400)
+    dates, invalid = parse_dates(data)
+    if invalid:
+        return _invalid_date(invalid)
+    with _shared_write(), _lock_for(emp_id):
+        emp = _find_employee(emp_id)
+        if emp is None:
+            return make_response(jsonify({"error": "Empleado no encontrado"}), 404)
+        # compare-and-swap: If-Match must name the current version
+        if _precondition_failed(request.if_match, emp):
+            body = {"error": "Versión desactualizada", "version": emp["version"]}
+            return _with_etag(make_response(jsonify(body), 412), emp)
+        if "email" not in data:
+            _apply_update(emp, data)
+        else:
+            with _email_lock:
+                # If email provided, ensure uniqueness
+                if any(e["email"] == data.get("email") and e["id"] != emp_id for e in empleados):
+                    return make_response(jsonify({"error": "Email ya existe"}), 400)
+                _apply_update(emp, data)
+        if dates:
+            _dates.put(emp_id, emp, dates)
+        return _with_etag(jsonify(emp), emp)
+
+
+def _apply_update(emp, data):
     # update allowed fields
     for key in ["nombre", "apellido", "fecha_nacimiento", "email", "telefono", "puesto", "salario", "activo", "departamento", "fecha_contratacion"]:
         if key in data:
             emp[key] = data.get(key)
-    return jsonify(emp)
+    emp["version"] += 1
 
 
 @app.route('/employees/<int:emp_id>', methods=['DELETE'])
 def delete_employee(emp_id):
-    emp = _find_employee(emp_id)
-    if emp is None:
-        return make_response(jsonify({"error": "Empleado no encontrado"}), 404)
-    empleados.remove(emp)
+    with _shared_write(), _lock_for(emp_id):
+        emp = _find_employee(emp_id)
+        if emp is None:
+            return make_response(jsonify({"error": "Empleado no encontrado"}), 404)
+        if _precondition_failed(request.if_match, emp):
+            body = {"error": "Versión desactualizada", "version": emp["version"]}
+            return _with_etag(make_response(jsonify(body), 412), emp)
+        with _email_lock:
+            empleados.remove(emp)
+            del _by_id[emp_id]
+        _dates.remove(emp_id)
     return make_response(jsonify({"message": "Empleado eliminado"}), 200)
+
+
+def _date_query(field, recurring):
+    fields, _, error = _read_options()
+    if error is not None:
+        return error
+    try:
+        start, end = window(request.args.get("from"), request.args.get("to"))
+        _sync()
+        found = _dates.recurring(field, start, end) if recurring else _dates.between(field, start, end)
+    except ValueError as exc:
+        return make_response(jsonify({"error": str(exc)}), 400)
+    return jsonify([_project(e, fields) for e in found])
+
+
+@app.route('/employees/hired', methods=['GET'])
+def hired_between():
+    """Employees hired within ?from=YYYY-MM-DD&to=YYYY-MM-DD, by hire date."""
+    return _date_query("fecha_contratacion", recurring=False)
+
+
+@app.route('/employees/born', methods=['GET'])
+def born_between():
+    """Employees born within ?from=&to=, by birth date."""
+    return _date_query("fecha_nacimiento", recurring=False)
+
+
+@app.route('/employees/birthdays', methods=['GET'])
+def birthdays():
+    """Employees whose birthday falls within ?from=&to= (at most a year), soonest first."""
+    return _date_query("fecha_nacimiento", recurring=True)
+
+
+@app.route('/employees/anniversaries', methods=['GET'])
+def anniversaries():
+    """Employees whose hiring anniversary falls within ?from=&to=, soonest first."""
+    return _date_query("fecha_contratacion", recurring=True)
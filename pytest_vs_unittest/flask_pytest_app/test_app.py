@@ -1,6 +1,18 @@
 import importlib
 import copy
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import types
+from pathlib import Path
+
 import pytest
+from werkzeug.serving import make_server
+
+import traffic
 
 # Importar el módulo de la app
 app_mod = importlib.import_module("flask_pytest_app.app")
@@ -13,6 +25,7 @@ ORIGINAL_EMPLEADOS = copy.deepcopy(app_mod.empleados)
 def client():
     # Restaurar la lista de empleados antes de cada test (in-place)
     app_mod.empleados[:] = copy.deepcopy(ORIGINAL_EMPLEADOS)
+    app_mod.reindex()
     app_mod.app.config["TESTING"] = True
     with app_mod.app.test_client() as client:
         yield client
@@ -111,3 +124,281 @@ def test_delete_employee_not_found(client):
     resp = client.delete("/employees/999")
     assert resp.status_code == 404
     assert resp.get_json().get("error") == "Empleado no encontrado"
+
+
+def test_get_employee_returns_version_as_etag(client):
+    resp = client.get("/employees/1")
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] == '"1"'
+    assert resp.get_json()["version"] == 1
+
+
+def test_update_with_if_match_bumps_version(client):
+    resp = client.put("/employees/1", json={"puesto": "Líder"}, headers={"If-Match": '"1"'})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] == '"2"'
+    assert resp.get_json()["version"] == 2
+
+
+def test_update_with_stale_if_match_returns_412(client):
+    client.put("/employees/1", json={"puesto": "Líder"})
+    resp = client.put("/employees/1", json={"puesto": "Otro"}, headers={"If-Match": '"1"'})
+    assert resp.status_code == 412
+    assert resp.get_json()["version"] == 2
+    assert resp.headers["ETag"] == '"2"'
+    assert client.get("/employees/1").get_json()["puesto"] == "Líder"
+
+
+def test_concurrent_compare_and_swap_loses_no_updates(client):
+    writers, increments = 8, 25
+    salario_inicial = client.get("/employees/1").get_json()["salario"]
+
+    def writer():
+        with app_mod.app.test_client() as own_client:
+            for _ in range(increments):
+                while True:
+                    current = own_client.get("/employees/1")
+                    payload = {"salario": current.get_json()["salario"] + 1}
+                    resp = own_client.put("/employees/1", json=payload, headers={"If-Match": current.headers["ETag"]})
+                    if resp.status_code == 200:
+                        break
+                    assert resp.status_code == 412
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    emp = client.get("/employees/1").get_json()
+    assert emp["salario"] == salario_inicial + writers * increments
+    assert emp["version"] == 1 + writers * increments
+
+
+def test_reads_never_miss_employees_while_others_are_deleted(client):
+    extra = [dict(ORIGINAL_EMPLEADOS[0], id=i, email=f"e{i}@empresa.com") for i in range(11, 1011)]
+    app_mod.empleados.extend(extra)
+    app_mod.reindex()
+    misses = []
+
+    def reader():
+        with app_mod.app.test_client() as own_client:
+            for _ in range(200):
+                resp = own_client.get("/employees/1010?fields=id")
+                if resp.status_code != 200:
+                    misses.append(resp.status_code)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    with app_mod.app.test_client() as own_client:
+        for emp_id in range(11, 1010):
+            assert own_client.delete(f"/employees/{emp_id}").status_code == 200
+    for thread in threads:
+        thread.join()
+
+    assert misses == []
+    assert client.get("/employees?ids=1010,11,1&fields=id").get_json() == [{"id": 1010}, {"id": 1}]
+
+
+def test_shared_store_makes_writes_visible_to_other_worker_processes(tmp_path):
+    env = {**os.environ, "EMPLOYEES_STORE_PATH": str(tmp_path / "employees.json")}
+    project = Path(__file__).resolve().parents[1]
+
+    def worker(code):
+        script = "from flask_pytest_app.app import app\nclient = app.test_client()\n" + code
+        done = subprocess.run([sys.executable, "-c", script], cwd=project, env=env, capture_output=True, text=True, check=True)
+        return done.stdout.strip()
+
+    created = worker("print(client.post('/employees', json={'nombre': 'Ana', 'apellido': 'Sol', 'email': 'ana.sol@empresa.com'}).get_json()['id'])")
+    assert created == "11"
+    assert worker("print(client.get('/employees/11').get_json()['email'])") == "ana.sol@empresa.com"
+    assert worker("print(client.put('/employees/11', json={'puesto': 'QA'}, headers={'If-Match': '\"1\"'}).status_code)") == "200"
+    assert worker("print(client.put('/employees/11', json={'puesto': 'X'}, headers={'If-Match': '\"1\"'}).status_code)") == "412"
+
+
+def test_list_employees_projects_requested_fields(client):
+    resp = client.get("/employees?fields=id,nombre,apellido,departamento")
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert len(data) == len(ORIGINAL_EMPLEADOS)
+    assert all(set(e) == {"id", "nombre", "apellido", "departamento"} for e in data)
+
+
+def test_multi_get_returns_requested_ids_in_order(client):
+    resp = client.get("/employees?ids=3,1,999,3&fields=id,email")
+    assert resp.status_code == 200
+    assert resp.get_json() == [
+        {"id": 3, "email": "luis.ramirez@empresa.com"},
+        {"id": 1, "email": "juan.perez@empresa.com"},
+    ]
+
+
+def test_get_employee_projection_keeps_etag(client):
+    resp = client.get("/employees/1?fields=nombre")
+    assert resp.get_json() == {"nombre": "Juan"}
+    assert resp.headers["ETag"] == '"1"'
+
+
+def test_invalid_fields_or_ids_return_400(client):
+    resp = client.get("/employees?fields=id,sueldo")
+    assert resp.status_code == 400
+    assert resp.get_json()["unknown"] == ["sueldo"]
+    assert client.get("/employees?ids=1,dos").status_code == 400
+
+
+def test_hired_between_returns_employees_ordered_by_hire_date(client):
+    resp = client.get("/employees/hired?from=2015-07-01&to=2018-09-30&fields=id,fecha_contratacion")
+    assert resp.status_code == 200
+    assert [e["id"] for e in resp.get_json()] == [7, 10, 5, 4]
+    assert resp.get_json()[0] == {"id": 7, "fecha_contratacion": "2015-07-18"}
+
+
+def test_anniversary_on_february_29_falls_on_february_28_in_common_years(client):
+    common = client.get("/employees/anniversaries?from=2025-02-20&to=2025-03-20&fields=id")
+    leap = client.get("/employees/anniversaries?from=2024-02-29&to=2024-02-29&fields=id")
+    assert common.get_json() == [{"id": 10}, {"id": 2}]
+    assert leap.get_json() == [{"id": 10}]
+    assert client.get("/employees/anniversaries?from=2025-03-01&to=2025-03-01").get_json() == []
+
+
+def test_birthdays_window_can_wrap_past_new_year(client):
+    resp = client.get("/employees/birthdays?from=2025-12-01&to=2026-01-31&fields=id")
+    assert resp.get_json() == [{"id": 7}, {"id": 1}]
+
+
+def test_date_index_follows_creates_updates_and_deletes(client):
+    client.post("/employees", json={"nombre": "Ana", "apellido": "Sol", "email": "ana.sol@empresa.com", "fecha_contratacion": "2021-08-01"})
+    client.put("/employees/3", json={"fecha_contratacion": "2021-09-30"})
+    client.delete("/employees/6")
+    resp = client.get("/employees/hired?from=2021-07-01&to=2022-12-31&fields=id")
+    assert resp.get_json() == [{"id": 11}, {"id": 3}]
+
+
+def test_invalid_dates_and_windows_return_400(client):
+    resp = client.post("/employees", json={"nombre": "A", "apellido": "B", "email": "a@b.com", "fecha_nacimiento": "1990-02-30"})
+    assert resp.status_code == 400
+    assert resp.get_json() == {"error": "Fecha inválida", "campo": "fecha_nacimiento"}
+    assert client.put("/employees/1", json={"fecha_contratacion": "01/02/2020"}).status_code == 400
+    assert client.get("/employees/1").get_json()["fecha_contratacion"] == "2020-01-01"
+    assert client.get("/employees/hired?from=2020-01-01").status_code == 400
+    assert client.get("/employees/hired?from=2021-01-01&to=2020-01-01").status_code == 400
+    assert client.get("/employees/birthdays?from=2025-01-01&to=2026-01-02").status_code == 400
+
+
+@pytest.fixture
+def recorded(client, tmp_path):
+    # Grabar las peticiones del test en un NDJSON y restaurar la app al final
+    original = app_mod.app.wsgi_app
+    recorder = app_mod.app.wsgi_app = traffic.RequestRecorder(original, tmp_path / "traffic.ndjson")
+    yield recorder
+    recorder.close()
+    app_mod.app.wsgi_app = original
+
+
+def test_recorder_logs_requests_as_compact_ndjson(client, recorded):
+    client.get("/employees/1?fields=id")
+    client.put("/employees/1", json={"puesto": "Líder"}, headers={"If-Match": '"1"'})
+    recorded.flush()
+    first, second = traffic.read_log(recorded.path)
+    assert first["m"] == "GET" and first["p"] == "/employees/1?fields=id" and first["s"] == 200
+    assert "b" not in first and first["d"] >= 0
+    assert second["m"] == "PUT" and second["i"] == '"1"' and second["c"] == "application/json"
+    assert json.loads(second["b"]) == {"puesto": "Líder"}
+    assert os.stat(recorded.path).st_mode & 0o777 == 0o600
+
+
+def test_recorder_logs_responses_closed_before_iteration(tmp_path):
+    closed = []
+
+    class Result(list):
+        def close(self):
+            closed.append(True)
+
+    def wsgi_app(environ, start_response):
+        start_response("204 No Content", [])
+        return Result([b""])
+
+    recorder = traffic.RequestRecorder(wsgi_app, tmp_path / "traffic.ndjson")
+    environ = {"REQUEST_METHOD": "GET", "PATH_INFO": "/", "wsgi.input": None}
+    body = recorder(environ, lambda status, headers, exc_info=None: None)
+    body.close()
+    body.close()
+    recorder.close()
+    assert closed == [True]
+    [entry] = traffic.read_log(recorder.path)
+    assert entry["m"] == "GET" and entry["s"] == 204 and entry["h"] == 0
+
+
+def test_http_sender_resends_only_requests_that_cannot_have_been_applied():
+    sent, failures = [], []
+
+    class Connection:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def request(self, method, path, body=None, headers=None):
+            sent.append(method)
+
+        def getresponse(self):
+            if failures:
+                raise failures.pop()
+            return types.SimpleNamespace(status=200, read=lambda: b"{}")
+
+        def close(self):
+            pass
+
+    sender = traffic.HttpSender("http://127.0.0.1:8000")
+    sender._connection_class = Connection
+    assert sender({"m": "GET", "p": "/"}) == (200, b"{}")
+
+    failures.append(ConnectionResetError())
+    assert sender({"m": "GET", "p": "/employees/1"}) == (200, b"{}")
+    failures.append(http.client.RemoteDisconnected())
+    assert sender({"m": "POST", "p": "/employees"}) == (200, b"{}")
+    failures.append(ConnectionResetError())
+    with pytest.raises(ConnectionResetError):
+        sender({"m": "PUT", "p": "/employees/1"})
+    # a fresh connection is never retried
+    failures.append(http.client.RemoteDisconnected())
+    with pytest.raises(http.client.RemoteDisconnected):
+        sender({"m": "GET", "p": "/"})
+    assert sent == ["GET", "GET", "GET", "POST", "POST", "PUT", "GET"]
+
+
+def test_replay_of_recorded_traffic_matches_on_a_fresh_app(client, recorded):
+    client.post("/employees", json={"nombre": "Ana", "apellido": "Sol", "email": "ana.sol@empresa.com"})
+    client.put("/employees/11", json={"puesto": "QA"}, headers={"If-Match": '"1"'})
+    client.get("/employees/11")
+    client.delete("/employees/99")
+    recorded.close()
+    entries = traffic.read_log(recorded.path)
+    app_mod.empleados[:] = copy.deepcopy(ORIGINAL_EMPLEADOS)
+    app_mod.reindex()
+    report = traffic.replay(entries, traffic.ClientSender(app_mod.app), compare_bodies=True)
+    assert report["requests"] == 4 and report["errors"] == 0
+    assert report["mismatches"] == 0
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["max"]
+    # sobre el estado ya modificado, el alta repetida choca con el email
+    report = traffic.replay(entries, traffic.ClientSender(app_mod.app))
+    assert report["mismatch_examples"][0] == {"index": 0, "method": "POST", "path": "/employees", "recorded": 201, "replayed": 400}
+
+
+def test_replay_keeps_recorded_pace_scaled_by_speed(client):
+    entries = [{"t": 100.0, "m": "GET", "p": "/", "s": 200}, {"t": 100.4, "m": "GET", "p": "/", "s": 200}]
+    report = traffic.replay(entries, traffic.ClientSender(app_mod.app), speed=2, concurrency=2)
+    assert report["seconds"] >= 0.2
+    assert traffic.replay(entries, traffic.ClientSender(app_mod.app))["seconds"] < 0.2
+
+
+def test_replay_over_http_reports_failed_requests(client):
+    server = make_server("127.0.0.1", 0, app_mod.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    entries = [{"t": 0, "m": "GET", "p": "/employees/2?fields=id", "s": 200}]
+    try:
+        report = traffic.replay(entries * 3, traffic.HttpSender(f"http://127.0.0.1:{server.server_port}"), concurrency=3)
+    finally:
+        server.shutdown()
+    assert report["requests"] == 3 and report["mismatches"] == 0
+    report = traffic.replay(entries, traffic.HttpSender(f"http://127.0.0.1:{server.server_port}", timeout=1))
+    assert report["errors"] == 1 and "error" in report["mismatch_examples"][0]
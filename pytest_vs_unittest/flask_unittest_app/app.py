@@ -1,11 +1,22 @@
 from flask import Flask, request, jsonify, make_response
+from contextlib import contextmanager
 from copy import deepcopy
+import os
+import threading
+
+from date_index import DATE_FIELDS, DateIndex, parse_dates, window
+from shared_store import STORE_PATH_ENV, SharedRecords
+from traffic import record_if_configured
 
 app = Flask(__name__)
+# With EMPLOYEES_RECORD_PATH set, every request is logged for replay (see traffic)
+record_if_configured(app)
 
 
 class Employee:
-    def __init__(self, id, nombre, apellido, email, fecha_nacimiento=None, telefono=None, puesto=None, salario=0.0, activo=True, departamento=None, fecha_contratacion=None):
+    FIELDS = ("id", "nombre", "apellido", "fecha_nacimiento", "email", "telefono", "puesto", "salario", "activo", "departamento", "fecha_contratacion", "version")
+
+    def __init__(self, id, nombre, apellido, email, fecha_nacimiento=None, telefono=None, puesto=None, salario=0.0, activo=True, departamento=None, fecha_contratacion=None, version=1):
         self.id = id
         self.nombre = nombre
         self.apellido = apellido
@@ -17,6 +28,11 @@ class Employee:
         self.activo = activo
         self.departamento = departamento
         self.fecha_contratacion = fecha_contratacion
+        self.version = version
+
+    def project(self, fields):
+        """Only the requested attributes, without building the full ``to_dict()``."""
+        return {f: getattr(self, f) for f in fields}
 
     def to_dict(self):
         return {
@@ -31,27 +47,100 @@ class Employee:
             "activo": self.activo,
             "departamento": self.departamento,
             "fecha_contratacion": self.fecha_contratacion,
+            "version": self.version,
         }
 
 
 class EmployeeStore:
+    """In-memory employees with optimistic concurrency.
+
+    Every employee carries a version that is bumped on each update. ``update``
+    and ``delete`` take an optional set of expected versions (from If-Match)
+    and fail with 412 when the current version is not in it. Writers to
+    different employees share only one of ``LOCK_STRIPES`` locks; creates and
+    email changes also take ``_email_lock`` because email must be unique.
+    ``get`` copies one employee under its lock; ``list`` is not a snapshot.
+    Lookups by id use ``_by_id`` rather than scanning ``employees``, which a
+    concurrent delete may be shifting. Hire and birth dates are validated on
+    write and indexed (``_dates``) for the range and recurring-date queries;
+    call ``reindex`` after replacing ``employees`` wholesale.
+    """
+
+    LOCK_STRIPES = 64
+
     def __init__(self, seed=None):
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._email_lock = threading.Lock()
         self.employees = []
+        self._by_id = {}
+        self._dates = DateIndex()
         if seed:
             for d in seed:
                 emp = Employee(**d)
                 self.employees.append(emp)
+        self.reindex()
+
+    def reindex(self):
+        """Rebuild the id and date indexes from ``employees``."""
+        self._by_id = {e.id: e for e in self.employees}
+        self._dates.rebuild(
+            (e.id, e, parse_dates({f: getattr(e, f) for f in DATE_FIELDS})[0] or {})
+            for e in self.employees
+        )
 
     def _next_id(self):
         if not self.employees:
             return 1
         return max(e.id for e in self.employees) + 1
 
-    def list(self):
-        return [e.to_dict() for e in self.employees]
+    def _serialize(self, emp, fields):
+        return emp.to_dict() if fields is None else emp.project(fields)
+
+    def list(self, fields=None):
+        return [self._serialize(e, fields) for e in self.employees]
+
+    def get_many(self, ids, fields=None):
+        """Employees with these ids in request order; unknown ids are skipped."""
+        found = [self.find(i) for i in ids]
+        return [self._serialize(e, fields) for e in found if e is not None]
+
+    def hired_between(self, start, end, fields=None):
+        return [self._serialize(e, fields) for e in self._dates.between("fecha_contratacion", start, end)]
+
+    def born_between(self, start, end, fields=None):
+        return [self._serialize(e, fields) for e in self._dates.between("fecha_nacimiento", start, end)]
+
+    def birthdays(self, start, end, fields=None):
+        """Birthdays within [start, end] (at most a year), soonest first."""
+        return [self._serialize(e, fields) for e in self._dates.recurring("fecha_nacimiento", start, end)]
+
+    def anniversaries(self, start, end, fields=None):
+        """Hiring anniversaries within [start, end] (at most a year), soonest first."""
+        return [self._serialize(e, fields) for e in self._dates.recurring("fecha_contratacion", start, end)]
 
     def find(self, emp_id):
-        return next((e for e in self.employees if e.id == emp_id), None)
+        return self._by_id.get(emp_id)
+
+    def _lock_for(self, emp_id):
+        return self._locks[emp_id % self.LOCK_STRIPES]
+
+    @staticmethod
+    def _conflict(emp, expected):
+        if expected is None or emp.version in expected:
+            return None
+        return {"error": "Versión desactualizada", "version": emp.version}, 412
+
+    def get(self, emp_id, fields=None):
+        """Return a consistent copy of one employee (body and version match)."""
+        return self.get_with_version(emp_id, fields)[0]
+
+    def get_with_version(self, emp_id, fields=None):
+        """Return (employee dict or None, version) read under the employee's lock."""
+        with self._lock_for(emp_id):
+            emp = self.find(emp_id)
+            if emp is None:
+                return None, None
+            return self._serialize(emp, fields), emp.version
 
     def exists_email(self, email, exclude_id=None):
         return any(e.email == email and (exclude_id is None or e.id != exclude_id) for e in self.employees)
@@ -61,9 +150,20 @@ class EmployeeStore:
         missing = [f for f in required if f not in data or not str(data.get(f)).strip()]
         if missing:
             return {"error": "Campos requeridos faltantes", "missing": missing}, 400
-        if self.exists_email(data.get("email")):
-            return {"error": "Email ya existe"}, 400
-        emp = Employee(
+        dates, invalid = parse_dates(data)
+        if invalid:
+            return {"error": "Fecha inválida", "campo": invalid}, 400
+        with self._email_lock:
+            if self.exists_email(data.get("email")):
+                return {"error": "Email ya existe"}, 400
+            emp = self._new_employee(data)
+            self.employees.append(emp)
+            self._by_id[emp.id] = emp
+            self._dates.put(emp.id, emp, dates)
+        return emp.to_dict(), 201
+
+    def _new_employee(self, data):
+        return Employee(
             id=self._next_id(),
             nombre=data.get("nombre"),
             apellido=data.get("apellido"),
@@ -76,28 +176,119 @@ class EmployeeStore:
             departamento=data.get("departamento"),
             fecha_contratacion=data.get("fecha_contratacion"),
         )
-        self.employees.append(emp)
-        return emp.to_dict(), 201
 
-    def update(self, emp_id, data):
-        emp = self.find(emp_id)
-        if emp is None:
-            return {"error": "Empleado no encontrado"}, 404
-        if "email" in data and self.exists_email(data.get("email"), exclude_id=emp_id):
-            return {"error": "Email ya existe"}, 400
+    def update(self, emp_id, data, expected=None):
+        """Update an employee; ``expected`` is None or the acceptable versions."""
+        dates, invalid = parse_dates(data)
+        if invalid:
+            return {"error": "Fecha inválida", "campo": invalid}, 400
+        with self._lock_for(emp_id):
+            emp = self.find(emp_id)
+            if emp is None:
+                return {"error": "Empleado no encontrado"}, 404
+            conflict = self._conflict(emp, expected)
+            if conflict:
+                return conflict
+            if "email" not in data:
+                self._apply_update(emp, data)
+            else:
+                with self._email_lock:
+                    if self.exists_email(data.get("email"), exclude_id=emp_id):
+                        return {"error": "Email ya existe"}, 400
+                    self._apply_update(emp, data)
+            if dates:
+                self._dates.put(emp_id, emp, dates)
+            return emp.to_dict(), 200
+
+    @staticmethod
+    def _apply_update(emp, data):
         for key in ["nombre", "apellido", "fecha_nacimiento", "email", "telefono", "puesto", "salario", "activo", "departamento", "fecha_contratacion"]:
             if key in data:
                 setattr(emp, key, data.get(key))
-        return emp.to_dict(), 200
+        emp.version += 1
 
-    def delete(self, emp_id):
-        emp = self.find(emp_id)
-        if emp is None:
-            return {"error": "Empleado no encontrado"}, 404
-        self.employees.remove(emp)
+    def delete(self, emp_id, expected=None):
+        with self._lock_for(emp_id):
+            emp = self.find(emp_id)
+            if emp is None:
+                return {"error": "Empleado no encontrado"}, 404
+            conflict = self._conflict(emp, expected)
+            if conflict:
+                return conflict
+            with self._email_lock:
+                self.employees.remove(emp)
+                del self._by_id[emp_id]
+            self._dates.remove(emp_id)
         return {"message": "Empleado eliminado"}, 200
 
 
+class SharedEmployeeStore(EmployeeStore):
+    """EmployeeStore shared by every worker process on the host (see shared_store).
+
+    Reads refresh ``employees`` only when another worker published a change;
+    writes run the usual EmployeeStore logic on the latest records while
+    holding the cross-process write lock, then publish the result.
+    """
+
+    def __init__(self, path, seed=None):
+        super().__init__()
+        self._shared = SharedRecords(path, seed=[Employee(**d).to_dict() for d in seed or []])
+
+    def _replace(self, records):
+        self.employees[:] = [Employee(**r) for r in records]
+        self.reindex()
+
+    def _sync(self):
+        self._shared.refresh(self._replace)
+
+    @contextmanager
+    def _writing(self):
+        with self._shared.write() as records:
+            self._replace(records)
+            yield
+            records[:] = [e.to_dict() for e in self.employees]
+
+    def list(self, fields=None):
+        self._sync()
+        return super().list(fields)
+
+    def get_many(self, ids, fields=None):
+        self._sync()
+        return super().get_many(ids, fields)
+
+    def get_with_version(self, emp_id, fields=None):
+        self._sync()
+        return super().get_with_version(emp_id, fields)
+
+    def hired_between(self, start, end, fields=None):
+        self._sync()
+        return super().hired_between(start, end, fields)
+
+    def born_between(self, start, end, fields=None):
+        self._sync()
+        return super().born_between(start, end, fields)
+
+    def birthdays(self, start, end, fields=None):
+        self._sync()
+        return super().birthdays(start, end, fields)
+
+    def anniversaries(self, start, end, fields=None):
+        self._sync()
+        return super().anniversaries(start, end, fields)
+
+    def create(self, data):
+        with self._writing():
+            return super().create(data)
+
+    def update(self, emp_id, data, expected=None):
+        with self._writing():
+            return super().update(emp_id, data, expected)
+
+    def delete(self, emp_id, expected=None):
+        with self._writing():
+            return super().delete(emp_id, expected)
+
+
 # Seed data - same structure keys expected by Employee
 SEED = [
     {"id": 1, "nombre": "Juan", "apellido": "Pérez", "fecha_nacimiento": "1990-01-01", "email": "juan.perez@empresa.com", "telefono": "123456789", "puesto": "Desarrollador", "salario": 50000.0, "activo": True, "departamento": "Tecnología", "fecha_contratacion": "2020-01-01"},
@@ -113,8 +304,50 @@ SEED = [
 ]
 
 
-# Create store and expose as module-level variable for tests to manipulate
-store = EmployeeStore(seed=SEED)
+# Create store and expose as module-level variable for tests to manipulate.
+# With EMPLOYEES_STORE_PATH set, all worker processes share one store.
+if os.environ.get(STORE_PATH_ENV):
+    store = SharedEmployeeStore(os.environ[STORE_PATH_ENV], seed=SEED)
+else:
+    store = EmployeeStore(seed=SEED)
+
+
+def _expected_versions():
+    """Versions named by If-Match (None when absent or ``*``)."""
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+    return {int(tag) for tag in if_match.as_set() if tag.isdigit()}
+
+
+def _query_list(name):
+    """Comma-separated query parameter as a de-duplicated list (None if absent)."""
+    raw = request.args.get(name)
+    if raw is None:
+        return None
+    return list(dict.fromkeys(part.strip() for part in raw.split(",") if part.strip()))
+
+
+def _read_options():
+    """Parse ``fields=`` and ``ids=``; returns (fields, ids, error response)."""
+    fields = _query_list("fields")
+    if fields is not None:
+        unknown = [f for f in fields if f not in Employee.FIELDS]
+        if unknown or not fields:
+            return None, None, make_response(jsonify({"error": "Campos desconocidos", "unknown": unknown}), 400)
+    ids = _query_list("ids")
+    if ids is not None:
+        if not all(i.isdigit() for i in ids):
+            return None, None, make_response(jsonify({"error": "ids inválidos"}), 400)
+        ids = [int(i) for i in ids]
+    return fields, ids, None
+
+
+def _response(result, code):
+    response = make_response(jsonify(result), code)
+    if "version" in result:
+        response.set_etag(str(result["version"]))
+    return response
 
 
 @app.route("/")
@@ -124,32 +357,75 @@ def index():
 
 @app.route("/employees", methods=["GET"])
 def list_employees():
-    return jsonify(store.list())
+    """All employees, or ``?ids=1,2,3`` in one pass; ``?fields=id,nombre`` projects."""
+    fields, ids, error = _read_options()
+    if error is not None:
+        return error
+    if ids is None:
+        return jsonify(store.list(fields))
+    return jsonify(store.get_many(ids, fields))
 
 
 @app.route("/employees/<int:emp_id>", methods=["GET"])
 def get_employee(emp_id):
-    emp = store.find(emp_id)
+    fields, _, error = _read_options()
+    if error is not None:
+        return error
+    emp, version = store.get_with_version(emp_id, fields)
     if emp is None:
         return make_response(jsonify({"error": "Empleado no encontrado"}), 404)
-    return jsonify(emp.to_dict())
+    response = jsonify(emp)
+    response.set_etag(str(version))
+    return response
 
 
 @app.route("/employees", methods=["POST"])
 def create_employee():
     data = request.get_json() or {}
     result, code = store.create(data)
-    return make_response(jsonify(result), code)
+    return _response(result, code)
 
 
 @app.route("/employees/<int:emp_id>", methods=["PUT"])
 def update_employee(emp_id):
     data = request.get_json() or {}
-    result, code = store.update(emp_id, data)
-    return make_response(jsonify(result), code)
+    result, code = store.update(emp_id, data, _expected_versions())
+    return _response(result, code)
 
 
 @app.route("/employees/<int:emp_id>", methods=["DELETE"])
 def delete_employee(emp_id):
-    result, code = store.delete(emp_id)
-    return make_response(jsonify(result), code)
+    result, code = store.delete(emp_id, _expected_versions())
+    return _response(result, code)
+
+
+def _date_query(query):
+    """Run ``query(start, end, fields)`` for ``?from=&to=`` (and ``fields=``)."""
+    fields, _, error = _read_options()
+    if error is not None:
+        return error
+    try:
+        start, end = window(request.args.get("from"), request.args.get("to"))
+        return jsonify(query(start, end, fields))
+    except ValueError as exc:
+        return make_response(jsonify({"error": str(exc)}), 400)
+
+
+@app.route("/employees/hired", methods=["GET"])
+def hired_between():
+    return _date_query(store.hired_between)
+
+
+@app.route("/employees/born", methods=["GET"])
+def born_between():
+    return _date_query(store.born_between)
+
+
+@app.route("/employees/birthdays", methods=["GET"])
+def birthdays():
+    return _date_query(store.birthdays)
+
+
+@app.route("/employees/anniversaries", methods=["GET"])
+def anniversaries():
+    return _date_query(store.anniversaries)
@@ -1,9 +1,14 @@
 import copy
+import os
+import tempfile
+import threading
 import unittest
 from flask import json
 
 import importlib
 
+import traffic
+
 # Importar el módulo de la app orientada a objetos
 app_mod = importlib.import_module("flask_unittest_app.app")
 
@@ -25,6 +30,7 @@ class TestEmpleadoCRUD(unittest.TestCase):
     def tearDown(self):
         # Restaurar el estado original (in-place)
         app_mod.store.employees[:] = self._backup
+        app_mod.store.reindex()
 
     def test_index(self):
         resp = self.client.get('/')
@@ -108,6 +114,141 @@ class TestEmpleadoCRUD(unittest.TestCase):
         self.assertEqual(resp.status_code, 404)
         self.assertEqual(resp.get_json().get('error'), 'Empleado no encontrado')
 
+    def test_get_employee_returns_version_as_etag(self):
+        resp = self.client.get('/employees/1')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers['ETag'], '"1"')
+        self.assertEqual(resp.get_json()['version'], 1)
+
+    def test_update_with_if_match_bumps_version(self):
+        resp = self.client.put('/employees/1', data=json.dumps({'puesto': 'Líder'}), content_type='application/json', headers={'If-Match': '"1"'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers['ETag'], '"2"')
+        self.assertEqual(resp.get_json()['version'], 2)
+
+    def test_update_with_stale_if_match_returns_412(self):
+        self.client.put('/employees/1', data=json.dumps({'puesto': 'Líder'}), content_type='application/json')
+        resp = self.client.put('/employees/1', data=json.dumps({'puesto': 'Otro'}), content_type='application/json', headers={'If-Match': '"1"'})
+        self.assertEqual(resp.status_code, 412)
+        self.assertEqual(resp.get_json()['version'], 2)
+        self.assertEqual(self.client.get('/employees/1').get_json()['puesto'], 'Líder')
+
+    def test_delete_with_stale_if_match_returns_412(self):
+        resp = self.client.delete('/employees/1', headers={'If-Match': '"7"'})
+        self.assertEqual(resp.status_code, 412)
+        self.assertEqual(self.client.get('/employees/1').status_code, 200)
+
+    def test_reads_never_miss_employees_while_others_are_deleted(self):
+        store = app_mod.store
+        for i in range(11, 1011):
+            store.employees.append(app_mod.Employee(id=i, nombre='N', apellido='A', email=f'e{i}@empresa.com'))
+        store.reindex()
+        misses = []
+
+        def reader():
+            for _ in range(200):
+                if store.get(1010, fields=['id']) is None:
+                    misses.append(1010)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for emp_id in range(11, 1010):
+            self.assertEqual(store.delete(emp_id)[1], 200)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(misses, [])
+        self.assertEqual(store.get_many([1010, 11, 1], fields=['id']), [{'id': 1010}, {'id': 1}])
+
+    def test_list_employees_projects_requested_fields(self):
+        resp = self.client.get('/employees?fields=id,nombre,apellido,departamento')
+        self.assertEqual(resp.status_code, 200)
+        for emp in resp.get_json():
+            self.assertEqual(set(emp), {'id', 'nombre', 'apellido', 'departamento'})
+
+    def test_multi_get_returns_requested_ids_in_order(self):
+        resp = self.client.get('/employees?ids=2,999,1&fields=id,nombre')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json(), [{'id': 2, 'nombre': 'María'}, {'id': 1, 'nombre': 'Juan'}])
+
+    def test_invalid_fields_return_400(self):
+        resp = self.client.get('/employees/1?fields=sueldo')
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.get_json().get('unknown'), ['sueldo'])
+
+    def test_hired_between_returns_employees_ordered_by_hire_date(self):
+        resp = self.client.get('/employees/hired?from=2015-07-01&to=2018-09-30&fields=id')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json(), [{'id': 7}, {'id': 10}, {'id': 5}, {'id': 4}])
+
+    def test_anniversary_on_february_29_falls_on_february_28_in_common_years(self):
+        resp = self.client.get('/employees/anniversaries?from=2025-02-20&to=2025-03-20&fields=id')
+        self.assertEqual(resp.get_json(), [{'id': 10}, {'id': 2}])
+
+    def test_birthdays_window_can_wrap_past_new_year(self):
+        resp = self.client.get('/employees/birthdays?from=2025-12-01&to=2026-01-31&fields=id')
+        self.assertEqual(resp.get_json(), [{'id': 7}, {'id': 1}])
+
+    def test_date_index_follows_updates_and_deletes(self):
+        self.client.put('/employees/3', json={'fecha_contratacion': '2021-09-30'})
+        self.client.delete('/employees/6')
+        resp = self.client.get('/employees/hired?from=2021-07-01&to=2022-12-31&fields=id')
+        self.assertEqual(resp.get_json(), [{'id': 3}])
+
+    def test_invalid_dates_and_windows_return_400(self):
+        resp = self.client.put('/employees/1', json={'fecha_nacimiento': '1990-02-30'})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.get_json(), {'error': 'Fecha inválida', 'campo': 'fecha_nacimiento'})
+        self.assertEqual(self.client.get('/employees/birthdays?from=2025-01-01&to=2026-01-02').status_code, 400)
+
+    def test_recorded_traffic_replays_without_mismatches(self):
+        original = app_mod.app.wsgi_app
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder = app_mod.app.wsgi_app = traffic.RequestRecorder(original, os.path.join(tmp, 'traffic.ndjson'))
+            try:
+                self.client.put('/employees/2', json={'puesto': 'Líder'}, headers={'If-Match': '"1"'})
+                self.client.get('/employees/2')
+            finally:
+                recorder.close()
+                app_mod.app.wsgi_app = original
+            entries = traffic.read_log(recorder.path)
+        self.assertEqual([e['m'] for e in entries], ['PUT', 'GET'])
+        app_mod.store.employees[:] = copy.deepcopy(self._backup)
+        app_mod.store.reindex()
+        report = traffic.replay(entries, traffic.ClientSender(app_mod.app), compare_bodies=True)
+        self.assertEqual((report['requests'], report['mismatches']), (2, 0))
+
+
+class TestSharedEmployeeStore(unittest.TestCase):
+    """Dos instancias sobre el mismo archivo simulan dos procesos trabajadores."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self._tmp.name, 'employees.json')
+        self.worker_a = app_mod.SharedEmployeeStore(path, seed=app_mod.SEED)
+        self.worker_b = app_mod.SharedEmployeeStore(path, seed=app_mod.SEED)
+
+    def tearDown(self):
+        self.worker_a._shared.close()
+        self.worker_b._shared.close()
+        self._tmp.cleanup()
+
+    def test_writes_are_visible_to_every_worker(self):
+        result, code = self.worker_a.create({'nombre': 'Ana', 'apellido': 'Sol', 'email': 'ana.sol@empresa.com'})
+        self.assertEqual(code, 201)
+        self.assertEqual(self.worker_b.get(result['id'])['email'], 'ana.sol@empresa.com')
+        self.assertEqual(len(self.worker_b.list()), len(app_mod.SEED) + 1)
+        # el siguiente id se calcula sobre los registros compartidos
+        result_b, _ = self.worker_b.create({'nombre': 'Eva', 'apellido': 'Luz', 'email': 'eva.luz@empresa.com'})
+        self.assertEqual(result_b['id'], result['id'] + 1)
+
+    def test_versions_and_email_uniqueness_hold_across_workers(self):
+        self.assertEqual(self.worker_a.update(1, {'puesto': 'Líder'}, expected={1})[1], 200)
+        result, code = self.worker_b.update(1, {'puesto': 'Otro'}, expected={1})
+        self.assertEqual(code, 412)
+        self.assertEqual(result['version'], 2)
+        self.assertEqual(self.worker_b.update(2, {'email': 'juan.perez@empresa.com'})[1], 400)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
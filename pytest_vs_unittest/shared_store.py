@@ -0,0 +1,131 @@
+"""Employee records shared by every worker process of an API on one host.
+
+Both apps keep their employees in per-process memory, so several workers
+(e.g. ``gunicorn -w 4``) would each hold a different copy. When the
+``EMPLOYEES_STORE_PATH`` environment variable is set, they use this store
+instead:
+
+- ``<path>`` holds the records as JSON and is always replaced atomically
+  (temporary file + ``os.replace``), so a reader never sees half a write;
+- ``<path>.gen`` holds an 8-byte generation counter that every worker maps
+  with ``mmap`` and writers bump after each replace;
+- ``<path>.lock`` is locked with ``flock`` by writers (and by a thread lock
+  inside each process), so writes from all workers are serialized.
+
+Reads stay in-process: each worker keeps its decoded copy and only reloads
+the file when the mapped generation changed, which costs one memory read per
+request. Writes reload the latest records under the lock, apply the change
+and publish it to every worker. The file is not fsynced: like the in-memory
+lists it replaces, it does not survive a power loss. POSIX only (``flock``).
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: the apps still import, only the shared store is unavailable
+    fcntl = None
+
+STORE_PATH_ENV = "EMPLOYEES_STORE_PATH"
+_GENERATION = struct.Struct("<Q")
+
+
+class SharedRecords:
+    """A list of JSON records shared through a file, a lock and a generation counter."""
+
+    def __init__(self, path, seed=()):
+        if fcntl is None:
+            raise RuntimeError(f"{STORE_PATH_ENV} requires a POSIX system (fcntl.flock)")
+        self.path = os.path.abspath(path)
+        self._thread_lock = threading.Lock()
+        self._lock_fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        with self._exclusive():
+            gen_fd = os.open(self.path + ".gen", os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if os.fstat(gen_fd).st_size < _GENERATION.size:
+                    os.ftruncate(gen_fd, _GENERATION.size)
+                self._generation = mmap.mmap(gen_fd, _GENERATION.size)
+            finally:
+                os.close(gen_fd)
+            if not os.path.exists(self.path):
+                self._publish(list(seed))
+        self._seen = None
+        self._records = []
+
+    def close(self):
+        """Release the mapped counter and the lock file."""
+        self._generation.close()
+        os.close(self._lock_fd)
+
+    def generation(self):
+        """Current generation as published by the last writer of any process."""
+        return _GENERATION.unpack_from(self._generation, 0)[0]
+
+    @contextmanager
+    def _exclusive(self):
+        with self._thread_lock:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _load(self):
+        # read the counter first: the file is at least as new as that generation
+        generation = self.generation()
+        with open(self.path, encoding="utf-8") as f:
+            self._records = json.load(f)
+        self._seen = generation
+        return self._records
+
+    def _publish(self, records):
+        directory = os.path.dirname(self.path)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".employees.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(records, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        _GENERATION.pack_into(self._generation, 0, self.generation() + 1)
+
+    def refresh(self, apply):
+        """Call ``apply(records)`` if another writer published since the last load.
+
+        ``apply`` runs under the process's lock, so it never interleaves with
+        a write from another thread of this worker.
+
+        Returns:
+            True if fresh records were applied
+        """
+        if self.generation() == self._seen:
+            return False
+        with self._thread_lock:
+            if self.generation() == self._seen:
+                return False
+            apply([dict(r) for r in self._load()])
+            return True
+
+    @contextmanager
+    def write(self):
+        """Yield the latest records for in-place changes and publish them on success.
+
+        Nothing is published when the records are left unchanged (e.g. a
+        request that ends in 404) or when the block raises.
+        """
+        with self._exclusive():
+            current = self._load() if self.generation() != self._seen else self._records
+            records = [dict(r) for r in current]
+            yield records
+            if records != current:
+                self._publish(records)
+                # the caller keeps (and later mutates) the dicts it was given
+                self._records = [dict(r) for r in records]
+                self._seen = self.generation()
@@ -0,0 +1,352 @@
+"""Record real API traffic and replay it against either app for capacity planning.
+
+Recording is opt-in: with ``EMPLOYEES_RECORD_PATH`` set, both apps wrap their
+WSGI app in ``RequestRecorder``, which appends one compact JSON line per
+request to that file::
+
+    {"t":1760860800.123456,"m":"PUT","p":"/employees/3?fields=id","b":"{...}",
+     "c":"application/json","i":"\\"2\\"","s":200,"d":0.412,"h":2739502135}
+
+- ``t`` start time (epoch seconds) and ``d`` duration in milliseconds;
+- ``m`` method and ``p`` path with its query string;
+- ``b`` request body, ``c`` its content type and ``i`` the If-Match header,
+  each only when present;
+- ``s`` response status and ``h`` CRC-32 of the response body.
+
+Lines are buffered in memory and appended with a single ``write`` per batch
+(every 64 KiB, every second, and at exit), so most requests cost one
+``json.dumps`` and no system call, and several worker processes can append
+to the same file without interleaving lines.
+
+``replay`` sends a log again through ``ClientSender`` (the Flask test
+client) or ``HttpSender``, at the original pace, N times faster or as fast as possible, from
+several threads, and reports throughput, latency percentiles and responses
+whose status (or body) differs from the recording. Replaying writes is only
+meaningful against the state the recording started from (e.g. a fresh app),
+and with more than one thread the order of requests is no longer exact.
+"""
+
+import atexit
+import http.client
+import io
+import json
+import os
+import threading
+import time
+import urllib.parse
+import zlib
+
+RECORD_PATH_ENV = "EMPLOYEES_RECORD_PATH"
+# Methods resent when a reused connection fails mid-request. PUT and DELETE
+# are left out on purpose: with If-Match a second copy answers 412 or 404.
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+FLUSH_BYTES = 64 * 1024
+FLUSH_SECONDS = 1.0
+
+
+class RequestRecorder:
+    """WSGI middleware that appends every request and its outcome to an NDJSON log."""
+
+    def __init__(self, wsgi_app, path, flush_bytes=FLUSH_BYTES, flush_seconds=FLUSH_SECONDS):
+        self.wsgi_app = wsgi_app
+        self.path = os.path.abspath(path)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)  # bodies may hold personal data
+        self._lock = threading.Lock()
+        self._pending = []
+        self._pending_bytes = 0
+        self._flushed_at = time.monotonic()
+        self._flush_bytes = flush_bytes
+        self._flush_seconds = flush_seconds
+        atexit.register(self.close)
+
+    def __call__(self, environ, start_response):
+        started = time.time()
+        began = time.perf_counter()
+        body = b""
+        length = environ.get("CONTENT_LENGTH")
+        if length and length.isdigit() and int(length) > 0:
+            body = environ["wsgi.input"].read(int(length))
+            environ["wsgi.input"] = io.BytesIO(body)
+        entry = {"t": round(started, 6), "m": environ["REQUEST_METHOD"], "p": _path(environ)}
+        if body:
+            entry["b"] = body.decode("utf-8", errors="replace")
+            if environ.get("CONTENT_TYPE"):
+                entry["c"] = environ["CONTENT_TYPE"]
+        if environ.get("HTTP_IF_MATCH"):
+            entry["i"] = environ["HTTP_IF_MATCH"]
+        status = []
+
+        def recording_start_response(status_line, headers, exc_info=None):
+            status[:] = [int(status_line.split(" ", 1)[0])]
+            return start_response(status_line, headers, exc_info)
+
+        result = self.wsgi_app(environ, recording_start_response)
+        return _RecordedBody(self._append, result, entry, status, began)
+
+    def _append(self, line):
+        with self._lock:
+            if self._fd is None:
+                return
+            self._pending.append(line)
+            self._pending_bytes += len(line)
+            if self._pending_bytes >= self._flush_bytes or time.monotonic() - self._flushed_at >= self._flush_seconds:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._pending:
+            os.write(self._fd, "".join(self._pending).encode("utf-8"))
+            self._pending.clear()
+            self._pending_bytes = 0
+        self._flushed_at = time.monotonic()
+
+    def flush(self):
+        """Write the buffered lines now."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """Flush and close the log; later requests are no longer recorded."""
+        with self._lock:
+            if self._fd is None:
+                return
+            self._flush_locked()
+            os.close(self._fd)
+            self._fd = None
+        atexit.unregister(self.close)
+
+
+class _RecordedBody:
+    """Response iterable that checksums the body and logs the request on close.
+
+    A plain generator would skip its cleanup when the server closes the
+    response before iterating it, leaving the wrapped result open and the
+    request unlogged; ``close`` here always does both, exactly once.
+    """
+
+    def __init__(self, append, result, entry, status, began):
+        self._append = append
+        self._result = result
+        self._entry = entry
+        self._status = status
+        self._began = began
+        self._checksum = 0
+        self._closed = False
+
+    def __iter__(self):
+        # the request is logged once its response has been sent (or abandoned)
+        try:
+            for chunk in self._result:
+                self._checksum = zlib.crc32(chunk, self._checksum)
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if hasattr(self._result, "close"):
+                self._result.close()
+        finally:
+            entry = self._entry
+            entry["s"] = self._status[0] if self._status else 500
+            entry["d"] = round((time.perf_counter() - self._began) * 1000, 3)
+            entry["h"] = self._checksum
+            self._append(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def _path(environ):
+    # WSGI hands the raw path over as latin-1
+    path = urllib.parse.quote((environ.get("SCRIPT_NAME", "") + environ.get("PATH_INFO", "")).encode("latin-1"))
+    query = environ.get("QUERY_STRING")
+    return f"{path}?{query}" if query else path
+
+
+def record_if_configured(app):
+    """Wrap ``app.wsgi_app`` in a recorder when ``EMPLOYEES_RECORD_PATH`` is set."""
+    if os.environ.get(RECORD_PATH_ENV):
+        app.wsgi_app = RequestRecorder(app.wsgi_app, os.environ[RECORD_PATH_ENV])
+    return app
+
+
+def read_log(path):
+    """Recorded entries in file order (blank lines are skipped).
+
+    Raises:
+        ValueError: If a line is not a recorded request
+    """
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if not isinstance(entry, dict) or not {"t", "m", "p"} <= entry.keys():
+                raise ValueError(f"{path}:{number}: no es una petición grabada")
+            entries.append(entry)
+    return entries
+
+
+class ClientSender:
+    """Send entries through a Flask app's test client (one client per thread)."""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def __call__(self, entry):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(entry["p"], method=entry["m"], data=_body(entry), headers=_headers(entry))
+        return response.status_code, response.get_data()
+
+
+class HttpSender:
+    """Send entries over HTTP to ``base_url`` (one keep-alive connection per thread)."""
+
+    def __init__(self, base_url, timeout=10.0):
+        parts = urllib.parse.urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"URL inválida: {base_url}")
+        self._connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._address = (parts.hostname, parts.port)
+        self._prefix = parts.path.rstrip("/")
+        self._timeout = timeout
+        self._local = threading.local()
+
+    def __call__(self, entry):
+        while True:
+            connection = getattr(self._local, "connection", None)
+            if connection is None:
+                connection = self._local.connection = self._connection_class(*self._address, timeout=self._timeout)
+                self._local.reused = False
+            sent = False
+            try:
+                connection.request(entry["m"], self._prefix + entry["p"], body=_body(entry), headers=_headers(entry))
+                sent = True
+                response = connection.getresponse()
+                result = response.status, response.read()
+                self._local.reused = True
+                return result
+            except (http.client.HTTPException, ConnectionError) as error:
+                connection.close()
+                self._local.connection = None
+                if not (self._local.reused and _safe_to_resend(entry["m"], sent, error)):
+                    raise
+
+
+def _safe_to_resend(method, sent, error):
+    """Whether a request that failed on a reused keep-alive connection may be sent again.
+
+    The server may have closed the idle connection: a request that never left,
+    or one answered by a bare disconnect, was not processed. Anything else may
+    have been applied, so only read-only methods are repeated.
+    """
+    return method in SAFE_METHODS or not sent or isinstance(error, http.client.RemoteDisconnected)
+
+
+def _body(entry):
+    return entry["b"].encode("utf-8") if "b" in entry else None
+
+
+def _headers(entry):
+    headers = {}
+    if "c" in entry:
+        headers["Content-Type"] = entry["c"]
+    if "i" in entry:
+        headers["If-Match"] = entry["i"]
+    return headers
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def replay(entries, send, speed=None, concurrency=1, compare_bodies=False, max_mismatches=20):
+    """Send recorded entries again and measure the responses.
+
+    Args:
+        entries: Recorded entries, in recording order
+        send: Callable taking an entry and returning (status, body bytes);
+            it is called from ``concurrency`` threads at once
+        speed: None for as fast as possible, 1 for the recorded pace, N for
+            N times faster
+        concurrency: Number of threads sending requests
+        compare_bodies: Also count responses whose body checksum differs
+        max_mismatches: How many mismatches to describe in the report
+
+    Returns:
+        ``{"requests", "errors", "seconds", "throughput", "latency_ms":
+        {"p50", "p90", "p99", "max"}, "max_lag_ms", "mismatches",
+        "mismatch_examples"}``
+    """
+    if speed is not None and speed <= 0:
+        raise ValueError("speed debe ser mayor que 0")
+    if concurrency < 1:
+        raise ValueError("concurrency debe ser al menos 1")
+    first = entries[0]["t"] if entries else 0.0
+    lock = threading.Lock()
+    position = iter(range(len(entries)))
+    latencies, examples = [], []
+    counts = {"errors": 0, "mismatches": 0, "lag": 0.0}
+    started = time.perf_counter()
+
+    def worker():
+        while True:
+            with lock:
+                index = next(position, None)
+            if index is None:
+                return
+            entry = entries[index]
+            if speed is not None:
+                due = started + (entry["t"] - first) / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                lag = time.perf_counter() - due
+            began = time.perf_counter()
+            try:
+                status, body = send(entry)
+            except Exception as exc:  # a failed request is counted, not fatal
+                with lock:
+                    counts["errors"] += 1
+                    if len(examples) < max_mismatches:
+                        examples.append({"index": index, "method": entry["m"], "path": entry["p"], "error": str(exc)})
+                continue
+            elapsed = time.perf_counter() - began
+            differs = ("s" in entry and status != entry["s"]) or (
+                compare_bodies and "h" in entry and zlib.crc32(body) != entry["h"]
+            )
+            with lock:
+                latencies.append(elapsed)
+                if speed is not None:
+                    counts["lag"] = max(counts["lag"], lag)
+                if differs:
+                    counts["mismatches"] += 1
+                    if len(examples) < max_mismatches:
+                        examples.append({"index": index, "method": entry["m"], "path": entry["p"], "recorded": entry.get("s"), "replayed": status})
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    latency = {name: round(percentile(ordered, q) * 1000, 3) if ordered else None
+               for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))}
+    examples.sort(key=lambda example: example["index"])
+    return {
+        "requests": len(latencies),
+        "errors": counts["errors"],
+        "seconds": round(seconds, 6),
+        "throughput": round(len(latencies) / seconds, 1) if seconds > 0 else None,
+        "latency_ms": latency,
+        "max_lag_ms": round(counts["lag"] * 1000, 3),
+        "mismatches": counts["mismatches"],
+        "mismatch_examples": examples,
+    }
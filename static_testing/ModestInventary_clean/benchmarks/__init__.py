@@ -0,0 +1,4 @@
+"""Performance benchmarks for the inventory system.
+
+Run from the project root, e.g. ``python -m benchmarks.bench_server``.
+"""
@@ -0,0 +1,80 @@
+"""Point-lookup latency of the mmap binary state format.
+
+Records are generated and written as a stream, so multi-GB states can be
+benchmarked without holding them in memory. The JSON baseline (load the
+whole document, then look up one item) is only run when requested, since it
+needs several times the file size in RAM.
+
+Usage:
+    python -m benchmarks.bench_binary_lookup --size-mb 4096 --lookups 20000
+    python -m benchmarks.bench_binary_lookup --size-mb 200 --json-baseline
+"""
+
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import click
+
+from benchmarks.workloads import make_item
+from inventory_system.persistence import binary_state, state_manager
+
+ITEM_BYTES = 150  # rough compact size of one generated record
+
+
+def _items(count: int, seed: int) -> Iterator[dict[str, Any]]:
+    rng = random.Random(seed)
+    for index in range(count):
+        yield make_item(index, rng)
+
+
+@click.command()
+@click.option("--size-mb", default=256, show_default=True, help="Approximate state size.")
+@click.option("--lookups", default=10_000, show_default=True)
+@click.option("--json-baseline", is_flag=True, default=False, help="Also time JSON load + lookup.")
+@click.option("--directory", type=click.Path(file_okay=False), default=None, help="Where to write.")
+def main(size_mb: int, lookups: int, json_baseline: bool, directory: str | None) -> None:
+    """Run the binary point-lookup benchmark."""
+    count = size_mb * 1024 * 1024 // ITEM_BYTES
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        path = Path(tmp) / "state.bin"
+        start = time.perf_counter()
+        binary_state.write_binary_state(path, _items(count, seed=42), {"user": "benchmark"})
+        click.echo(
+            f"items={count:,} size={path.stat().st_size / 2**20:.1f} MiB "
+            f"write={time.perf_counter() - start:.1f} s"
+        )
+
+        rng = random.Random(7)
+        keys = [f"SKU-{rng.randrange(count):09d}" for _ in range(lookups)]
+        start = time.perf_counter()
+        with binary_state.BinaryState(path) as binary:
+            open_ms = (time.perf_counter() - start) * 1000
+            samples = []
+            for key in keys:
+                begin = time.perf_counter()
+                binary[key]
+                samples.append(time.perf_counter() - begin)
+        samples.sort()
+        click.echo(
+            f"binary open={open_ms:.2f} ms  lookup mean={statistics.mean(samples) * 1e6:.1f} us  "
+            f"p50={samples[len(samples) // 2] * 1e6:.1f} us  "
+            f"p99={samples[int(len(samples) * 0.99)] * 1e6:.1f} us"
+        )
+
+        if json_baseline:
+            json_path = Path(tmp) / "state.json"
+            binary_state.binary_to_json(path, json_path)
+            start = time.perf_counter()
+            state = state_manager.load_state(json_path) or {}
+            wanted = keys[0]
+            next(item for item in state["items"] if item["sku"] == wanted)
+            click.echo(f"json load + scan for one item: {time.perf_counter() - start:.3f} s")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,95 @@
+"""Compression ratio and throughput of each state codec.
+
+Benchmarks the given state file (decoded with ``load_state`` and re-encoded
+in the chosen layout, so compressed inputs work too) or a generated state.
+Compression runs in memory through the same streams ``save_state`` uses;
+throughput is measured against the uncompressed size.
+
+Usage:
+    python -m benchmarks.bench_codecs data/inventory_state.json
+    python -m benchmarks.bench_codecs --size-mb 50 --layout lines --level gzip=1
+"""
+
+import io
+import time
+
+import click
+
+from benchmarks.workloads import make_state
+from inventory_system.persistence import codecs, state_manager
+
+
+def _encode(data: dict, compact: bool, layout: str) -> bytes:
+    """Encode state exactly as save_state would, without compression."""
+    buffer = io.BytesIO()
+    state_manager._write_state(data, buffer, compact, layout)  # pylint: disable=protected-access
+    return buffer.getvalue()
+
+
+def _parse_levels(values: tuple[str, ...]) -> dict[str, int]:
+    """Parse repeated ``codec=level`` options."""
+    levels = {}
+    for value in values:
+        name, _, level = value.partition("=")
+        if name not in codecs.CODECS or not level.isdigit():
+            raise click.BadParameter(f"expected codec=level, got {value!r}", param_hint="--level")
+        levels[name] = int(level)
+    return levels
+
+
+@click.command()
+@click.argument("state_file", required=False, type=click.Path(exists=True, dir_okay=False))
+@click.option("--size-mb", default=20, show_default=True, help="Generated state size (no file).")
+@click.option("--layout", type=click.Choice(["json", "lines"]), default="json", show_default=True)
+@click.option("--pretty", is_flag=True, default=False, help="Use indented JSON instead of compact.")
+@click.option("--level", "levels", multiple=True, help="Override a level, e.g. gzip=1.")
+@click.option("--repeat", default=3, show_default=True, help="Best of N runs.")
+def main(
+    state_file: str | None,
+    size_mb: int,
+    layout: str,
+    pretty: bool,
+    levels: tuple[str, ...],
+    repeat: int,
+) -> None:
+    """Run the codec benchmark."""
+    data = state_manager.load_state(state_file) if state_file else make_state(size_mb * 1024 * 1024)
+    if data is None:
+        raise click.ClickException(f"cannot read {state_file}")
+    raw = _encode(data, not pretty, layout)
+    overrides = _parse_levels(levels)
+    click.echo(f"input={len(raw) / 1024 / 1024:.1f} MiB  layout={layout}")
+    click.echo(
+        f"{'codec':<6} {'level':>5} {'ratio':>7} {'size MiB':>9} "
+        f"{'comp MiB/s':>11} {'decomp MiB/s':>13}"
+    )
+
+    for codec in codecs.CODECS.values():
+        level = overrides.get(codec.name, codec.default_level)
+        compress_times, decompress_times = [], []
+        compressed = b""
+        for _ in range(repeat):
+            buffer = io.BytesIO()
+            start = time.perf_counter()
+            with codec.open(buffer, "wb", level) as stream:
+                stream.write(raw)
+            compress_times.append(time.perf_counter() - start)
+            compressed = buffer.getvalue()
+
+            start = time.perf_counter()
+            with codec.open(io.BytesIO(compressed), "rb") as stream:
+                restored = stream.read()
+            decompress_times.append(time.perf_counter() - start)
+            if restored != raw:
+                raise click.ClickException(f"{codec.name} round trip mismatch")
+
+        mib = len(raw) / 1024 / 1024
+        click.echo(
+            f"{codec.name:<6} {level:>5} {len(raw) / len(compressed):>7.1f} "
+            f"{len(compressed) / 1024 / 1024:>9.2f} {mib / min(compress_times):>11.1f} "
+            f"{mib / min(decompress_times):>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
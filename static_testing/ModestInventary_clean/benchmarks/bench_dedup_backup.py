@@ -0,0 +1,71 @@
+"""Bytes written per incremental backup versus full copies at several churn rates.
+
+Saves a generated state, backs it up into a fresh chunk store, then for each
+``--churn`` rate modifies that fraction of items, re-saves and backs up again.
+Each row compares the bytes the chunk store wrote with a full copy of the file.
+
+Usage:
+    python -m benchmarks.bench_dedup_backup --size-mb 64 --churn 0.001 --churn 0.01
+"""
+
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+from benchmarks.workloads import make_state
+from inventory_system.persistence.state_manager import save_state
+from inventory_system.utils.incremental_backup import create_incremental_backup, store_size
+
+
+@click.command()
+@click.option("--size-mb", default=64, show_default=True)
+@click.option("--layout", type=click.Choice(["json", "lines"]), default="json", show_default=True)
+@click.option(
+    "--churn",
+    "churn_rates",
+    type=float,
+    multiple=True,
+    default=(0.001, 0.01, 0.1),
+    show_default=True,
+    help="Fraction of items changed before each backup.",
+)
+@click.option("--seed", default=42, show_default=True)
+def main(size_mb: int, layout: str, churn_rates: tuple[float, ...], seed: int) -> None:
+    """Run the deduplicated backup benchmark."""
+    rng = random.Random(seed)
+    state = make_state(size_mb * 1024 * 1024, seed)
+    items = state["items"]
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "state.json"
+        store = Path(directory) / "store"
+        save_state(state, source, compact=True, layout=layout)
+        rows = [("initial", 0.0)] + [(f"churn {rate:.2%}", rate) for rate in churn_rates]
+        for name, rate in rows:
+            for index in rng.sample(range(len(items)), int(len(items) * rate)):
+                items[index]["quantity"] = rng.randint(0, 500)
+            save_state(state, source, compact=True, layout=layout)
+            start = time.perf_counter()
+            result = create_incremental_backup(store, source)
+            elapsed = time.perf_counter() - start
+            if result is None:
+                raise click.ClickException("backup failed")
+            size = result.manifest.size
+            click.echo(
+                f"{name:<14} written={result.bytes_written / 2**20:9.2f} MiB "
+                f"({result.bytes_written / size:7.2%} of full copy)  "
+                f"new_chunks={result.new_chunks:>6}/{len(result.manifest.chunks):<6} "
+                f"time={elapsed:6.2f} s"
+            )
+        total = store_size(store)
+        full = size * len(rows)
+        click.echo(
+            f"store={total / 2**20:.2f} MiB for {len(rows)} backups "
+            f"vs {full / 2**20:.2f} MiB of full copies ({full / total:.1f}x smaller)"
+        )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,67 @@
+"""Discount throughput with and without the LRU result cache on skewed traffic.
+
+Traffic is drawn from every (category, level, history, holiday, season,
+region) combination with Zipf-like weights, so a few combinations dominate.
+
+Usage:
+    python -m benchmarks.bench_discount_cache --calls 200000 --sizes 16,128,1024
+"""
+
+import itertools
+import random
+import time
+
+import click
+
+from inventory_system.logic import discount_calculator
+from inventory_system.logic.discount_calculator import calculate_discount
+
+CATEGORIES = ["electronics", "books", "clothing", "furniture", "toys"]
+LEVELS = ["platinum", "gold", "silver", "bronze", "guest"]
+HISTORY = [0, 3, 5, 8, 10, 12, 15, 20, 40]
+SEASONS = ["normal", "black_friday", "clearance", "summer", "winter"]
+REGIONS = ["US", "EU", "ASIA"]
+
+
+def build_workload(calls: int, skew: float, seed: int) -> list[tuple]:
+    """Draw ``calls`` argument tuples with weight 1 / rank**skew."""
+    combos = list(itertools.product(CATEGORIES, LEVELS, HISTORY, [False, True], SEASONS, REGIONS))
+    rng = random.Random(seed)
+    rng.shuffle(combos)
+    weights = [1 / (rank**skew) for rank in range(1, len(combos) + 1)]
+    return rng.choices(combos, weights=weights, k=calls)
+
+
+def run(workload: list[tuple]) -> float:
+    """Return calls per second for the workload."""
+    start = time.perf_counter()
+    for args in workload:
+        calculate_discount(*args)
+    return len(workload) / (time.perf_counter() - start)
+
+
+@click.command()
+@click.option("--calls", default=200_000, show_default=True)
+@click.option("--skew", default=1.1, show_default=True, help="Zipf exponent of the traffic.")
+@click.option("--sizes", default="16,128,1024", show_default=True, help="Cache sizes to try.")
+@click.option("--seed", default=42, show_default=True)
+def main(calls: int, skew: float, sizes: str, seed: int) -> None:
+    """Run the discount cache benchmark."""
+    workload = build_workload(calls, skew, seed)
+    discount_calculator.disable_discount_cache()
+    click.echo(f"{'uncached':<14} {run(workload):>12,.0f} calls/s")
+
+    for size in (int(value) for value in sizes.split(",")):
+        discount_calculator.enable_discount_cache(size)
+        throughput = run(workload)
+        stats = discount_calculator.discount_cache_stats()
+        assert stats is not None
+        click.echo(
+            f"{'cache=' + str(size):<14} {throughput:>12,.0f} calls/s  "
+            f"hit_rate={stats.hit_rate:6.1%}  evictions={stats.evictions}"
+        )
+    discount_calculator.disable_discount_cache()
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,99 @@
+"""Cold-start import cost of each inventory CLI subcommand.
+
+Each subcommand runs in a fresh interpreter under ``python -X importtime``.
+The report shows wall-clock time, total import time and the
+``inventory_system`` modules that were loaded. With ``--budget-ms`` the
+script exits non-zero when any subcommand's import time exceeds the budget.
+
+Usage:
+    python -m benchmarks.bench_import --repeat 5 --budget-ms 60
+"""
+
+import os
+import statistics
+import subprocess  # nosec B404 - spawns our own CLI with a fixed argv
+import sys
+import time
+from pathlib import Path
+
+import click
+
+# Subcommand invocations measured. Commands that would write files only
+# resolve their help so each run stays side-effect free.
+INVOCATIONS: dict[str, list[str]] = {
+    "--help": ["--help"],
+    "login": ["login", "admin", "wrong-password"],
+    "discount": ["discount", "electronics", "gold", "12", "--holiday"],
+    "load": ["load"],
+    "save": ["save", "--help"],
+    "backup": ["backup", "--help"],
+    "serve": ["serve", "--help"],
+}
+
+
+def parse_importtime(stderr: str) -> tuple[int, list[str]]:
+    """Parse ``-X importtime`` output.
+
+    Args:
+        stderr: Captured standard error of the interpreter
+
+    Returns:
+        Total import time in microseconds (sum of top-level cumulative times)
+        and the list of imported ``inventory_system`` modules
+    """
+    total_us = 0
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+        if name.strip().startswith("inventory_system"):
+            modules.append(name.strip())
+    return total_us, modules
+
+
+def measure(args: list[str], env: dict[str, str]) -> tuple[float, int, list[str]]:
+    """Run one CLI invocation with ``-X importtime``.
+
+    Returns:
+        Wall-clock seconds, import time in microseconds and loaded modules
+    """
+    argv = [sys.executable, "-X", "importtime", "-m", "inventory_system.cli", *args]
+    start = time.perf_counter()
+    completed = subprocess.run(  # nosec B603
+        argv, capture_output=True, text=True, env=env, check=False
+    )
+    elapsed = time.perf_counter() - start
+    total_us, modules = parse_importtime(completed.stderr)
+    return elapsed, total_us, modules
+
+
+@click.command()
+@click.option("--repeat", default=5, show_default=True, help="Runs per subcommand.")
+@click.option(
+    "--budget-ms", type=float, default=None, help="Fail when median import time exceeds this."
+)
+def main(repeat: int, budget_ms: float | None) -> None:
+    """Report per-subcommand cold-start latency."""
+    over_budget = []
+    env = {**os.environ, "PYTHONPATH": str(Path.cwd())}
+    env.pop("INVENTORY_SERVER", None)
+    for name, args in INVOCATIONS.items():
+        runs = [measure(args, env) for _ in range(repeat)]
+        wall_ms = statistics.median(run[0] for run in runs) * 1000
+        import_ms = statistics.median(run[1] for run in runs) / 1000
+        modules = sorted(set(runs[-1][2]))
+        click.echo(f"{name:<10} wall={wall_ms:8.2f} ms  imports={import_ms:8.2f} ms")
+        click.echo(f"{'':<10} modules: {', '.join(modules)}")
+        if budget_ms is not None and import_ms > budget_ms:
+            over_budget.append(name)
+
+    if over_budget:
+        click.echo(f"Import budget of {budget_ms} ms exceeded by: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,92 @@
+"""Indexed item repository queries versus list scans over raw records.
+
+Builds a catalog of ``--items`` generated items and times SKU lookups,
+low-stock queries, category pricing runs and stock adjustments against the
+equivalent scans over the plain ``items`` list.
+
+Usage:
+    python -m benchmarks.bench_item_repository --items 1000000
+"""
+
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+import click
+
+from benchmarks.workloads import make_item as make_record
+from inventory_system.logic.item_repository import ItemRepository
+
+
+def _timed(function: Callable[[], Any], repeat: int) -> float:
+    """Return the mean seconds per call of ``function``."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def _stock_key(record: dict[str, Any]) -> tuple[int, str]:
+    return record["quantity"], record["sku"]
+
+
+def _row(name: str, indexed: float, scan: float | None = None) -> str:
+    speedup = f"  speedup={scan / indexed:>9,.0f}x" if scan else ""
+    scanned = f"  scan={scan * 1e3:10.3f} ms" if scan else ""
+    return f"{name:<22} indexed={indexed * 1e3:10.3f} ms{scanned}{speedup}"
+
+
+@click.command()
+@click.option("--items", default=1_000_000, show_default=True)
+@click.option("--low-stock", default=2, show_default=True, help="Low-stock threshold.")
+@click.option("--repeat", default=5, show_default=True)
+@click.option("--seed", default=42, show_default=True)
+def main(items: int, low_stock: int, repeat: int, seed: int) -> None:
+    """Run the item repository benchmark."""
+    rng = random.Random(seed)
+    records = [make_record(index, rng) for index in range(items)]
+    start = time.perf_counter()
+    repository = ItemRepository.from_records(
+        {key: record[key] for key in ("sku", "category", "quantity", "price")} for record in records
+    )
+    click.echo(f"items={items:,}  build={time.perf_counter() - start:.2f} s")
+
+    skus = [records[rng.randrange(items)]["sku"] for _ in range(1000)]
+    click.echo(
+        _row(
+            "1000 SKU lookups",
+            _timed(lambda: [repository.get(sku) for sku in skus], repeat),
+            # one scan, extrapolated: scanning 1000 times would take minutes
+            _timed(lambda: next(r for r in records if r["sku"] == skus[0]), 1) * len(skus),
+        )
+    )
+    low = repository.low_stock(low_stock)
+    click.echo(
+        _row(
+            f"low stock ({len(low):,})",
+            _timed(lambda: repository.low_stock(low_stock), repeat),
+            _timed(
+                lambda: sorted(
+                    (r for r in records if r["quantity"] <= low_stock), key=_stock_key
+                ),
+                1,
+            ),
+        )
+    )
+    category = records[0]["category"]
+    click.echo(
+        _row(
+            f"category ({len(repository.by_category(category)):,})",
+            _timed(lambda: repository.by_category(category), repeat),
+            _timed(lambda: [r for r in records if r["category"] == category], 1),
+        )
+    )
+    reprice = _timed(lambda: repository.reprice_category(category, 1), 1)
+    click.echo(_row("category reprice", reprice))
+    adjust = _timed(lambda: [repository.adjust_stock(sku, 1) for sku in skus], repeat) / len(skus)
+    click.echo(f"{'adjust_stock':<22} {1 / adjust:>12,.0f} ops/s")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
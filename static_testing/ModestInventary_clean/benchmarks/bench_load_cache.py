@@ -0,0 +1,56 @@
+"""Repeated load_state latency with and without the validated load cache.
+
+Usage:
+    python -m benchmarks.bench_load_cache --size-mb 20 --loads 20
+"""
+
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import click
+
+from benchmarks.workloads import make_state
+from inventory_system.persistence import state_manager
+
+
+def _time(loads: int, load: Callable[[], Any]) -> float:
+    """Return the median seconds per call over ``loads`` calls."""
+    samples = []
+    for _ in range(loads):
+        start = time.perf_counter()
+        load()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+@click.command()
+@click.option("--size-mb", default=20, show_default=True, help="Approximate compact state size.")
+@click.option("--loads", default=20, show_default=True, help="Loads per scenario.")
+def main(size_mb: int, loads: int) -> None:
+    """Run the load cache benchmark."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "state.json"
+        state_manager.save_state(make_state(size_mb * 1024 * 1024), path, compact=True)
+
+        state_manager.disable_load_cache()
+        baseline = _time(loads, lambda: state_manager.load_state(path))
+        click.echo(f"{'uncached load_state':<24} {baseline * 1000:9.2f} ms")
+
+        state_manager.enable_load_cache()
+        state_manager.load_state(path)  # warm the cache
+        for name, load in (
+            ("cached load_state (copy)", lambda: state_manager.load_state(path)),
+            ("cached load_state_view", lambda: state_manager.load_state_view(path)),
+        ):
+            median = _time(loads, load)
+            click.echo(f"{name:<24} {median * 1000:9.2f} ms  speedup={baseline / median:8.1f}x")
+        click.echo(f"stats: {state_manager.load_cache_stats()}")
+        state_manager.disable_load_cache()
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
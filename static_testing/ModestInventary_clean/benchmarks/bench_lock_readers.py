@@ -0,0 +1,98 @@
+"""Aggregate load_state throughput with many concurrent locked readers.
+
+Each reader is a separate process looping over ``load_state`` (shared lock)
+for ``--duration`` seconds. With ``--writers``, that many processes keep
+calling ``update_state`` (exclusive lock) so readers contend with writers.
+Every read checks that the state is internally consistent.
+
+Usage:
+    python -m benchmarks.bench_lock_readers --readers 1,2,4,8,16 --writers 1
+"""
+
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import click
+
+from benchmarks.workloads import make_state
+from inventory_system.persistence import file_lock, state_manager
+
+
+def _bump(state: dict[str, Any]) -> None:
+    state["version"] += 1
+    state["checksum"] = state["version"] * 7
+
+
+def _reader(path: Path, duration: float, results: Any) -> None:
+    reads = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        state = state_manager.load_state(path)
+        if state is None or state["checksum"] != state["version"] * 7:
+            raise SystemExit(1)
+        reads += 1
+    results.put(("reader", reads, file_lock.lock_stats()))
+
+
+def _writer(path: Path, duration: float, results: Any) -> None:
+    writes = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        if state_manager.update_state(_bump, path, compact=True) is None:
+            raise SystemExit(1)
+        writes += 1
+    results.put(("writer", writes, file_lock.lock_stats()))
+
+
+def _run(path: Path, readers: int, writers: int, duration: float) -> tuple[int, int, list[Any]]:
+    """Run one round; return total reads, total writes and reader lock stats."""
+    results: Any = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_reader, args=(path, duration, results))
+        for _ in range(readers)
+    ] + [
+        multiprocessing.Process(target=_writer, args=(path, duration, results))
+        for _ in range(writers)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    if any(process.exitcode for process in processes):
+        raise click.ClickException("a worker saw an inconsistent state or failed to save")
+    reads = sum(count for role, count, _ in outcomes if role == "reader")
+    writes = sum(count for role, count, _ in outcomes if role == "writer")
+    return reads, writes, [stats for role, _, stats in outcomes if role == "reader"]
+
+
+@click.command()
+@click.option("--readers", default="1,2,4,8,16", show_default=True, help="Reader counts to try.")
+@click.option("--writers", default=0, show_default=True, help="Concurrent writer processes.")
+@click.option("--duration", default=2.0, show_default=True, help="Seconds per round.")
+@click.option("--size-kb", default=64, show_default=True, help="Approximate state size.")
+def main(readers: str, writers: int, duration: float, size_kb: int) -> None:
+    """Run the locked reader benchmark."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "state.json"
+        state = make_state(size_kb * 1024)
+        state["checksum"] = state["version"] * 7
+        state_manager.save_state(state, path, compact=True)
+        for count in (int(value) for value in readers.split(",")):
+            reads, writes, stats = _run(path, count, writers, duration)
+            waits = sum(item.wait_seconds for item in stats)
+            max_wait = max(item.max_wait_seconds for item in stats)
+            contended = sum(item.contended for item in stats)
+            click.echo(
+                f"readers={count:<3} {reads / duration:>10,.0f} reads/s  "
+                f"writes/s={writes / duration:>7,.0f}  contended={contended:<6} "
+                f"mean wait={waits / max(reads, 1) * 1e6:7.1f} us  "
+                f"max wait={max_wait * 1e3:6.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
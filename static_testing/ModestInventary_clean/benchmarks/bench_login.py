@@ -0,0 +1,68 @@
+"""Login throughput with and without the verified-login cache.
+
+Writes a credential file of ``--users`` users and replays ``--logins``
+logins drawn from a small set of repeating automated clients, once through a
+store without cache (every login runs the KDF) and once with the
+verified-login cache. Unknown-user and wrong-password attempts are mixed in
+at ``--failure-rate``; they are never cached.
+
+Usage:
+    python -m benchmarks.bench_login --algorithm scrypt --logins 200
+"""
+
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+from inventory_system.credentials import (
+    ALGORITHMS,
+    CredentialStore,
+    VerifiedLoginCache,
+    hash_password,
+)
+
+
+@click.command()
+@click.option("--algorithm", type=click.Choice(ALGORITHMS), default="scrypt", show_default=True)
+@click.option("--users", default=20, show_default=True)
+@click.option("--clients", default=5, show_default=True, help="Distinct users logging in.")
+@click.option("--logins", default=200, show_default=True)
+@click.option("--failure-rate", default=0.05, show_default=True)
+@click.option("--seed", default=42, show_default=True)
+def main(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    algorithm: str, users: int, clients: int, logins: int, failure_rate: float, seed: int
+) -> None:
+    """Run the login benchmark."""
+    rng = random.Random(seed)
+    passwords = {f"user{index}": f"password-{index}" for index in range(users)}
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "users.json"
+        hashed = {name: hash_password(password, algorithm) for name, password in passwords.items()}
+        path.write_text(json.dumps({"version": 1, "users": hashed}), encoding="utf-8")
+
+        active = list(passwords)[:clients]
+        attempts = []
+        for _ in range(logins):
+            name = rng.choice(active)
+            good = rng.random() >= failure_rate
+            attempts.append((name, passwords[name] if good else "wrong"))
+
+        for label, cache in (("no cache", None), ("cache", VerifiedLoginCache())):
+            store = CredentialStore(path, cache)
+            store.users()
+            start = time.perf_counter()
+            accepted = sum(store.verify(name, password) for name, password in attempts)
+            elapsed = time.perf_counter() - start
+            hits = f"  hit_rate={cache.stats().hit_rate:.1%}" if cache else ""
+            click.echo(
+                f"{algorithm:<14} {label:<9} {logins / elapsed:10,.1f} logins/s  "
+                f"accepted={accepted}/{logins}{hits}"
+            )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,60 @@
+"""Parallel block compression throughput versus single-threaded gzip.
+
+Encodes a generated state of ``--size-mb`` and compresses it in memory with
+the stdlib streaming ``gzip.GzipFile`` (one core, one member) and with
+``compress_stream`` at each ``--workers`` count. Scaling needs as many
+physical cores as workers; ``os.cpu_count()`` is printed for reference.
+
+Usage:
+    python -m benchmarks.bench_parallel_compress --size-mb 256 --workers 1 --workers 4
+"""
+
+import gzip
+import io
+import json
+import os
+import time
+
+import click
+
+from benchmarks.workloads import make_state
+from inventory_system.utils.parallel_compress import compress_stream, get_format
+
+
+@click.command()
+@click.option("--size-mb", default=128, show_default=True)
+@click.option("--format", "format_name", type=click.Choice(["gzip", "xz"]), default="gzip")
+@click.option("--level", type=int, default=None)
+@click.option(
+    "--workers", "worker_counts", type=int, multiple=True, default=(1, 2, 4, 8), show_default=True
+)
+def main(size_mb: int, format_name: str, level: int | None, worker_counts: tuple[int, ...]) -> None:
+    """Run the parallel compression benchmark."""
+    data = json.dumps(make_state(size_mb * 1024 * 1024), separators=(",", ":")).encode("utf-8")
+    block_format = get_format(format_name)
+    level = block_format.default_level if level is None else level
+    click.echo(f"input={len(data) / 2**20:.1f} MiB  format={format_name}  cpus={os.cpu_count()}")
+
+    baseline = None
+    if format_name == "gzip":
+        output = io.BytesIO()
+        start = time.perf_counter()
+        with gzip.GzipFile(fileobj=output, mode="wb", compresslevel=level, mtime=0) as stream:
+            stream.write(data)
+        baseline = time.perf_counter() - start
+        click.echo(
+            f"{'gzip.GzipFile':<14} {len(data) / baseline / 2**20:8.1f} MiB/s  "
+            f"ratio={len(data) / len(output.getvalue()):5.2f}x"
+        )
+    for workers in worker_counts:
+        output = io.BytesIO()
+        stats = compress_stream(io.BytesIO(data), output, format_name, level, workers)
+        speedup = f"  speedup={baseline / stats.seconds:5.2f}x" if baseline else ""
+        click.echo(
+            f"{f'{workers} worker(s)':<14} {stats.throughput / 2**20:8.1f} MiB/s  "
+            f"ratio={stats.ratio:5.2f}x  blocks={stats.blocks}{speedup}"
+        )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,102 @@
+"""Compare per-request latency of the inventory server against spawning the CLI.
+
+Usage:
+    python -m benchmarks.bench_server --requests 200 --spawns 20
+"""
+
+import statistics
+import subprocess  # nosec B404 - spawns our own CLI with a fixed argv
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import click
+
+from inventory_system import service
+from inventory_system.client import InventoryClient
+from inventory_system.server import create_server
+
+DISCOUNT_ARGS = ["discount", "electronics", "gold", "12", "--holiday"]
+DISCOUNT_REQUEST = {
+    "command": "discount",
+    "params": {
+        "category": "electronics",
+        "user_level": "gold",
+        "purchase_count": 12,
+        "holiday": True,
+    },
+}
+
+
+def _summary(name: str, samples: list[float]) -> str:
+    """Format latency samples (seconds) as a one-line millisecond summary."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"{name:<22} n={len(samples):<6} mean={statistics.mean(samples) * 1000:8.3f} ms  "
+        f"p50={statistics.median(samples) * 1000:8.3f} ms  p95={p95 * 1000:8.3f} ms"
+    )
+
+
+def _time_spawns(count: int) -> list[float]:
+    """Time ``count`` fresh CLI processes running the discount command."""
+    samples = []
+    argv = [sys.executable, "-m", "inventory_system.cli", *DISCOUNT_ARGS]
+    for _ in range(count):
+        start = time.perf_counter()
+        subprocess.run(argv, check=True, capture_output=True)  # nosec B603
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _time_client(address: str, count: int) -> list[float]:
+    """Time ``count`` requests over one persistent client connection."""
+    samples = []
+    with InventoryClient(address) as client:
+        for _ in range(count):
+            start = time.perf_counter()
+            client.send(DISCOUNT_REQUEST)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _time_batch(address: str, count: int) -> float:
+    """Return the amortized per-request latency of one batch of ``count`` requests."""
+    with InventoryClient(address) as client:
+        start = time.perf_counter()
+        client.send([DISCOUNT_REQUEST] * count)
+        return (time.perf_counter() - start) / count
+
+
+@click.command()
+@click.option("--requests", "request_count", default=500, show_default=True)
+@click.option("--spawns", default=20, show_default=True, help="CLI processes to spawn.")
+def main(request_count: int, spawns: int) -> None:
+    """Run the server latency benchmark."""
+    service.preload()
+    click.echo(_summary("spawn CLI", _time_spawns(spawns)))
+
+    with tempfile.TemporaryDirectory() as tmp, ThreadPoolExecutor(max_workers=8) as executor:
+        addresses = [f"unix:{Path(tmp) / 'inventory.sock'}", "http://127.0.0.1:0"]
+        for address in addresses:
+            server = create_server(address, executor)
+            if address.startswith("http"):
+                address = f"http://127.0.0.1:{server.server_address[1]}"  # type: ignore[index]
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                transport = address.split(":", 1)[0]
+                click.echo(_summary(f"server ({transport})", _time_client(address, request_count)))
+                per_request = _time_batch(address, request_count)
+                label = f"batch ({transport})"
+                click.echo(f"{label:<22} per-request={per_request * 1000:8.3f} ms")
+            finally:
+                server.shutdown()
+                server.server_close()
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,68 @@
+"""Per-command authentication overhead with and without a session token.
+
+Compares what an admin command would pay to authenticate each time it runs:
+re-verifying a credential-file password (fresh process, so no login cache:
+file parse plus one KDF), the plaintext environment admin check, and
+verifying the stored session token (two small file reads plus one HMAC).
+
+Usage:
+    python -m benchmarks.bench_session --commands 200
+"""
+
+import json
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import click
+
+from inventory_system.auth import validate_credentials
+from inventory_system.credentials import ALGORITHMS, CredentialStore, hash_password
+from inventory_system.session import current_session, issue_token
+
+
+def _per_call(function: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if not function():
+            raise click.ClickException("authentication failed during benchmark")
+    return (time.perf_counter() - start) / repeat
+
+
+@click.command()
+@click.option("--commands", default=200, show_default=True, help="Admin commands to simulate.")
+@click.option("--algorithm", type=click.Choice(ALGORITHMS), default="scrypt", show_default=True)
+def main(commands: int, algorithm: str) -> None:
+    """Run the session token benchmark."""
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        users = root / "users.json"
+        users.write_text(
+            json.dumps({"version": 1, "users": {"alice": hash_password("pw", algorithm)}}),
+            encoding="utf-8",
+        )
+        os.environ.update(INVENTORY_ADMIN_USER="admin", INVENTORY_ADMIN_PASSWORD="pw")
+        issue_token("alice", directory=root)
+
+        kdf_repeat = max(1, min(commands, 20))  # a KDF per call; extrapolate from fewer runs
+        rows = [
+            (
+                f"credential file ({algorithm})",
+                _per_call(lambda: CredentialStore(users).verify("alice", "pw"), kdf_repeat),
+            ),
+            ("environment admin", _per_call(lambda: validate_credentials("admin", "pw"), commands)),
+            ("session token", _per_call(lambda: current_session(root), commands)),
+        ]
+        token_cost = rows[-1][1]
+        for name, seconds in rows:
+            click.echo(
+                f"{name:<26} {seconds * 1e3:9.3f} ms/command  "
+                f"{commands} commands={seconds * commands:8.3f} s  "
+                f"vs token={seconds / token_cost:8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
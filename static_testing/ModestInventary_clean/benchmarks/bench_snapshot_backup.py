@@ -0,0 +1,70 @@
+"""Backup latency of each snapshot mechanism for a large state file.
+
+Writes a ``--size-mb`` file next to ``--directory`` (local disk by default)
+and times ``shutil.copy2`` against every snapshot mode the filesystem
+supports. Modes the filesystem rejects (e.g. reflink on ext4) are reported
+as unsupported. Snapshot modes fsync and rename atomically; ``copy2`` does
+neither, so it is the lower bound for a non-durable userspace copy. Page
+cache is warm; cold-cache numbers need ``echo 3 > /proc/sys/vm/drop_caches``
+between runs.
+
+Usage:
+    python -m benchmarks.bench_snapshot_backup --size-mb 1024 --directory /var/tmp
+"""
+
+import functools
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import click
+
+from inventory_system.utils.backup_manager import SNAPSHOT_MODES, snapshot_file
+
+
+@click.command()
+@click.option("--size-mb", default=512, show_default=True)
+@click.option("--directory", default=None, help="Where to create the files (default: temp dir).")
+@click.option("--repeat", default=3, show_default=True)
+def main(size_mb: int, directory: str | None, repeat: int) -> None:
+    """Run the snapshot backup benchmark."""
+    with tempfile.TemporaryDirectory(dir=directory) as temp:
+        source = Path(temp) / "state.json"
+        block = os.urandom(1024 * 1024)
+        with source.open("wb") as file_obj:
+            for _ in range(size_mb):
+                file_obj.write(block)
+        click.echo(f"file={size_mb} MiB  directory={temp}")
+
+        def run(name: str, copy: Callable[[Path], str]) -> None:
+            timings = []
+            for attempt in range(repeat):
+                target = Path(temp) / f"backup-{name}-{attempt}.json"
+                start = time.perf_counter()
+                try:
+                    used = copy(target)
+                except ValueError:
+                    click.echo(f"{name:<16} unsupported on this filesystem")
+                    return
+                timings.append(time.perf_counter() - start)
+                target.unlink()
+            best = min(timings)
+            click.echo(
+                f"{name:<16} best={best * 1e3:10.2f} ms  "
+                f"{size_mb / best:10,.0f} MiB/s  (used {used})"
+            )
+
+        def copy2(target: Path) -> str:
+            shutil.copy2(source, target)
+            return "copy2"
+
+        run("shutil.copy2", copy2)
+        for mode in SNAPSHOT_MODES:
+            run(mode, functools.partial(snapshot_file, source, modes=[mode]))
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,78 @@
+"""Time and peak memory of state loading paths.
+
+Compares ``json.load`` of a single JSON document with the line-delimited
+layout loaded whole, streamed record by record, and opened lazily to read a
+single key. Peak memory is measured with ``tracemalloc`` in a separate pass
+so it does not distort the timings.
+
+Usage:
+    python -m benchmarks.bench_state_load --size-mb 200
+"""
+
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import click
+
+from benchmarks.workloads import make_state
+from inventory_system.persistence import state_manager
+
+
+def _measure(scenario: Callable[[], Any]) -> tuple[float, int]:
+    """Return wall-clock seconds and tracemalloc peak bytes of one scenario."""
+    start = time.perf_counter()
+    scenario()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    scenario()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def _lazy_single_key(path: Path) -> Any:
+    state = state_manager.open_state(path)
+    try:
+        return state["user"] if state is not None else None
+    finally:
+        close = getattr(state, "close", None)
+        if close is not None:
+            close()
+
+
+@click.command()
+@click.option("--size-mb", default=100, show_default=True, help="Approximate compact state size.")
+def main(size_mb: int) -> None:
+    """Run the load benchmark."""
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "state.json"
+        lines_path = Path(tmp) / "state.jsonl"
+        data = make_state(size_mb * 1024 * 1024)
+        state_manager.save_state(data, json_path, compact=True)
+        state_manager.save_state(data, lines_path, layout="lines")
+        del data
+
+        scenarios: dict[str, Callable[[], Any]] = {
+            "json.load (full)": lambda: state_manager.load_state(json_path),
+            "lines load (full)": lambda: state_manager.load_state(lines_path),
+            "lines stream items": lambda: sum(
+                item["quantity"] for item in state_manager.iter_state_items(lines_path)
+            ),
+            "lines lazy one key": lambda: _lazy_single_key(lines_path),
+        }
+        click.echo(
+            f"json={json_path.stat().st_size / 2**20:.1f} MiB  "
+            f"lines={lines_path.stat().st_size / 2**20:.1f} MiB"
+        )
+        for name, scenario in scenarios.items():
+            elapsed, peak = _measure(scenario)
+            click.echo(f"{name:<20} time={elapsed:8.3f} s  peak={peak / 2**20:9.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,49 @@
+"""Save latency and file size of state_manager.save_state per encoding mode.
+
+Every save is atomic and fsynced, so the numbers include durability cost.
+
+Usage:
+    python -m benchmarks.bench_state_save --size-mb 300 --repeat 3
+"""
+
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+from benchmarks.workloads import make_state
+from inventory_system.persistence import state_manager
+
+MODES = {"pretty": False, "compact": True}
+
+
+@click.command()
+@click.option("--size-mb", default=100, show_default=True, help="Approximate compact state size.")
+@click.option("--repeat", default=3, show_default=True)
+@click.option("--directory", type=click.Path(file_okay=False), default=None, help="Where to write.")
+def main(size_mb: int, repeat: int, directory: str | None) -> None:
+    """Run the save benchmark."""
+    data = make_state(size_mb * 1024 * 1024)
+    click.echo(f"items={len(data['items']):,}")
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        for mode, compact in MODES.items():
+            target = Path(tmp) / f"state-{mode}.json"
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                if state_manager.save_state(data, target, compact=compact) is None:
+                    raise click.ClickException(f"save failed in {mode} mode")
+                samples.append(time.perf_counter() - start)
+            size = target.stat().st_size
+            median = statistics.median(samples)
+            click.echo(
+                f"{mode:<8} size={size / 1024 / 1024:9.1f} MiB  "
+                f"save median={median:7.3f} s  min={min(samples):7.3f} s  "
+                f"throughput={size / median / 1024 / 1024:8.1f} MiB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
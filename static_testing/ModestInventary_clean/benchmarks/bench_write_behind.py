@@ -0,0 +1,62 @@
+"""Update throughput of synchronous save_state versus the write-behind saver.
+
+Each update sets one per-SKU stock counter in a state that also holds an
+items list of ``--size-kb``. The synchronous path rewrites (and fsyncs) the
+whole file per update, so it runs ``--sync-updates`` only; the write-behind
+path runs ``--updates`` and includes the final flush in its total.
+
+Usage:
+    python -m benchmarks.bench_write_behind --updates 100000 --size-kb 256
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+from benchmarks.workloads import make_state
+from inventory_system.persistence import state_manager
+from inventory_system.persistence.write_behind import WriteBehindSaver
+
+
+@click.command()
+@click.option("--updates", default=100_000, show_default=True)
+@click.option("--sync-updates", default=200, show_default=True)
+@click.option("--size-kb", default=256, show_default=True, help="Approximate state size.")
+@click.option("--interval", default=0.5, show_default=True, help="Write-behind debounce (s).")
+@click.option("--directory", type=click.Path(file_okay=False), default=None, help="Where to write.")
+def main(
+    updates: int, sync_updates: int, size_kb: int, interval: float, directory: str | None
+) -> None:
+    """Run the write-behind benchmark."""
+    data = make_state(size_kb * 1024)
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        target = Path(tmp) / "state.json"
+
+        start = time.perf_counter()
+        for count in range(sync_updates):
+            data[f"stock:{count % 1000}"] = count
+            if state_manager.save_state(data, target, compact=True) is None:
+                raise click.ClickException("synchronous save failed")
+        elapsed = time.perf_counter() - start
+        click.echo(f"{'sync save_state':<16} {sync_updates / elapsed:>12,.0f} updates/s")
+
+        with WriteBehindSaver(target, initial=data, interval=interval, compact=True) as saver:
+            start = time.perf_counter()
+            for count in range(updates):
+                saver.update({f"stock:{count % 1000}": count})
+            accepted = time.perf_counter() - start
+            if not saver.flush():
+                raise click.ClickException(f"write-behind flush failed: {saver.last_error}")
+            elapsed = time.perf_counter() - start
+            stats = saver.stats()
+        click.echo(
+            f"{'write-behind':<16} {updates / elapsed:>12,.0f} updates/s  "
+            f"(update() alone {updates / accepted:,.0f}/s)  writes={stats.writes}  "
+            f"updates/write={stats.coalescing_ratio:,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,9 @@
+"""Seeded synthetic inventory data shared by the benchmarks.
+
+The generators live in ``inventory_system.workloads`` so that the installed
+``inventory bench`` command uses exactly the same data.
+"""
+
+from inventory_system.workloads import CATEGORIES, WAREHOUSES, make_item, make_state
+
+__all__ = ["CATEGORIES", "WAREHOUSES", "make_item", "make_state"]
@@ -1,28 +1,36 @@
 """Secure authentication using environment variables and constant-time comparison.
 
 This module handles admin authentication using environment variables for credentials
-and HMAC constant-time comparison to prevent timing attacks.
+and HMAC constant-time comparison to prevent timing attacks. When
+``INVENTORY_CREDENTIALS_FILE`` names a credential file, its users (salted KDF
+hashes, see ``inventory_system.credentials``) are checked first.
 """
 
 import hmac
 import os
 from typing import Final
 
+from inventory_system.credentials import CREDENTIALS_FILE_ENV, store_for
+
 # Default admin user (can be overridden via environment variable)
 DEFAULT_ADMIN_USER: Final[str] = "admin"
 
 
 def validate_credentials(username: str, password: str) -> bool:
-    """Validate admin credentials using environment variables.
-    
-    Credentials are loaded from environment variables and compared using
-    constant-time comparison to prevent timing attacks.
+    """Validate credentials against the credential file and admin environment variables.
+
+    Users of the credential file (``INVENTORY_CREDENTIALS_FILE``) are
+    verified with their KDF hash; recent successful verifications are
+    cached for the life of the process. The environment admin is still
+    accepted, compared using constant-time comparison to prevent timing
+    attacks.
     
-    Required environment variables:
+    Environment variables:
+    - INVENTORY_CREDENTIALS_FILE: Optional multi-user credential file
     - INVENTORY_ADMIN_USER: Admin username
     - INVENTORY_ADMIN_PASSWORD: Admin password
     
-    If environment variables are not set, admin authentication is disabled
+    If the admin variables are not set, admin authentication is disabled
     for security reasons (fail-safe behavior).
     
     Args:
@@ -32,6 +40,14 @@ def validate_credentials(username: str, password: str) -> bool:
     Returns:
         True if credentials are valid, False otherwise
     """
+    credentials_file = os.getenv(CREDENTIALS_FILE_ENV)
+    if credentials_file:
+        try:
+            if store_for(credentials_file).verify(username, password):
+                return True
+        except (OSError, ValueError) as error:
+            print(f"Error reading credentials: {error}")
+
     expected_user = os.getenv("INVENTORY_ADMIN_USER")
     expected_password = os.getenv("INVENTORY_ADMIN_PASSWORD")
 
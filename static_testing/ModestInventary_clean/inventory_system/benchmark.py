@@ -0,0 +1,278 @@
+"""Reproducible performance suites and baseline comparison for ``inventory bench``.
+
+Three suites exercise the code paths production depends on, each on seeded
+synthetic data (``inventory_system.workloads``) at several sizes:
+
+- ``discount``: ``calculate_discount`` over batches of purchases;
+- ``state``: ``save_state`` and ``load_state`` of states of several sizes;
+- ``backup``: ``create_backup`` and ``verify_backup`` of state files of
+  several sizes.
+
+Every metric is timed ``repeat`` times after one warm-up run; a separate
+run under ``tracemalloc`` records its peak memory, so tracing never skews the
+timings. Results are JSON-compatible dictionaries (see ``run_suites``) and
+can be stored as a baseline; ``compare`` pairs each metric's median time and
+peak memory with the baseline's so callers can flag growth beyond a threshold.
+"""
+
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable, Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Final, NamedTuple
+
+from inventory_system.workloads import Purchase, make_purchases, make_state
+
+REPORT_VERSION: Final[int] = 1
+DEFAULT_SEED: Final[int] = 42
+DEFAULT_REPEAT: Final[int] = 5
+DEFAULT_THRESHOLD: Final[float] = 0.10
+SUITES: Final[tuple[str, ...]] = ("discount", "state", "backup")
+# batch sizes for "discount", file sizes in bytes for the others
+SIZES: Final[dict[str, tuple[int, ...]]] = {
+    "discount": (1_000, 10_000, 100_000),
+    "state": (64 * 1024, 1024 * 1024, 16 * 1024 * 1024),
+    "backup": (1024 * 1024, 16 * 1024 * 1024, 64 * 1024 * 1024),
+}
+QUICK_SIZES: Final[dict[str, tuple[int, ...]]] = {
+    "discount": (1_000, 10_000),
+    "state": (16 * 1024, 256 * 1024),
+    "backup": (256 * 1024, 1024 * 1024),
+}
+# compared fields and the absolute change below which they count as noise
+COMPARED_FIELDS: Final[dict[str, float]] = {"median_seconds": 0.001, "peak_bytes": 64 * 1024}
+
+Operation = Callable[[], object]
+
+
+class Comparison(NamedTuple):
+    """One metric field of a run compared with the baseline."""
+
+    metric: str
+    field: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change; positive means slower or larger."""
+        if self.baseline == 0:
+            return 0.0 if self.current == 0 else float("inf")
+        return (self.current - self.baseline) / self.baseline
+
+    def regressed(self, threshold: float = DEFAULT_THRESHOLD) -> bool:
+        """Return whether the change exceeds ``threshold`` (0.10 is 10%).
+
+        Changes smaller than the field's noise floor in ``COMPARED_FIELDS``
+        (1 ms, 64 KiB) never count, so tiny metrics do not flap.
+        """
+        noise_floor = COMPARED_FIELDS.get(self.field, 0.0)
+        return self.change > threshold and self.current - self.baseline > noise_floor
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the comparison as a JSON-compatible dictionary."""
+        return {**self._asdict(), "change": self.change}
+
+
+def size_label(size: int) -> str:
+    """Format a byte count the way metric names use it (``64KiB``, ``16MiB``)."""
+    for unit, scale in (("MiB", 1024 * 1024), ("KiB", 1024)):
+        if size >= scale and size % scale == 0:
+            return f"{size // scale}{unit}"
+    return f"{size}B"
+
+
+def measure(operation: Operation, repeat: int = DEFAULT_REPEAT) -> dict[str, Any]:
+    """Time ``operation`` and record its peak traced memory.
+
+    Args:
+        operation: Callable to measure; it must be safe to run repeatedly
+        repeat: Number of timed runs after the warm-up run
+
+    Returns:
+        Timing distribution in seconds and ``peak_bytes``
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    operation()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - start)
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline_bytes = tracemalloc.get_traced_memory()[0]
+    operation()
+    peak = tracemalloc.get_traced_memory()[1] - baseline_bytes
+    if not was_tracing:
+        tracemalloc.stop()
+
+    ordered = sorted(samples)
+    return {
+        "samples": samples,
+        "min_seconds": ordered[0],
+        "median_seconds": statistics.median(ordered),
+        "mean_seconds": statistics.fmean(ordered),
+        "p90_seconds": ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))],
+        "max_seconds": ordered[-1],
+        "stdev_seconds": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "peak_bytes": max(peak, 0),
+    }
+
+
+def _discount_operations(
+    sizes: Iterable[int], seed: int, _directory: Path
+) -> Iterable[tuple[str, int, Operation]]:
+    from inventory_system.logic.discount_calculator import calculate_discount
+
+    for size in sizes:
+        purchases = make_purchases(size, seed)
+
+        def price_batch(batch: Sequence[Purchase] = purchases) -> None:
+            for purchase in batch:
+                calculate_discount(*purchase)
+
+        yield f"discount.batch={size}", size, price_batch
+
+
+def _state_operations(
+    sizes: Iterable[int], seed: int, directory: Path
+) -> Iterable[tuple[str, int, Operation]]:
+    from inventory_system.persistence import state_manager
+
+    for size in sizes:
+        data = make_state(size, seed)
+        path = directory / f"state-{size_label(size)}.json"
+
+        def save(data: dict[str, Any] = data, path: Path = path) -> None:
+            if state_manager.save_state(data, path, compact=True) is None:
+                raise OSError(f"save failed: {path}")
+
+        def load(path: Path = path) -> None:
+            if state_manager.load_state(path) is None:
+                raise OSError(f"load failed: {path}")
+
+        yield f"state.save.size={size_label(size)}", size, save
+        yield f"state.load.size={size_label(size)}", size, load
+
+
+def _backup_operations(
+    sizes: Iterable[int], seed: int, directory: Path
+) -> Iterable[tuple[str, int, Operation]]:
+    from inventory_system.persistence import state_manager
+    from inventory_system.utils import backup_manager
+
+    source = directory / "inventory_state.json"
+    for size in sizes:
+        if state_manager.save_state(make_state(size, seed), source, compact=True) is None:
+            raise OSError(f"could not write the backup source: {source}")
+        target = directory / f"backup-{size_label(size)}.json"
+
+        def backup(target: Path = target) -> None:
+            if backup_manager.create_backup(str(target), source_path=source) is None:
+                raise OSError(f"backup failed: {target}")
+
+        def verify(target: Path = target) -> None:
+            if not backup_manager.verify_backup(str(target), str(source)):
+                raise OSError(f"verification failed: {target}")
+
+        yield f"backup.create.size={size_label(size)}", size, backup
+        yield f"backup.verify.size={size_label(size)}", size, verify
+
+
+_SUITE_OPERATIONS: Final[
+    dict[str, Callable[[Iterable[int], int, Path], Iterable[tuple[str, int, Operation]]]]
+] = {
+    "discount": _discount_operations,
+    "state": _state_operations,
+    "backup": _backup_operations,
+}
+
+
+def run_suites(
+    suites: Sequence[str] = SUITES,
+    seed: int = DEFAULT_SEED,
+    repeat: int = DEFAULT_REPEAT,
+    quick: bool = False,
+    directory: str | Path | None = None,
+    progress: Callable[[str, dict[str, Any]], object] | None = None,
+) -> dict[str, Any]:
+    """Run benchmark suites and return the report.
+
+    Args:
+        suites: Names from ``SUITES``
+        seed: Seed for the synthetic workloads
+        repeat: Timed runs per metric
+        quick: Use the small ``QUICK_SIZES`` (for smoke tests and CI)
+        directory: Where temporary state and backup files go (None for the
+            system temporary directory)
+        progress: Called with each metric name and result as it finishes
+
+    Returns:
+        ``{"version", "started", "seed", "repeat", "quick", "environment",
+        "metrics": {name: {"suite", "size", <measure() fields>}}}``
+
+    Raises:
+        ValueError: If a suite name is unknown
+        OSError: If a save, load, backup or verification fails
+    """
+    unknown = sorted(set(suites) - set(SUITES))
+    if unknown:
+        raise ValueError(f"Unknown benchmark suite(s): {', '.join(unknown)}")
+    sizes = QUICK_SIZES if quick else SIZES
+    report: dict[str, Any] = {
+        "version": REPORT_VERSION,
+        "started": datetime.now(timezone.utc).isoformat(),
+        "seed": seed,
+        "repeat": repeat,
+        "quick": quick,
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "metrics": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="inventory-bench-", dir=directory) as tmp:
+        for suite in suites:
+            for name, size, operation in _SUITE_OPERATIONS[suite](sizes[suite], seed, Path(tmp)):
+                result = {"suite": suite, "size": size, **measure(operation, repeat)}
+                report["metrics"][name] = result
+                if progress is not None:
+                    progress(name, result)
+    return report
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> list[Comparison]:
+    """Compare the metrics both reports share.
+
+    Metrics missing from either report are skipped, so adding a suite or a
+    size never fails a comparison against an older baseline.
+
+    Raises:
+        ValueError: If either report has an unsupported version
+    """
+    for report in (current, baseline):
+        if report.get("version") != REPORT_VERSION:
+            raise ValueError(f"Unsupported benchmark report version: {report.get('version')}")
+    comparisons = []
+    for name, metric in current["metrics"].items():
+        reference = baseline["metrics"].get(name)
+        if reference is None:
+            continue
+        for field in COMPARED_FIELDS:
+            if field in metric and field in reference:
+                comparisons.append(
+                    Comparison(name, field, float(reference[field]), float(metric[field]))
+                )
+    return comparisons
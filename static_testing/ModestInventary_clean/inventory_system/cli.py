@@ -1,98 +1,193 @@
 """Command-line interface for inventory management system.
 
 Provides CLI commands for authentication, backup, state management,
-and discount calculation.
+and discount calculation. With ``--server`` (or ``INVENTORY_SERVER``) the
+discount, login, save and load commands are forwarded to a running
+``inventory serve`` process instead of being executed locally.
+
+``--profile`` and ``--trace-memory`` (or ``INVENTORY_PROFILE`` /
+``INVENTORY_TRACE_MEMORY``) wrap the subcommand, including its import, in
+``cProfile`` and ``tracemalloc`` and write a JSON report (see
+``inventory_system.profiling``).
+
+Subcommands live in ``inventory_system.commands`` and are imported only when
+invoked; ``--help`` is rendered from the registry below without importing
+any command module.
 """
 
-import click
+from typing import Final, NamedTuple
 
-from inventory_system.auth import is_admin
-from inventory_system.logic.discount_calculator import calculate_discount
-from inventory_system.persistence import state_manager
-from inventory_system.utils.backup_manager import create_backup
+import click
 
 
-@click.group()
-def cli() -> None:
+class LazyCommand(NamedTuple):
+    """Import location and help summary of a lazily loaded subcommand."""
+
+    import_path: str
+    short_help: str
+
+
+COMMAND_META_KEY: Final[str] = "inventory.command"
+LAZY_COMMANDS: Final[dict[str, LazyCommand]] = {
+    "add": LazyCommand("inventory_system.commands.add:add", "Add a new item to the inventory."),
+    "adjust-stock": LazyCommand(
+        "inventory_system.commands.adjust_stock:adjust_stock",
+        "Add or remove units of an existing item.",
+    ),
+    "backup": LazyCommand(
+        "inventory_system.commands.backup:backup",
+        "Create a file backup without shell command execution.",
+    ),
+    "bench": LazyCommand(
+        "inventory_system.commands.bench:bench",
+        "Run seeded discount, state and backup benchmarks and compare with a baseline.",
+    ),
+    "cache-stats": LazyCommand(
+        "inventory_system.commands.cache_stats:cache_stats",
+        "Show discount, state and login cache hit, miss and eviction counters.",
+    ),
+    "discount": LazyCommand(
+        "inventory_system.commands.discount:discount",
+        "Calculate discount for a purchase.",
+    ),
+    "load": LazyCommand("inventory_system.commands.load:load", "Load state from JSON file."),
+    "login": LazyCommand(
+        "inventory_system.commands.login:login",
+        "Authenticate a user from the credential file or the admin environment.",
+    ),
+    "logout": LazyCommand(
+        "inventory_system.commands.logout:logout", "Revoke the stored session token."
+    ),
+    "prune-backups": LazyCommand(
+        "inventory_system.commands.prune_backups:prune_backups_command",
+        "List or prune incremental backups and delete unused chunks.",
+    ),
+    "query": LazyCommand(
+        "inventory_system.commands.query:query",
+        "List inventory items by SKU, category or low stock.",
+    ),
+    "restore-backup": LazyCommand(
+        "inventory_system.commands.restore_backup:restore_backup_command",
+        "Restore a file from an incremental store or a compressed backup.",
+    ),
+    "save": LazyCommand(
+        "inventory_system.commands.save:save",
+        "Rewrite the current state, optionally in another format.",
+    ),
+    "serve": LazyCommand(
+        "inventory_system.commands.serve:serve",
+        "Keep the package loaded and answer discount/login/save/load requests.",
+    ),
+    "set-password": LazyCommand(
+        "inventory_system.commands.set_password:set_password_command",
+        "Add a user to the credential file or change their password.",
+    ),
+    "verify-backup": LazyCommand(
+        "inventory_system.commands.verify_backup:verify_backup_command",
+        "Check a backup against its manifest or the original file.",
+    ),
+}
+
+
+class LazyGroup(click.Group):
+    """Click group that imports a subcommand's module only when it is resolved."""
+
+    def __init__(
+        self, *args: object, lazy_commands: dict[str, LazyCommand] | None = None, **kwargs: object
+    ) -> None:
+        super().__init__(*args, **kwargs)  # type: ignore[arg-type]
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.commands or cmd_name not in self.lazy_commands:
+            return super().get_command(ctx, cmd_name)
+        module_name, _, attribute = self.lazy_commands[cmd_name].import_path.partition(":")
+        # __import__ (unlike importlib.import_module) is visible to -X importtime.
+        module = __import__(module_name, fromlist=[attribute])
+        command = getattr(module, attribute)
+        if not isinstance(command, click.Command):
+            raise click.ClickException(f"Lazy command {cmd_name!r} did not resolve to a command")
+        return command
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        """List commands from the registry so help never imports a command module."""
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.lazy_commands and name not in self.commands:
+                rows.append((name, self.lazy_commands[name].short_help))
+                continue
+            command = super().get_command(ctx, name)
+            if command is not None and not command.hidden:
+                rows.append((name, command.get_short_help_str(formatter.width)))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+class InventoryGroup(LazyGroup):
+    """Lazy group that profiles the subcommand when ``--profile``/``--trace-memory`` is set."""
+
+    def resolve_command(
+        self, ctx: click.Context, args: list[str]
+    ) -> tuple[str | None, click.Command | None, list[str]]:
+        name, command, rest = super().resolve_command(ctx, args)
+        # only the name: arguments may hold secrets (``login admin <password>``)
+        ctx.meta[COMMAND_META_KEY] = [name] if name else []
+        return name, command, rest
+
+    def invoke(self, ctx: click.Context) -> object:
+        cpu, memory = bool(ctx.params.get("profile")), bool(ctx.params.get("trace_memory"))
+        if not (cpu or memory):
+            return super().invoke(ctx)
+
+        from inventory_system.profiling import RunProfiler
+
+        profiler = RunProfiler(ctx.params["profile_output"], cpu=cpu, memory=memory)
+        profiler.start()
+        try:
+            return super().invoke(ctx)
+        finally:
+            try:
+                path = profiler.finish(ctx.meta.get(COMMAND_META_KEY, []))
+            except OSError as error:
+                click.echo(f"Error writing profile report: {error}", err=True)
+            else:
+                click.echo(f"Profile report written to {path}", err=True)
+
+
+@click.group(cls=InventoryGroup, lazy_commands=LAZY_COMMANDS)
+@click.option(
+    "--server",
+    envvar="INVENTORY_SERVER",
+    default=None,
+    help="Forward commands to a running server (unix:/path or http://127.0.0.1:PORT).",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    envvar="INVENTORY_PROFILE",
+    help="Profile the command with cProfile and report the top functions.",
+)
+@click.option(
+    "--trace-memory",
+    is_flag=True,
+    envvar="INVENTORY_TRACE_MEMORY",
+    help="Trace allocations with tracemalloc and report peak memory and top sites.",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(dir_okay=True, writable=True),
+    envvar="INVENTORY_PROFILE_OUTPUT",
+    default="inventory-profile.json",
+    show_default=True,
+    help="Report file, or a directory that gets one report per run.",
+)
+def cli(server: str | None, profile: bool, trace_memory: bool, profile_output: str) -> None:
     """Secure inventory management system CLI."""
 
 
-@cli.command()
-@click.argument("username")
-@click.argument("password")
-def login(username: str, password: str) -> None:
-    """Authenticate admin user with environment-backed credentials."""
-    if is_admin(username, password):
-        click.echo("Login successful! Welcome, admin.")
-    else:
-        click.echo("Login failed.")
-
-
-@cli.command()
-@click.argument("destination")
-def backup(destination: str) -> None:
-    """Create a file backup without shell command execution."""
-    try:
-        target = create_backup(destination)
-        click.echo(f"Backup created at: {target}")
-    except FileNotFoundError as error:
-        click.echo(str(error))
-
-
-@cli.command()
-def save() -> None:
-    """Save a sample state in JSON format."""
-    dummy_data = {"items": ["laptop", "mouse"], "user": "test"}
-    saved_path = state_manager.save_state(dummy_data)
-    click.echo(f"State saved to {saved_path}")
-
-
-@cli.command()
-def load() -> None:
-    """Load state from JSON file."""
-    data = state_manager.load_state()
-    if data:
-        click.echo(f"Loaded data: {data}")
-    else:
-        click.echo("No state file found.")
-
-
-@cli.command()
-@click.argument("category")
-@click.argument("user_level")
-@click.argument("purchase_count", type=int)
-@click.option("--holiday", is_flag=True, default=False)
-@click.option("--season", default="normal")
-@click.option("--region", default="US")
-def discount(
-    category: str,
-    user_level: str,
-    purchase_count: int,
-    holiday: bool,
-    season: str,
-    region: str,
-) -> None:
-    """Calculate discount for a purchase.
-
-    Args:
-        category: Product category (electronics, books, clothing, furniture)
-        user_level: Customer tier (platinum, gold, silver, bronze, or other)
-        purchase_count: Number of past purchases
-        holiday: Whether to apply holiday bonus
-        season: Seasonal context (normal, black_friday, clearance, summer)
-        region: Geographic region (US, EU, ASIA)
-    """
-    discount_amount = calculate_discount(
-        item_category=category,
-        user_level=user_level,
-        purchase_history_count=purchase_count,
-        is_holiday=holiday,
-        season=season,
-        region=region,
-    )
-    discount_pct = discount_amount * 100
-    click.echo(f"Discount: {discount_pct:.1f}% ({category}, {user_level})")
-
-
 if __name__ == "__main__":
     cli()
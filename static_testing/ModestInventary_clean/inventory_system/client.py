@@ -0,0 +1,164 @@
+"""Thin client for the long-running inventory server.
+
+Sends requests to a server started with ``inventory serve`` and returns the
+decoded responses, so CLI commands can run remotely with the same syntax.
+"""
+
+import http.client
+import json
+import socket
+from typing import Any, Final
+
+LOCAL_HOSTS: Final[frozenset[str]] = frozenset({"127.0.0.1", "localhost"})
+
+
+def parse_address(address: str) -> tuple[str, str | tuple[str, int]]:
+    """Parse a server address.
+
+    Accepted forms are ``unix:/path/to/socket``, ``http://host:port`` and
+    ``host:port``. HTTP addresses must point at a loopback host.
+
+    Args:
+        address: Address string
+
+    Returns:
+        Tuple of transport ("unix" or "http") and socket path or (host, port)
+
+    Raises:
+        ValueError: If the address is malformed or not local
+    """
+    if address.startswith("unix:"):
+        path = address[len("unix:"):]
+        if not path:
+            raise ValueError("Unix socket address requires a path")
+        return "unix", path
+
+    host_port = address.removeprefix("http://").rstrip("/")
+    host, separator, port = host_port.rpartition(":")
+    if not separator or not port.isdigit():
+        raise ValueError(f"Invalid server address: {address}")
+    if host not in LOCAL_HOSTS:
+        raise ValueError(f"Server address must be local, got: {host}")
+    return "http", (host, int(port))
+
+
+class ServerError(RuntimeError):
+    """Raised when the server cannot be reached or rejects a request."""
+
+
+class InventoryClient:
+    """Persistent connection to an inventory server.
+
+    Keeping one client open for many requests avoids reconnecting per call.
+    """
+
+    def __init__(self, address: str, timeout: float = 30.0) -> None:
+        self.address = address
+        self.timeout = timeout
+        _, self._target = parse_address(address)
+        self._sock: socket.socket | None = None
+        self._reader: Any = None
+        self._http: http.client.HTTPConnection | None = None
+
+    def __enter__(self) -> "InventoryClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def send(self, payload: Any) -> Any:
+        """Send one request (or a batch list) and return the decoded response.
+
+        Args:
+            payload: Request object or list of request objects
+
+        Returns:
+            Response envelope, or list of envelopes for a batch
+
+        Raises:
+            ServerError: If the server is unreachable or replies with invalid data
+        """
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        try:
+            if isinstance(self._target, str):
+                raw = self._send_unix(self._target, body)
+            else:
+                raw = self._send_http(self._target, body)
+            return json.loads(raw)
+        except (OSError, http.client.HTTPException, json.JSONDecodeError) as error:
+            self.close()
+            raise ServerError(f"Server request to {self.address} failed: {error}") from error
+
+    def call(
+        self, command: str, params: dict[str, Any] | None = None, token: str | None = None
+    ) -> dict[str, Any]:
+        """Run one command on the server and return its result.
+
+        Args:
+            command: Command name (discount, login, save, load)
+            params: Command parameters
+            token: Session token for admin commands, if any
+
+        Returns:
+            Command result dictionary
+
+        Raises:
+            ServerError: If the request fails or the server reports an error
+        """
+        request: dict[str, Any] = {"command": command, "params": params or {}}
+        if token is not None:
+            request["token"] = token
+        response = self.send(request)
+        if not isinstance(response, dict) or not response.get("ok"):
+            error = response.get("error") if isinstance(response, dict) else response
+            raise ServerError(f"Server error: {error}")
+        result: dict[str, Any] = response["result"]
+        return result
+
+    def _send_unix(self, path: str, body: bytes) -> bytes:
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(self.timeout)
+            self._sock.connect(path)
+            self._reader = self._sock.makefile("rb")
+        self._sock.sendall(body + b"\n")
+        line: bytes = self._reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        return line
+
+    def _send_http(self, target: tuple[str, int], body: bytes) -> bytes:
+        if self._http is None:
+            self._http = http.client.HTTPConnection(*target, timeout=self.timeout)
+        self._http.request("POST", "/", body=body, headers={"Content-Type": "application/json"})
+        return self._http.getresponse().read()
+
+
+def call(
+    address: str, command: str, params: dict[str, Any] | None = None, token: str | None = None
+) -> dict[str, Any]:
+    """Run one command on the server at ``address`` over a fresh connection.
+
+    Args:
+        address: Server address (unix:/path or http://127.0.0.1:port)
+        command: Command name
+        params: Command parameters
+        token: Session token for admin commands, if any
+
+    Returns:
+        Command result dictionary
+    """
+    with InventoryClient(address) as client:
+        return client.call(command, params, token)
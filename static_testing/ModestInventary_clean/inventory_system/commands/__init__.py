@@ -0,0 +1,51 @@
+"""Inventory CLI subcommands, one module per command.
+
+Each module is imported only when its command is invoked, so a command pays
+only for the modules it actually uses.
+"""
+
+from typing import Any
+
+import click
+
+
+def run(command: str, params: dict[str, Any]) -> dict[str, Any]:
+    """Execute a command locally or on the configured server.
+
+    Args:
+        command: Command name (see ``service.HANDLERS``)
+        params: Command parameters
+
+    Returns:
+        Command result dictionary
+    """
+    ctx = click.get_current_context()
+    address = ctx.find_root().params.get("server")
+    if not address:
+        from inventory_system import service
+
+        try:
+            return service.execute(command, params)
+        except service.CommandError as error:
+            raise click.ClickException(str(error)) from error
+
+    from inventory_system import service, session
+    from inventory_system.client import ServerError, call
+
+    current = session.current_session() if command in service.ADMIN_COMMANDS else None
+    try:
+        return call(address, command, params, current.token if current else None)
+    except (ServerError, ValueError) as error:
+        raise click.ClickException(str(error)) from error
+
+
+def require_session() -> None:
+    """Stop an admin command unless a valid login session exists.
+
+    Only enforced when ``INVENTORY_REQUIRE_LOGIN`` is set; the check is one
+    HMAC over the stored token, never a credential lookup.
+    """
+    from inventory_system import session
+
+    if session.login_required() and session.current_session() is None:
+        raise click.ClickException("Admin session required: run `inventory login` first")
@@ -0,0 +1,27 @@
+"""``inventory add`` command."""
+
+import click
+
+from inventory_system.commands import require_session, run
+
+
+@click.command()
+@click.argument("sku")
+@click.argument("category")
+@click.argument("quantity", type=click.IntRange(min=0))
+@click.argument("price", type=click.FloatRange(min=0))
+def add(sku: str, category: str, quantity: int, price: float) -> None:
+    """Add a new item to the inventory.
+
+    Args:
+        sku: Unique stock keeping unit
+        category: Product category (stored lowercase)
+        quantity: Units in stock
+        price: Unit price
+    """
+    require_session()
+    params = {"sku": sku, "category": category, "quantity": quantity, "price": price}
+    item = run("item_add", params)["item"]
+    click.echo(
+        f"Added {item['sku']} ({item['category']}): {item['quantity']} @ {item['price']:.2f}"
+    )
@@ -0,0 +1,21 @@
+"""``inventory adjust-stock`` command."""
+
+import click
+
+from inventory_system.commands import require_session, run
+
+
+# Lets negative deltas like -3 be passed without a "--" separator.
+@click.command("adjust-stock", context_settings={"ignore_unknown_options": True})
+@click.argument("sku")
+@click.argument("delta", type=int)
+def adjust_stock(sku: str, delta: int) -> None:
+    """Add or remove units of an existing item.
+
+    Args:
+        sku: Item to change
+        delta: Units to add (positive) or remove (negative)
+    """
+    require_session()
+    item = run("item_adjust_stock", {"sku": sku, "delta": delta})["item"]
+    click.echo(f"{item['sku']}: {item['quantity']} in stock")
@@ -0,0 +1,121 @@
+"""``inventory backup`` command."""
+
+import click
+
+from inventory_system.commands import require_session
+from inventory_system.utils.backup_manager import (
+    compressed_backup,
+    create_backup,
+    fan_out_backup,
+    snapshot_backup,
+)
+from inventory_system.utils.incremental_backup import create_incremental_backup
+
+
+def _fan_out(destinations: tuple[str, ...], manifest: bool) -> None:
+    result = fan_out_backup(destinations, manifest=manifest)
+    if result is None:
+        raise click.ClickException("Backup failed")
+    click.echo(f"Read {result.size:,} bytes once in {result.read_seconds * 1e3:.1f} ms")
+    for item in result.destinations:
+        outcome = f"created at: {item.path}" if item.error is None else f"FAILED: {item.error}"
+        click.echo(f"  {item.destination}: {outcome} ({item.seconds * 1e3:.1f} ms)")
+    if result.failed:
+        raise click.ClickException(
+            f"{len(result.failed)} of {len(result.destinations)} destination(s) failed"
+        )
+
+
+@click.command()
+@click.argument("destinations", metavar="DESTINATION...", nargs=-1, required=True)
+@click.option(
+    "--manifest", is_flag=True, default=False, help="Also write a SHA-256 manifest next to it."
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Treat DESTINATION as a deduplicating chunk store and add a backup to it.",
+)
+@click.option(
+    "--snapshot",
+    is_flag=True,
+    default=False,
+    help="Use a reflink, hardlink or in-kernel copy instead of a userspace copy.",
+)
+@click.option(
+    "--no-hardlink",
+    is_flag=True,
+    default=False,
+    help="With --snapshot, never share the state file's inode.",
+)
+@click.option(
+    "--compress",
+    type=click.Choice(["gzip", "xz"]),
+    default=None,
+    help="Compress the backup on every core (standard .gz/.xz output).",
+)
+@click.option("--workers", type=int, default=None, help="Compression threads (default: all CPUs).")
+@click.option(
+    "--level", type=click.IntRange(0, 9), default=None, help="Compression level (default: 6)."
+)
+def backup(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    destinations: tuple[str, ...],
+    manifest: bool,
+    incremental: bool,
+    snapshot: bool,
+    no_hardlink: bool,
+    compress: str | None,
+    workers: int | None,
+    level: int | None,
+) -> None:
+    """Create a file backup without shell command execution.
+
+    Several DESTINATIONs are written concurrently from a single read of the
+    state file; a failing destination does not stop the others.
+    """
+    require_session()
+    if len(destinations) > 1:
+        if incremental or snapshot or compress:
+            raise click.UsageError(
+                "--incremental, --snapshot and --compress take a single DESTINATION"
+            )
+        _fan_out(destinations, manifest)
+        return
+    destination = destinations[0]
+    if incremental:
+        result = create_incremental_backup(destination)
+        if result is None:
+            raise click.ClickException("Incremental backup failed")
+        click.echo(
+            f"Backup {result.manifest.backup_id}: {len(result.manifest.chunks)} chunks, "
+            f"{result.new_chunks} new, {result.bytes_written:,} of "
+            f"{result.manifest.size:,} bytes written"
+        )
+        return
+    if compress:
+        compressed = compressed_backup(destination, compress, level, workers, manifest)
+        if compressed is None:
+            raise click.ClickException("Compressed backup failed")
+        compressed_path, stats = compressed
+        click.echo(
+            f"Backup created at: {compressed_path} "
+            f"({stats.bytes_in:,} -> {stats.bytes_out:,} bytes, "
+            f"{stats.ratio:.1f}x, {stats.workers} worker(s), "
+            f"{stats.throughput / 2**20:.0f} MiB/s)"
+        )
+        return
+    if snapshot:
+        snap = snapshot_backup(destination, manifest=manifest, allow_hardlink=not no_hardlink)
+        if snap is None:
+            raise click.ClickException("Snapshot backup failed")
+        click.echo(
+            f"Backup created at: {snap.path} ({snap.mode}, {snap.size:,} bytes "
+            f"in {snap.seconds * 1e3:.1f} ms)"
+        )
+        return
+    try:
+        target = create_backup(destination, manifest=manifest)
+        click.echo(f"Backup created at: {target}")
+    except FileNotFoundError as error:
+        click.echo(str(error))
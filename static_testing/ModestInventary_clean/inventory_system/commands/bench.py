@@ -0,0 +1,129 @@
+"""``inventory bench`` command."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import click
+
+from inventory_system import benchmark
+
+
+def _progress(name: str, result: dict[str, Any]) -> None:
+    click.echo(
+        f"{name:<32} median={result['median_seconds'] * 1000:10.3f} ms  "
+        f"p90={result['p90_seconds'] * 1000:10.3f} ms  "
+        f"peak={result['peak_bytes'] / 1024:10.1f} KiB",
+        err=True,
+    )
+
+
+def _format(field: str, value: float) -> str:
+    if field == "peak_bytes":
+        return f"{value / 1024:.1f} KiB"
+    return f"{value * 1000:.3f} ms"
+
+
+def _read_report(path: str) -> dict[str, Any]:
+    try:
+        report = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as error:
+        raise click.ClickException(f"Cannot read baseline {path}: {error}") from error
+    if not isinstance(report, dict) or not isinstance(report.get("metrics"), dict):
+        raise click.ClickException(f"Not a benchmark report: {path}")
+    return report
+
+
+@click.command()
+@click.option(
+    "--suite",
+    "suites",
+    type=click.Choice(benchmark.SUITES),
+    multiple=True,
+    help="Suite to run; repeat for several. [default: all]",
+)
+@click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=benchmark.DEFAULT_REPEAT,
+    show_default=True,
+    help="Timed runs per metric.",
+)
+@click.option("--seed", type=int, default=benchmark.DEFAULT_SEED, show_default=True)
+@click.option("--quick", is_flag=True, help="Use small sizes (smoke tests, CI).")
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Write the JSON report to this file instead of standard output.",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Stored report to compare with; exit with status 1 on a regression.",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=benchmark.DEFAULT_THRESHOLD,
+    show_default=True,
+    help="Allowed relative growth of median time or peak memory (0.10 is 10%).",
+)
+@click.option(
+    "--directory",
+    type=click.Path(file_okay=False, exists=True),
+    default=None,
+    help="Where temporary files go (use the production disk for save/backup numbers).",
+)
+def bench(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    suites: tuple[str, ...],
+    repeat: int,
+    seed: int,
+    quick: bool,
+    output: str | None,
+    baseline: str | None,
+    threshold: float,
+    directory: str | None,
+) -> None:
+    """Run seeded discount, state and backup benchmarks and compare with a baseline.
+
+    Progress and the comparison go to standard error, so standard output (or
+    ``--output``) holds only the JSON report, ready to be stored as the next
+    baseline.
+    """
+    reference = _read_report(baseline) if baseline else None
+    try:
+        report = benchmark.run_suites(
+            suites or benchmark.SUITES, seed, repeat, quick, directory, _progress
+        )
+        comparisons = benchmark.compare(report, reference) if reference else []
+    except (OSError, ValueError) as error:
+        raise click.ClickException(str(error)) from error
+
+    regressions = [item for item in comparisons if item.regressed(threshold)]
+    if reference is not None:
+        report["comparison"] = {
+            "baseline": baseline,
+            "threshold": threshold,
+            "results": [item.as_dict() for item in comparisons],
+            "regressions": len(regressions),
+        }
+    text = json.dumps(report, indent=2) + "\n"
+    if output:
+        Path(output).write_text(text, encoding="utf-8")
+    else:
+        click.echo(text, nl=False)
+
+    for item in comparisons:
+        status = "REGRESSION" if item in regressions else "ok"
+        click.echo(
+            f"{status:<10} {item.metric:<32} {item.field:<15} "
+            f"{_format(item.field, item.baseline):>14} -> "
+            f"{_format(item.field, item.current):<14} {item.change:+.1%}",
+            err=True,
+        )
+    if regressions:
+        raise click.ClickException(
+            f"{len(regressions)} metric(s) regressed by more than {threshold:.0%}"
+        )
@@ -0,0 +1,43 @@
+"""``inventory cache-stats`` command."""
+
+import click
+
+from inventory_system.commands import run
+
+
+@click.command("cache-stats")
+def cache_stats() -> None:
+    """Show discount, state and login cache hit, miss and eviction counters.
+
+    The caches live in long-running processes, so this is mostly useful with
+    ``--server`` against ``inventory serve --discount-cache N --state-cache N``.
+    """
+    result = run("cache_stats", {})
+    stats = result["stats"]
+    if not result["enabled"] or stats is None:
+        click.echo("Discount cache disabled.")
+    else:
+        click.echo(
+            f"Discount cache: size={stats['size']}/{stats['maxsize']} "
+            f"hits={stats['hits']} misses={stats['misses']} "
+            f"evictions={stats['evictions']} invalidations={stats['invalidations']} "
+            f"hit_rate={stats['hit_rate']:.1%}"
+        )
+
+    state = result.get("state")
+    if state is None:
+        click.echo("State cache disabled.")
+    else:
+        click.echo(
+            f"State cache: entries={state['entries']}/{state['max_entries']} "
+            f"hits={state['hits']} misses={state['misses']} stale={state['stale']} "
+            f"write_throughs={state['write_throughs']} hit_rate={state['hit_rate']:.1%}"
+        )
+
+    login = result.get("login")
+    if login is not None:
+        click.echo(
+            f"Login cache: size={login['size']}/{login['maxsize']} hits={login['hits']} "
+            f"misses={login['misses']} expired={login['expired']} "
+            f"hit_rate={login['hit_rate']:.1%}"
+        )
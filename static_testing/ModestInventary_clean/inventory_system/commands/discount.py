@@ -0,0 +1,45 @@
+"""``inventory discount`` command."""
+
+import click
+
+from inventory_system.commands import run
+
+
+@click.command()
+@click.argument("category")
+@click.argument("user_level")
+@click.argument("purchase_count", type=int)
+@click.option("--holiday", is_flag=True, default=False)
+@click.option("--season", default="normal")
+@click.option("--region", default="US")
+def discount(
+    category: str,
+    user_level: str,
+    purchase_count: int,
+    holiday: bool,
+    season: str,
+    region: str,
+) -> None:
+    """Calculate discount for a purchase.
+
+    Args:
+        category: Product category (electronics, books, clothing, furniture)
+        user_level: Customer tier (platinum, gold, silver, bronze, or other)
+        purchase_count: Number of past purchases
+        holiday: Whether to apply holiday bonus
+        season: Seasonal context (normal, black_friday, clearance, summer)
+        region: Geographic region (US, EU, ASIA)
+    """
+    discount_amount = run(
+        "discount",
+        {
+            "category": category,
+            "user_level": user_level,
+            "purchase_count": purchase_count,
+            "holiday": holiday,
+            "season": season,
+            "region": region,
+        },
+    )["discount"]
+    discount_pct = discount_amount * 100
+    click.echo(f"Discount: {discount_pct:.1f}% ({category}, {user_level})")
@@ -0,0 +1,15 @@
+"""``inventory load`` command."""
+
+import click
+
+from inventory_system.commands import run
+
+
+@click.command()
+def load() -> None:
+    """Load state from JSON file."""
+    data = run("load", {})["data"]
+    if data:
+        click.echo(f"Loaded data: {data}")
+    else:
+        click.echo("No state file found.")
@@ -0,0 +1,36 @@
+"""``inventory login`` command."""
+
+import click
+
+from inventory_system.commands import run
+from inventory_system.session import DEFAULT_TTL_SECONDS, issue_token
+
+
+@click.command()
+@click.argument("username")
+@click.argument("password")
+@click.option(
+    "--ttl",
+    type=int,
+    default=DEFAULT_TTL_SECONDS,
+    show_default=True,
+    help="Session lifetime in seconds.",
+)
+@click.option("--no-session", is_flag=True, default=False, help="Do not store a session token.")
+def login(username: str, password: str, ttl: int, no_session: bool) -> None:
+    """Authenticate a user from the credential file or the admin environment.
+
+    On success a signed session token is stored locally, so admin commands
+    run without re-authenticating until it expires or ``logout`` revokes it.
+    """
+    if not run("login", {"username": username, "password": password})["authenticated"]:
+        click.echo("Login failed.")
+        return
+    click.echo(f"Login successful! Welcome, {username}.")
+    if no_session:
+        return
+    try:
+        issue_token(username, ttl)
+    except (OSError, ValueError) as error:
+        raise click.ClickException(f"Could not store session: {error}") from error
+    click.echo(f"Session valid for {ttl} s.")
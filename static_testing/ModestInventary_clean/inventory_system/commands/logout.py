@@ -0,0 +1,19 @@
+"""``inventory logout`` command."""
+
+import click
+
+from inventory_system.session import revoke, revoke_all
+
+
+@click.command()
+@click.option(
+    "--all", "everywhere", is_flag=True, default=False, help="Invalidate every issued token."
+)
+def logout(everywhere: bool) -> None:
+    """Revoke the stored session token."""
+    if everywhere:
+        revoke_all()
+        click.echo("All sessions revoked.")
+        return
+    session = revoke()
+    click.echo(f"Logged out {session.subject}." if session else "No active session.")
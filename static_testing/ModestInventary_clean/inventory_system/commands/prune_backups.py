@@ -0,0 +1,34 @@
+"""``inventory prune-backups`` command."""
+
+from datetime import timedelta
+
+import click
+
+from inventory_system.commands import require_session
+from inventory_system.utils.incremental_backup import ChunkStore, prune_backups
+
+
+@click.command("prune-backups")
+@click.argument("store")
+@click.option("--keep-last", default=24, show_default=True, help="Newest backups to keep.")
+@click.option(
+    "--keep-days", type=float, default=None, help="Also keep backups younger than this many days."
+)
+@click.option("--list", "list_only", is_flag=True, default=False, help="Only list the backups.")
+def prune_backups_command(
+    store: str, keep_last: int, keep_days: float | None, list_only: bool
+) -> None:
+    """List or prune incremental backups and delete unused chunks."""
+    require_session()
+    if list_only:
+        for manifest in ChunkStore(store).manifests():
+            click.echo(f"{manifest.backup_id}  {manifest.size:>12,} bytes  {manifest.source}")
+        return
+    keep_within = timedelta(days=keep_days) if keep_days is not None else None
+    result = prune_backups(store, keep_last=keep_last, keep_within=keep_within)
+    if result is None:
+        raise click.ClickException(f"Could not prune {store}")
+    click.echo(
+        f"Removed {len(result.removed_backups)} backup(s) and {result.removed_chunks} chunk(s), "
+        f"freed {result.freed_bytes:,} bytes"
+    )
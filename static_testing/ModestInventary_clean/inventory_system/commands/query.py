@@ -0,0 +1,32 @@
+"""``inventory query`` command."""
+
+import click
+
+from inventory_system.commands import run
+
+
+@click.command()
+@click.option("--sku", default=None, help="Look up a single item.")
+@click.option("--category", default=None, help="Only items of this category.")
+@click.option(
+    "--low-stock",
+    "max_quantity",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Only items with at most this many units, lowest first.",
+)
+@click.option("--limit", type=click.IntRange(min=1), default=None, help="Maximum items listed.")
+def query(
+    sku: str | None, category: str | None, max_quantity: int | None, limit: int | None
+) -> None:
+    """List inventory items by SKU, category or low stock."""
+    result = run(
+        "item_query",
+        {"sku": sku, "category": category, "max_quantity": max_quantity, "limit": limit},
+    )
+    for item in result["items"]:
+        click.echo(
+            f"{item['sku']:<16} {item['category']:<14} "
+            f"{item['quantity']:>8} {item['price']:>10.2f}"
+        )
+    click.echo(f"{result['count']} item(s), stock value {result['stock_value']:.2f}")
@@ -0,0 +1,31 @@
+"""``inventory restore-backup`` command."""
+
+import click
+
+from inventory_system.commands import require_session
+from inventory_system.utils.backup_manager import decompress_backup
+from inventory_system.utils.incremental_backup import LATEST, restore_backup
+from inventory_system.utils.parallel_compress import format_for_name
+
+
+@click.command("restore-backup")
+@click.argument("store")
+@click.argument("destination")
+@click.option("--id", "backup_id", default=LATEST, show_default=True, help="Backup to restore.")
+def restore_backup_command(store: str, backup_id: str, destination: str) -> None:
+    """Restore a file from an incremental store or a compressed backup.
+
+    STORE is an incremental backup store directory or a ``.gz``/``.xz``
+    backup, which is decompressed as a stream.
+    """
+    require_session()
+    if format_for_name(store):
+        target = decompress_backup(store, destination)
+        if target is None:
+            raise click.ClickException(f"Could not decompress {store}")
+        click.echo(f"Restored {store} to: {target}")
+        return
+    target = restore_backup(store, backup_id, destination)
+    if target is None:
+        raise click.ClickException(f"Could not restore backup {backup_id} from {store}")
+    click.echo(f"Restored {backup_id} to: {target}")
@@ -0,0 +1,32 @@
+"""``inventory save`` command."""
+
+import click
+
+from inventory_system.commands import require_session, run
+
+
+@click.command()
+@click.option(
+    "--compact/--pretty",
+    default=None,
+    help="Write minified or indented JSON. [default: as the current file]",
+)
+@click.option(
+    "--layout",
+    type=click.Choice(["json", "lines"]),
+    default=None,
+    help="Single JSON document or streamable line-delimited layout. "
+    "[default: as the current file]",
+)
+@click.option(
+    "--codec",
+    type=click.Choice(["none", "gzip", "bz2", "lzma"]),
+    default=None,
+    help="Compression codec. [default: as the current file, else from the extension]",
+)
+def save(compact: bool | None, layout: str | None, codec: str | None) -> None:
+    """Rewrite the current state, optionally in another format."""
+    require_session()
+    params = {"compact": compact, "layout": layout, "codec": codec}
+    result = run("save", params)
+    click.echo(f"State saved to {result['path']} ({result['items']} item(s))")
@@ -0,0 +1,58 @@
+"""``inventory serve`` command."""
+
+from pathlib import Path
+
+import click
+
+from inventory_system.server import serve as run_server
+
+
+@click.command()
+@click.option(
+    "--address",
+    default="http://127.0.0.1:8765",
+    show_default=True,
+    help="Listen address (unix:/path/to/socket or http://127.0.0.1:PORT).",
+)
+@click.option("--workers", default=8, show_default=True, help="Threads for batched requests.")
+@click.option(
+    "--state-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="State file used by save/load (defaults to data/inventory_state.json).",
+)
+@click.option(
+    "--discount-cache",
+    "discount_cache_size",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Memoize up to this many discount results in an LRU cache (0 disables it).",
+)
+@click.option(
+    "--state-cache",
+    "state_cache_size",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Keep up to this many decoded state files in a validated cache (0 disables it).",
+)
+def serve(
+    address: str,
+    workers: int,
+    state_file: Path | None,
+    discount_cache_size: int,
+    state_cache_size: int,
+) -> None:
+    """Keep the package loaded and answer discount/login/save/load requests."""
+    click.echo(f"Serving inventory requests on {address}")
+    try:
+        run_server(
+            address,
+            workers=workers,
+            state_file=state_file,
+            discount_cache_size=discount_cache_size,
+            state_cache_size=state_cache_size,
+        )
+    except (OSError, ValueError) as error:
+        raise click.ClickException(str(error)) from error
@@ -0,0 +1,30 @@
+"""``inventory set-password`` command."""
+
+import os
+
+import click
+
+from inventory_system.credentials import ALGORITHMS, CREDENTIALS_FILE_ENV, set_password
+
+
+@click.command("set-password")
+@click.argument("username")
+@click.option(
+    "--file",
+    "credentials_file",
+    default=lambda: os.getenv(CREDENTIALS_FILE_ENV),
+    help=f"Credential file (default: ${CREDENTIALS_FILE_ENV}).",
+)
+@click.option("--algorithm", type=click.Choice(ALGORITHMS), default="scrypt", show_default=True)
+@click.password_option()
+def set_password_command(
+    username: str, credentials_file: str | None, algorithm: str, password: str
+) -> None:
+    """Add a user to the credential file or change their password."""
+    if not credentials_file:
+        raise click.UsageError(f"Pass --file or set {CREDENTIALS_FILE_ENV}")
+    try:
+        set_password(credentials_file, username, password, algorithm)
+    except (OSError, ValueError) as error:
+        raise click.ClickException(str(error)) from error
+    click.echo(f"Password set for {username} in {credentials_file}")
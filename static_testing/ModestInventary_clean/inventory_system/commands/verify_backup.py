@@ -0,0 +1,19 @@
+"""``inventory verify-backup`` command."""
+
+import click
+
+from inventory_system.utils.backup_manager import verify_backup
+
+
+@click.command("verify-backup")
+@click.argument("backup_path")
+@click.option(
+    "--original",
+    default=None,
+    help="Compare with this file instead of the manifest or the live state file.",
+)
+def verify_backup_command(backup_path: str, original: str | None) -> None:
+    """Check a backup against its manifest or the original file."""
+    if not verify_backup(backup_path, original):
+        raise click.ClickException(f"Backup verification failed: {backup_path}")
+    click.echo(f"Backup OK: {backup_path}")
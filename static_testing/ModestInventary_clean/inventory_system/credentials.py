@@ -0,0 +1,320 @@
+"""Multi-user credential file with salted KDF hashes and a verified-login cache.
+
+The credential file (``INVENTORY_CREDENTIALS_FILE``) is a JSON object mapping
+usernames to encoded password hashes::
+
+    {"version": 1, "users": {"alice": "scrypt$16384$8$1$<salt>$<hash>"}}
+
+Supported encodings are ``scrypt$n$r$p$salt$hash`` and
+``pbkdf2_sha256$iterations$salt$hash`` (salt and hash in base64). The file is
+parsed once and kept indexed by username; it is re-read only when its size,
+mtime or inode changes.
+
+A deliberately slow KDF makes every verification cost tens of milliseconds.
+``VerifiedLoginCache`` remembers recent *successful* verifications for a
+short time so repeated automated logins in a long-lived process (``serve``)
+skip the KDF. Entries are keyed by an HMAC-SHA256 of username, password and
+stored hash under a random per-process key: the plaintext is never kept,
+the key never leaves memory, and changing a password invalidates its entries.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Final, NamedTuple
+
+CREDENTIALS_FILE_ENV: Final[str] = "INVENTORY_CREDENTIALS_FILE"
+FILE_VERSION: Final[int] = 1
+SCRYPT_N: Final[int] = 2**14
+SCRYPT_R: Final[int] = 8
+SCRYPT_P: Final[int] = 1
+PBKDF2_ITERATIONS: Final[int] = 600_000
+SALT_BYTES: Final[int] = 16
+HASH_BYTES: Final[int] = 32
+CACHE_TTL_SECONDS: Final[float] = 60.0
+CACHE_MAX_ENTRIES: Final[int] = 1024
+ALGORITHMS: Final[tuple[str, ...]] = ("scrypt", "pbkdf2_sha256")
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text.encode("ascii"), validate=True)
+
+
+def _scrypt_maxmem(n: int, r: int, p: int) -> int:
+    """Return a memory limit that fits scrypt's working set (128 * r * (n + p) bytes)."""
+    return 128 * r * (n + p + 2) + 1024 * 1024
+
+
+def _derive(password: str, encoded: str) -> tuple[bytes, bytes]:
+    """Return (expected, derived) hash bytes for ``password`` under ``encoded``.
+
+    Raises:
+        ValueError: If the encoded hash is malformed or uses an unknown KDF
+    """
+    algorithm, _, rest = encoded.partition("$")
+    fields = rest.split("$")
+    secret = password.encode("utf-8")
+    try:
+        if algorithm == "scrypt" and len(fields) == 5:
+            n, r, p = (int(field) for field in fields[:3])
+            salt, expected = _b64decode(fields[3]), _b64decode(fields[4])
+            derived = hashlib.scrypt(
+                secret,
+                salt=salt,
+                n=n,
+                r=r,
+                p=p,
+                maxmem=_scrypt_maxmem(n, r, p),
+                dklen=len(expected),
+            )
+            return expected, derived
+        if algorithm == "pbkdf2_sha256" and len(fields) == 3:
+            iterations = int(fields[0])
+            salt, expected = _b64decode(fields[1]), _b64decode(fields[2])
+            derived = hashlib.pbkdf2_hmac("sha256", secret, salt, iterations, len(expected))
+            return expected, derived
+    except (ValueError, TypeError) as error:
+        raise ValueError(f"Malformed password hash: {error}") from error
+    raise ValueError(f"Unsupported password hash: {algorithm or encoded[:16]}")
+
+
+def hash_password(password: str, algorithm: str = "scrypt", cost: int | None = None) -> str:
+    """Return a salted, encoded KDF hash of ``password``.
+
+    Args:
+        password: Plaintext password
+        algorithm: "scrypt" or "pbkdf2_sha256"
+        cost: scrypt ``n`` or PBKDF2 iterations; None uses the module default
+
+    Raises:
+        ValueError: If the algorithm is unknown
+    """
+    salt = secrets.token_bytes(SALT_BYTES)
+    secret = password.encode("utf-8")
+    if algorithm == "scrypt":
+        n = cost or SCRYPT_N
+        derived = hashlib.scrypt(
+            secret,
+            salt=salt,
+            n=n,
+            r=SCRYPT_R,
+            p=SCRYPT_P,
+            maxmem=_scrypt_maxmem(n, SCRYPT_R, SCRYPT_P),
+            dklen=HASH_BYTES,
+        )
+        return f"scrypt${n}${SCRYPT_R}${SCRYPT_P}${_b64encode(salt)}${_b64encode(derived)}"
+    if algorithm == "pbkdf2_sha256":
+        iterations = cost or PBKDF2_ITERATIONS
+        derived = hashlib.pbkdf2_hmac("sha256", secret, salt, iterations, HASH_BYTES)
+        return f"pbkdf2_sha256${iterations}${_b64encode(salt)}${_b64encode(derived)}"
+    raise ValueError(f"Unknown algorithm: {algorithm} (expected {', '.join(ALGORITHMS)})")
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    """Check ``password`` against an encoded hash in constant time.
+
+    Raises:
+        ValueError: If the encoded hash is malformed
+    """
+    expected, derived = _derive(password, encoded)
+    return hmac.compare_digest(expected, derived)
+
+
+class LoginCacheStats(NamedTuple):
+    """Snapshot of verified-login cache counters."""
+
+    hits: int
+    misses: int
+    expired: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters plus hit rate as a JSON-compatible dictionary."""
+        return {**self._asdict(), "hit_rate": self.hit_rate}
+
+
+class VerifiedLoginCache:
+    """Bounded, expiring set of recently verified (username, password, hash) triples."""
+
+    def __init__(
+        self, ttl: float = CACHE_TTL_SECONDS, maxsize: int = CACHE_MAX_ENTRIES
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._key = secrets.token_bytes(32)
+        self._entries: OrderedDict[bytes, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._expired = 0
+
+    def _digest(self, username: str, password: str, encoded: str) -> bytes:
+        message = "\0".join((username, password, encoded)).encode("utf-8")
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def contains(self, username: str, password: str, encoded: str) -> bool:
+        """Return whether this login was verified within the last ``ttl`` seconds."""
+        digest = self._digest(username, password, encoded)
+        now = time.monotonic()
+        with self._lock:
+            expires = self._entries.get(digest)
+            if expires is not None and expires > now:
+                self._hits += 1
+                self._entries.move_to_end(digest)
+                return True
+            if expires is not None:
+                del self._entries[digest]
+                self._expired += 1
+            self._misses += 1
+            return False
+
+    def add(self, username: str, password: str, encoded: str) -> None:
+        """Remember a successful verification."""
+        digest = self._digest(username, password, encoded)
+        with self._lock:
+            self._entries[digest] = time.monotonic() + self.ttl
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._expired = 0
+
+    def stats(self) -> LoginCacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return LoginCacheStats(
+                self._hits, self._misses, self._expired, len(self._entries), self.maxsize
+            )
+
+
+def _signature(path: Path) -> tuple[int, int, int]:
+    info = path.stat()
+    return info.st_ino, info.st_size, info.st_mtime_ns
+
+
+class CredentialStore:
+    """Username-indexed view of a credential file, reloaded when the file changes."""
+
+    def __init__(self, path: str | Path, cache: VerifiedLoginCache | None = None) -> None:
+        self.path = Path(path).expanduser().resolve()
+        self.cache = cache
+        self._users: dict[str, str] = {}
+        self._signature: tuple[int, int, int] | None = None
+        self._lock = threading.Lock()
+        # verified against when the user is unknown, so both paths cost one KDF
+        self._dummy: str | None = None
+
+    def users(self) -> dict[str, str]:
+        """Return the username -> encoded hash index, reloading a changed file.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a valid credential file
+        """
+        signature = _signature(self.path)
+        with self._lock:
+            if signature != self._signature:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if not isinstance(data, dict) or data.get("version") != FILE_VERSION:
+                    raise ValueError(f"Unsupported credential file: {self.path}")
+                users = data.get("users")
+                if not isinstance(users, dict):
+                    raise ValueError(f"Credential file has no users: {self.path}")
+                self._users = {str(name): str(encoded) for name, encoded in users.items()}
+                self._signature = signature
+            return self._users
+
+    def verify(self, username: str, password: str) -> bool:
+        """Return whether ``password`` is correct for ``username``."""
+        encoded = self.users().get(username)
+        if encoded is None:
+            if self._dummy is None:
+                self._dummy = hash_password(secrets.token_hex(8))
+            verify_password(password, self._dummy)
+            return False
+        if self.cache is not None and self.cache.contains(username, password, encoded):
+            return True
+        if not verify_password(password, encoded):
+            return False
+        if self.cache is not None:
+            self.cache.add(username, password, encoded)
+        return True
+
+
+def set_password(
+    path: str | Path, username: str, password: str, algorithm: str = "scrypt"
+) -> None:
+    """Add or update a user in a credential file, replacing it atomically.
+
+    The read-modify-write runs under the file's exclusive lock, so
+    concurrent updates never drop a user.
+
+    Raises:
+        ValueError: If the username is empty or the file is invalid
+        LockTimeout: If the lock is not acquired in time
+    """
+    if not username:
+        raise ValueError("Username must not be empty")
+    # pylint: disable=import-outside-toplevel
+    from inventory_system.persistence.file_lock import state_lock
+    from inventory_system.persistence.state_manager import write_atomically
+
+    target = Path(path).expanduser().resolve()
+    encoded_password = hash_password(password, algorithm)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with state_lock(target, exclusive=True):
+        data: dict[str, Any] = {"version": FILE_VERSION, "users": {}}
+        existed = target.exists()
+        if existed:
+            data = json.loads(target.read_text(encoding="utf-8"))
+            if not isinstance(data, dict) or data.get("version") != FILE_VERSION:
+                raise ValueError(f"Unsupported credential file: {target}")
+            if not isinstance(data.get("users"), dict):
+                raise ValueError(f"Credential file has no users: {target}")
+        data["users"][username] = encoded_password
+        encoded = json.dumps(data, indent=2, sort_keys=True).encode("utf-8")
+        write_atomically(target, lambda file_obj: file_obj.write(encoded))
+        if not existed:
+            os.chmod(target, 0o600)
+
+
+_stores: dict[Path, CredentialStore] = {}
+_stores_lock = threading.Lock()
+_login_cache = VerifiedLoginCache()
+
+
+def store_for(path: str | Path) -> CredentialStore:
+    """Return the shared store for ``path``, using the process login cache."""
+    resolved = Path(path).expanduser().resolve()
+    with _stores_lock:
+        store = _stores.get(resolved)
+        if store is None:
+            store = _stores[resolved] = CredentialStore(resolved, _login_cache)
+        return store
+
+
+def login_cache_stats() -> LoginCacheStats:
+    """Return the counters of the process-wide verified-login cache."""
+    return _login_cache.stats()
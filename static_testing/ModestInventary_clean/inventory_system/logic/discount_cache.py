@@ -0,0 +1,108 @@
+"""Bounded LRU result cache with hit/miss/eviction counters.
+
+Used by ``discount_calculator`` to memoize discounts for repeated
+(level, category, history, season, region, holiday) combinations.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Generic, NamedTuple, TypeVar
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class CacheStats(NamedTuple):
+    """Snapshot of cache counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters plus hit rate as a JSON-compatible dictionary."""
+        return {**self._asdict(), "hit_rate": self.hit_rate}
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe bounded mapping that evicts the least recently used entry.
+
+    Entries are tagged with a caller-supplied token; when the token passed to
+    ``get_or_compute`` changes, the whole cache is dropped and counted as an
+    invalidation. Callers use this to tie cached results to rule tables.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, V] = OrderedDict()
+        self._token: Hashable = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], V], token: Hashable = None) -> V:
+        """Return the cached value for ``key`` or compute and store it.
+
+        Args:
+            key: Hashable cache key
+            compute: Zero-argument function producing the value on a miss
+            token: Validity token; a different token than last time clears the cache
+
+        Returns:
+            Cached or freshly computed value
+        """
+        with self._lock:
+            if token != self._token:
+                if self._entries:
+                    self._invalidations += 1
+                self._entries.clear()
+                self._token = token
+            cached = self._entries.get(key, _MISSING)
+            if cached is not _MISSING:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return cached  # type: ignore[return-value]
+            self._misses += 1
+
+        value = compute()
+        with self._lock:
+            if token == self._token:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = self._invalidations = 0
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+            )
@@ -2,53 +2,113 @@
 
 This module implements discount rules using a functional approach with
 composable functions, avoiding deep nesting and improving maintainability.
+
+An optional LRU result cache (see ``enable_discount_cache``) memoizes
+discounts by normalized inputs. Rule tables are ``RuleTable`` instances that
+count their own mutations, so any change to a table invalidates the cache.
+Tables are ``Final``; rebinding one instead of mutating it is not detected.
 """
 
-from typing import Final
+from typing import Any, Final, Hashable, TypeVar
+
+from inventory_system.logic.discount_cache import CacheStats, LRUCache
+
+K = TypeVar("K")
+
+
+class RuleTable(dict[K, float]):
+    """Rule table that bumps ``version`` whenever it is mutated.
+
+    ``RuleTable.generation`` counts mutations across every table, giving the
+    result cache a single integer to validate against.
+    """
+
+    generation: int = 0
+    version: int = 0
+
+    def _touch(self) -> None:
+        self.version += 1
+        RuleTable.generation += 1
+
+    def __setitem__(self, key: K, value: float) -> None:
+        super().__setitem__(key, value)
+        self._touch()
+
+    def __delitem__(self, key: K) -> None:
+        super().__delitem__(key)
+        self._touch()
+
+    def __ior__(self, other: Any) -> "RuleTable[K]":  # type: ignore[override,misc]
+        self.update(other)
+        return self
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._touch()
+
+    def setdefault(self, key: K, default: float = 0.0) -> float:
+        self._touch()
+        return super().setdefault(key, default)
+
+    def pop(self, key: K, *default: Any) -> Any:
+        self._touch()
+        return super().pop(key, *default)
+
+    def popitem(self) -> tuple[K, float]:
+        self._touch()
+        return super().popitem()
+
+    def clear(self) -> None:
+        super().clear()
+        self._touch()
+
 
 # User level base discounts (0.0 to 1.0)
-LEVEL_BASE_DISCOUNT: Final[dict[str, float]] = {
+LEVEL_BASE_DISCOUNT: Final[RuleTable[str]] = RuleTable({
     "platinum": 0.30,
     "gold": 0.20,
     "silver": 0.10,
     "bronze": 0.05,
-}
+})
 
 # Category-specific bonuses
-CATEGORY_BONUS: Final[dict[str, float]] = {
+CATEGORY_BONUS: Final[RuleTable[str]] = RuleTable({
     "electronics": 0.05,
     "books": 0.08,
     "clothing": 0.04,
     "furniture": 0.03,
-}
+})
 
 # Purchase history thresholds for additional discounts
-PURCHASE_THRESHOLDS: Final[dict[int, float]] = {
+PURCHASE_THRESHOLDS: Final[RuleTable[int]] = RuleTable({
     20: 0.05,  # Very frequent customer
     15: 0.04,
     10: 0.03,
     5: 0.02,
-}
+})
 
 # Seasonal multipliers (applied as additional discount)
-SEASON_BONUS: Final[dict[str, float]] = {
+SEASON_BONUS: Final[RuleTable[str]] = RuleTable({
     "black_friday": 0.15,
     "clearance": 0.25,
     "summer": 0.05,
     "winter": 0.03,
-}
+})
 
 # Regional adjustments
-REGION_BONUS: Final[dict[str, float]] = {
+REGION_BONUS: Final[RuleTable[str]] = RuleTable({
     "US": 0.00,
     "EU": 0.02,
     "ASIA": 0.01,
-}
+})
 
 # Constants
 MAX_DISCOUNT_CAP: Final[float] = 0.50
 MIN_DISCOUNT_FLOOR: Final[float] = 0.00
 
+# Optional result cache; None means every call is computed.
+_discount_cache: LRUCache[float] | None = None
+
 
 def _calculate_purchase_history_bonus(purchase_count: int) -> float:
     """Calculate bonus based on purchase history.
@@ -149,6 +209,78 @@ def _clamp_discount(discount: float) -> float:
     return max(MIN_DISCOUNT_FLOOR, min(discount, MAX_DISCOUNT_CAP))
 
 
+def enable_discount_cache(maxsize: int = 1024) -> None:
+    """Memoize ``calculate_discount`` results in a bounded LRU cache.
+
+    Calling it again replaces the cache (and its counters) with a new one.
+
+    Args:
+        maxsize: Maximum number of cached input combinations
+    """
+    global _discount_cache  # pylint: disable=global-statement
+    _discount_cache = LRUCache(maxsize)
+
+
+def disable_discount_cache() -> None:
+    """Drop the result cache so every call is computed again."""
+    global _discount_cache  # pylint: disable=global-statement
+    _discount_cache = None
+
+
+def discount_cache_stats() -> CacheStats | None:
+    """Return the result cache counters, or None if caching is disabled."""
+    return _discount_cache.stats() if _discount_cache is not None else None
+
+
+def _cache_key(
+    item_category: str,
+    user_level: str,
+    purchase_history_count: int,
+    is_holiday: bool,
+    season: str,
+    region: str,
+) -> Hashable:
+    """Build a cache key from inputs normalized the same way the rules read them.
+
+    Purchase counts above the highest threshold all earn the same bonus, so
+    they share one key.
+    """
+    top_threshold = max(PURCHASE_THRESHOLDS, default=0)
+    return (
+        item_category.strip().lower(),
+        user_level.strip().lower(),
+        min(purchase_history_count, top_threshold),
+        bool(is_holiday),
+        season.strip().lower(),
+        region.strip().upper(),
+    )
+
+
+def _compute_discount(
+    item_category: str,
+    user_level: str,
+    purchase_history_count: int,
+    is_holiday: bool,
+    season: str,
+    region: str,
+) -> float:
+    """Combine every rule into the final, clamped discount."""
+    # Build discount by combining all components
+    discount = (
+        _get_level_discount(user_level)
+        + _get_category_bonus(item_category)
+        + _calculate_purchase_history_bonus(purchase_history_count)
+        + _get_seasonal_bonus(season)
+        + _get_regional_bonus(region)
+    )
+
+    # Apply conditional bonuses
+    discount = _apply_holiday_bonus(discount, is_holiday)
+
+    # Ensure within valid bounds
+    return _clamp_discount(discount)
+
+
 def calculate_discount(
     item_category: str,
     user_level: str,
@@ -161,6 +293,7 @@ def calculate_discount(
 
     This function combines multiple discount sources using a sum-and-clamp
     approach, avoiding deep nesting by delegating to specialized functions.
+    When the result cache is enabled, repeated inputs are served from it.
 
     Args:
         item_category: Product category (electronics, books, clothing)
@@ -173,17 +306,10 @@ def calculate_discount(
     Returns:
         Final discount percentage (0.0 to 0.50)
     """
-    # Build discount by combining all components
-    discount = (
-        _get_level_discount(user_level)
-        + _get_category_bonus(item_category)
-        + _calculate_purchase_history_bonus(purchase_history_count)
-        + _get_seasonal_bonus(season)
-        + _get_regional_bonus(region)
+    args = (item_category, user_level, purchase_history_count, is_holiday, season, region)
+    cache = _discount_cache
+    if cache is None:
+        return _compute_discount(*args)
+    return cache.get_or_compute(
+        _cache_key(*args), lambda: _compute_discount(*args), RuleTable.generation
     )
-
-    # Apply conditional bonuses
-    discount = _apply_holiday_bonus(discount, is_holiday)
-
-    # Ensure within valid bounds
-    return _clamp_discount(discount)
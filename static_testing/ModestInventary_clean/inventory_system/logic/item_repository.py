@@ -0,0 +1,426 @@
+"""Inventory item repository with SKU, category and stock indexes.
+
+Items live in the ``items`` list of the state file as
+``{"sku", "category", "quantity", "price"}`` records. ``ItemRepository``
+keeps three indexes over them:
+
+* a hash index from SKU to item (point lookups),
+* a hash index from category to SKUs (category runs),
+* a sorted ``(quantity, sku)`` index (low-stock queries),
+
+so lookups and queries cost O(result) (plus a logarithmic search) instead
+of a scan over the whole catalog. The sorted index is bucketed, which keeps
+stock updates cheap at millions of items.
+
+``open_repository`` and ``update_repository`` persist through
+``state_manager`` under the state file lock and keep the last repository
+per file in memory, so a long-running ``inventory serve`` rebuilds the
+indexes only when another process changes the file. Updates change a copy
+and swap it in after a successful save, so a repository returned by
+``open_repository`` is never modified while another thread reads it.
+"""
+
+import math
+import threading
+from bisect import bisect_left, insort
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any, Final, NamedTuple, TypeVar
+
+from inventory_system.persistence import state_manager
+from inventory_system.persistence.state_cache import FileSignature, file_signature
+
+T = TypeVar("T")
+
+ITEMS_KEY: Final[str] = "items"
+BUCKET_SIZE: Final[int] = 512
+
+
+class Item(NamedTuple):
+    """One inventory item."""
+
+    sku: str
+    category: str
+    quantity: int
+    price: float
+
+    @property
+    def stock_value(self) -> float:
+        """Quantity times unit price."""
+        return self.quantity * self.price
+
+    def as_record(self) -> dict[str, Any]:
+        """Return the JSON record stored in the state file."""
+        return self._asdict()
+
+
+def make_item(sku: Any, category: Any, quantity: Any, price: Any) -> Item:
+    """Validate raw values and build an ``Item``.
+
+    Raises:
+        ValueError: If a field is missing, empty, negative or of the wrong type
+    """
+    if not isinstance(sku, str) or not sku.strip():
+        raise ValueError("SKU must be a non-empty string")
+    if not isinstance(category, str) or not category.strip():
+        raise ValueError("Category must be a non-empty string")
+    if isinstance(quantity, bool) or not isinstance(quantity, int) or quantity < 0:
+        raise ValueError(f"Quantity of {sku} must be a non-negative integer")
+    if isinstance(price, bool) or not isinstance(price, (int, float)):
+        raise ValueError(f"Price of {sku} must be a non-negative number")
+    if not math.isfinite(price) or price < 0:
+        raise ValueError(f"Price of {sku} must be a non-negative number")
+    return Item(sku.strip(), category.strip().lower(), quantity, float(price))
+
+
+def item_from_record(record: Any) -> Item:
+    """Build an ``Item`` from a state file record.
+
+    Raises:
+        ValueError: If the record is not a valid item object
+    """
+    if not isinstance(record, dict):
+        raise ValueError(f"Invalid item record: {record!r}")
+    return make_item(
+        record.get("sku"), record.get("category"), record.get("quantity"), record.get("price")
+    )
+
+
+class SortedIndex:
+    """Sorted multiset of tuples stored as a list of bounded sorted buckets.
+
+    Inserting into or removing from one flat list of millions of entries
+    moves megabytes of pointers per call; buckets of ``BUCKET_SIZE`` keep
+    each update to a small ``insort`` plus a search over bucket maxima.
+    """
+
+    def __init__(self, values: Iterable[tuple[Any, ...]] = ()) -> None:
+        ordered = sorted(values)
+        self._buckets = [
+            ordered[start:start + BUCKET_SIZE] for start in range(0, len(ordered), BUCKET_SIZE)
+        ]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._length = len(ordered)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        for bucket in self._buckets:
+            yield from bucket
+
+    def add(self, value: tuple[Any, ...]) -> None:
+        """Insert ``value`` keeping the order."""
+        self._length += 1
+        if not self._buckets:
+            self._buckets.append([value])
+            self._maxes.append(value)
+            return
+        position = min(bisect_left(self._maxes, value), len(self._buckets) - 1)
+        bucket = self._buckets[position]
+        insort(bucket, value)
+        self._maxes[position] = bucket[-1]
+        if len(bucket) > 2 * BUCKET_SIZE:
+            self._buckets[position:position + 1] = [bucket[:BUCKET_SIZE], bucket[BUCKET_SIZE:]]
+            self._maxes[position:position + 1] = [bucket[BUCKET_SIZE - 1], bucket[-1]]
+
+    def remove(self, value: tuple[Any, ...]) -> None:
+        """Remove one occurrence of ``value``.
+
+        Raises:
+            KeyError: If ``value`` is not in the index
+        """
+        position = bisect_left(self._maxes, value)
+        if position == len(self._buckets):
+            raise KeyError(value)
+        bucket = self._buckets[position]
+        index = bisect_left(bucket, value)
+        if index == len(bucket) or bucket[index] != value:
+            raise KeyError(value)
+        del bucket[index]
+        self._length -= 1
+        if bucket:
+            self._maxes[position] = bucket[-1]
+        else:
+            del self._buckets[position]
+            del self._maxes[position]
+
+    def copy(self) -> "SortedIndex":
+        """Return an independent copy (buckets are copied, values shared)."""
+        clone = SortedIndex()
+        clone._buckets = [list(bucket) for bucket in self._buckets]
+        clone._maxes = list(self._maxes)
+        clone._length = self._length
+        return clone
+
+    def below(self, bound: tuple[Any, ...]) -> Iterator[tuple[Any, ...]]:
+        """Yield values strictly less than ``bound`` in ascending order."""
+        for bucket in self._buckets:
+            if bucket[-1] < bound:
+                yield from bucket
+                continue
+            yield from bucket[:bisect_left(bucket, bound)]
+            return
+
+
+class ItemRepository:
+    """In-memory item catalog with SKU, category and low-stock indexes.
+
+    Args:
+        items: Initial items; SKUs must be unique
+    """
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self._by_sku: dict[str, Item] = {}
+        self._by_category: dict[str, dict[str, Item]] = {}
+        for item in items:
+            if item.sku in self._by_sku:
+                raise ValueError(f"Duplicate SKU: {item.sku}")
+            self._by_sku[item.sku] = item
+            self._by_category.setdefault(item.category, {})[item.sku] = item
+        self._by_stock = SortedIndex((item.quantity, item.sku) for item in self._by_sku.values())
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> "ItemRepository":
+        """Build a repository from state file records.
+
+        Raises:
+            ValueError: If a record is invalid or a SKU repeats
+        """
+        return cls(item_from_record(record) for record in records)
+
+    def copy(self) -> "ItemRepository":
+        """Return an independent copy; items are immutable and shared."""
+        clone = ItemRepository()
+        clone._by_sku = dict(self._by_sku)
+        clone._by_category = {
+            category: dict(items) for category, items in self._by_category.items()
+        }
+        clone._by_stock = self._by_stock.copy()
+        return clone
+
+    def __len__(self) -> int:
+        return len(self._by_sku)
+
+    def __contains__(self, sku: object) -> bool:
+        return sku in self._by_sku
+
+    def records(self) -> list[dict[str, Any]]:
+        """Return every item as a state file record, in insertion order."""
+        return [item.as_record() for item in self._by_sku.values()]
+
+    def categories(self) -> list[str]:
+        """Return the categories that currently hold items."""
+        return sorted(self._by_category)
+
+    def get(self, sku: str) -> Item | None:
+        """Return the item with ``sku``, if any."""
+        return self._by_sku.get(sku)
+
+    def add(self, item: Item) -> Item:
+        """Add a new item.
+
+        Raises:
+            ValueError: If the SKU already exists
+        """
+        if item.sku in self._by_sku:
+            raise ValueError(f"SKU already exists: {item.sku}")
+        self._by_sku[item.sku] = item
+        self._by_category.setdefault(item.category, {})[item.sku] = item
+        self._by_stock.add((item.quantity, item.sku))
+        return item
+
+    def _replace(self, old: Item, new: Item) -> Item:
+        """Swap ``old`` for ``new`` (same SKU and category) in every index."""
+        self._by_sku[new.sku] = new
+        self._by_category[new.category][new.sku] = new
+        if old.quantity != new.quantity:
+            self._by_stock.remove((old.quantity, old.sku))
+            self._by_stock.add((new.quantity, new.sku))
+        return new
+
+    def adjust_stock(self, sku: str, delta: int) -> Item:
+        """Add ``delta`` (possibly negative) to an item's quantity.
+
+        Raises:
+            KeyError: If the SKU does not exist
+            ValueError: If the stock would become negative
+        """
+        item = self._by_sku.get(sku)
+        if item is None:
+            raise KeyError(sku)
+        quantity = item.quantity + delta
+        if quantity < 0:
+            raise ValueError(f"Stock of {sku} cannot go below zero ({item.quantity} {delta:+d})")
+        return self._replace(item, Item(item.sku, item.category, quantity, item.price))
+
+    def by_category(self, category: str) -> list[Item]:
+        """Return the items of ``category`` in insertion order."""
+        return list(self._by_category.get(category.strip().lower(), {}).values())
+
+    def low_stock(self, threshold: int, limit: int | None = None) -> list[Item]:
+        """Return items with ``quantity <= threshold``, lowest stock first.
+
+        Args:
+            threshold: Highest quantity included
+            limit: Maximum number of items returned
+        """
+        entries = self._by_stock.below((threshold + 1,))
+        result: list[Item] = []
+        for _, sku in entries:
+            if limit is not None and len(result) >= limit:
+                break
+            result.append(self._by_sku[sku])
+        return result
+
+    def query(
+        self,
+        category: str | None = None,
+        max_quantity: int | None = None,
+        limit: int | None = None,
+    ) -> list[Item]:
+        """Return items matching every given filter.
+
+        With both filters, the category index is scanned and filtered by
+        quantity, which is bounded by the category size.
+
+        Args:
+            category: Only items of this category (in insertion order)
+            max_quantity: Only items with at most this quantity (lowest first)
+            limit: Maximum number of items returned
+        """
+        if category is None and max_quantity is None:
+            items = list(self._by_sku.values())
+        elif category is None:
+            assert max_quantity is not None
+            return self.low_stock(max_quantity, limit)
+        else:
+            items = self.by_category(category)
+            if max_quantity is not None:
+                matching = (item for item in items if item.quantity <= max_quantity)
+                items = sorted(matching, key=lambda item: item.quantity)
+        return items if limit is None else items[:limit]
+
+    def reprice_category(self, category: str, percent: float) -> list[Item]:
+        """Change the price of every item in ``category`` by ``percent``.
+
+        Only the category's items are touched, so the run costs O(result).
+
+        Returns:
+            Repriced items in insertion order
+
+        Raises:
+            ValueError: If prices would become negative
+        """
+        if percent < -100:
+            raise ValueError("Prices cannot drop by more than 100%")
+        factor = 1 + percent / 100
+        repriced = []
+        for item in self.by_category(category):
+            price = round(item.price * factor, 2)
+            updated = Item(item.sku, item.category, item.quantity, price)
+            repriced.append(self._replace(item, updated))
+        return repriced
+
+
+class _Catalog(NamedTuple):
+    """Repository built from a state file, plus its other top-level keys."""
+
+    signature: FileSignature
+    repository: ItemRepository
+    other_state: dict[str, Any]
+
+
+# Last catalog built per state file, validated by file signature.
+_catalogs: dict[Path, _Catalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def _catalog_for(target_path: Path) -> tuple[ItemRepository, dict[str, Any]]:
+    """Return the repository and other state keys of a locked state file.
+
+    The cached catalog is reused while the file signature is unchanged.
+
+    Raises:
+        ValueError: If the state file or its items are invalid
+    """
+    signature = file_signature(target_path)
+    with _catalogs_lock:
+        cached = _catalogs.get(target_path)
+    if cached is not None and cached.signature == signature:
+        return cached.repository, cached.other_state
+    state = state_manager.load_state(target_path) if signature is not None else {}
+    if state is None:
+        raise ValueError(f"Cannot read state file: {target_path}")
+    repository = ItemRepository.from_records(state.pop(ITEMS_KEY, None) or [])
+    if signature is not None:
+        with _catalogs_lock:
+            _catalogs[target_path] = _Catalog(signature, repository, state)
+    return repository, state
+
+
+def open_repository(filepath: str | Path | None = None) -> ItemRepository:
+    """Return the item repository of a state file for reading.
+
+    The returned object is shared with later calls and other threads; it is
+    never changed in place (``update_repository`` swaps in a new one), so it
+    can be queried without holding the lock. Do not modify it.
+
+    Raises:
+        ValueError: If the state file or its items are invalid
+        LockTimeout: If the state lock is not acquired in time
+    """
+    with state_manager.locked_state(filepath) as target_path:
+        return _catalog_for(target_path)[0]
+
+
+def update_repository(
+    mutate: Callable[[ItemRepository], T],
+    filepath: str | Path | None = None,
+    compact: bool | None = None,
+    layout: str | None = None,
+    codec: str | None = None,
+) -> T:
+    """Modify the item repository and save it, under one exclusive lock.
+
+    ``mutate`` receives a copy of the cached repository, which replaces the
+    cached one only once the state is saved; if ``mutate`` raises or the
+    save fails, nothing is written and readers keep the previous catalog.
+    Other top-level state keys are preserved, and so are the file layout,
+    codec and JSON style unless the caller chooses new ones.
+
+    Args:
+        mutate: Function applying the change and returning a result
+        filepath: Optional custom path to state file
+        compact: Minified (True) or indented (False) JSON; None keeps the file's
+        layout: "json" or "lines"; None keeps the file's
+        codec: Codec name or "none"; None keeps the file's
+
+    Returns:
+        Whatever ``mutate`` returned
+
+    Raises:
+        ValueError: If the state is invalid or could not be saved
+        KeyError: Propagated from ``mutate`` (e.g. unknown SKU)
+        LockTimeout: If the state lock is not acquired in time
+    """
+    with state_manager.locked_state(filepath, exclusive=True) as target_path:
+        current, other_state = _catalog_for(target_path)
+        current_format = state_manager.state_format(target_path)
+        repository = current.copy()
+        result = mutate(repository)
+        state = {**other_state, ITEMS_KEY: repository.records()}
+        saved = state_manager.save_state(
+            state,
+            target_path,
+            compact=current_format.compact if compact is None else compact,
+            layout=current_format.layout if layout is None else layout,
+            codec=current_format.codec if codec is None else codec,
+        )
+        if saved is None:
+            raise ValueError(f"Could not save state file: {target_path}")
+        signature = file_signature(target_path)
+        if signature is not None:
+            with _catalogs_lock:
+                _catalogs[target_path] = _Catalog(signature, repository, other_state)
+        return result
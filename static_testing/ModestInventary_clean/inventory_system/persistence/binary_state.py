@@ -0,0 +1,297 @@
+"""Indexed binary state format read through ``mmap``.
+
+A binary state file stores each inventory record once, length-prefixed,
+followed by an on-disk hash index of record keys. Readers map the file and
+fetch a single record by key in O(1) without decoding anything else, so
+point lookups on multi-GB states stay in the microsecond range.
+
+File layout (all integers little-endian)::
+
+    header   magic "INVBIN01", version u16, reserved u16 + u32,
+             record_count u64, meta_offset u64, index_offset u64, index_slots u64
+    records  key_len u32, key bytes, value_len u32, compact JSON value
+    meta     length u64, JSON {"items_key", "key_field", "state"}
+    index    index_slots x (key_hash u64, record_offset u64), linear probing
+
+``state`` in the meta section holds every top-level key except the items
+list. A record offset of 0 marks an empty slot (the header occupies offset 0).
+"""
+
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import IO, Any, Final
+
+from inventory_system.persistence import line_state, state_manager
+
+MAGIC: Final[bytes] = b"INVBIN01"
+VERSION: Final[int] = 1
+HEADER: Final[struct.Struct] = struct.Struct("<8sHHIQQQQ")
+LENGTH: Final[struct.Struct] = struct.Struct("<I")
+META_LENGTH: Final[struct.Struct] = struct.Struct("<Q")
+SLOT: Final[struct.Struct] = struct.Struct("<QQ")
+
+
+def key_hash(key: bytes) -> int:
+    """Stable 64-bit hash of a record key (independent of PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def record_key(item: Any, key_field: str) -> str:
+    """Return the lookup key of an item: ``item[key_field]`` or the item itself."""
+    if isinstance(item, dict):
+        return str(item[key_field])
+    return str(item)
+
+
+def _encode_value(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _write_binary(
+    file_obj: IO[bytes],
+    items: Iterable[Any],
+    state: dict[str, Any],
+    items_key: str,
+    key_field: str,
+) -> None:
+    """Stream records, metadata and the hash index into ``file_obj``."""
+    file_obj.write(b"\0" * HEADER.size)
+    offset = HEADER.size
+    hashes = array("Q")
+    offsets = array("Q")
+    for index, item in enumerate(items):
+        try:
+            key = record_key(item, key_field).encode("utf-8")
+        except KeyError as error:
+            raise ValueError(f"Record {index} has no {key_field!r} field") from error
+        value = _encode_value(item)
+        file_obj.write(LENGTH.pack(len(key)) + key + LENGTH.pack(len(value)) + value)
+        hashes.append(key_hash(key))
+        offsets.append(offset)
+        offset += 2 * LENGTH.size + len(key) + len(value)
+
+    meta = _encode_value({"items_key": items_key, "key_field": key_field, "state": state})
+    meta_offset = offset
+    file_obj.write(META_LENGTH.pack(len(meta)) + meta)
+    index_offset = meta_offset + META_LENGTH.size + len(meta)
+
+    # Power-of-two table at most half full keeps probe sequences short.
+    slots = 1
+    while slots < 2 * len(offsets):
+        slots *= 2
+    table = array("Q", bytes(16 * slots))
+    mask = slots - 1
+    for hashed, record_offset in zip(hashes, offsets):
+        slot = hashed & mask
+        while table[2 * slot + 1]:
+            slot = (slot + 1) & mask
+        table[2 * slot] = hashed
+        table[2 * slot + 1] = record_offset
+    if sys.byteorder == "big":
+        table.byteswap()
+    file_obj.write(table.tobytes())
+
+    file_obj.seek(0)
+    file_obj.write(
+        HEADER.pack(MAGIC, VERSION, 0, 0, len(offsets), meta_offset, index_offset, slots)
+    )
+
+
+def write_binary_state(
+    filepath: str | Path,
+    items: Iterable[Any],
+    state: dict[str, Any] | None = None,
+    items_key: str = "items",
+    key_field: str = "sku",
+) -> Path:
+    """Atomically write a binary state file from an iterable of records.
+
+    Records are streamed to disk, so ``items`` may be a generator over a
+    state far larger than memory. If several records share a key, lookups
+    return the first one; iteration still yields all of them in order.
+
+    Args:
+        filepath: Destination path
+        items: Records to store (dicts keyed by ``key_field``, or plain values)
+        state: Remaining top-level state keys, stored as metadata
+        items_key: Name of the items key in the original state
+        key_field: Field used as the lookup key of dict records
+
+    Returns:
+        Path to the written file
+
+    Raises:
+        ValueError: If a dict record has no ``key_field`` (nothing is written)
+    """
+    target_path = Path(filepath).expanduser().resolve()
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    state_manager.write_atomically(
+        target_path,
+        lambda file_obj: _write_binary(file_obj, items, state or {}, items_key, key_field),
+    )
+    return target_path
+
+
+def is_binary_state(path: Path) -> bool:
+    """Return True if ``path`` starts with the binary state magic."""
+    with path.open("rb") as file_obj:
+        return file_obj.read(len(MAGIC)) == MAGIC
+
+
+class BinaryState(Mapping[str, Any]):
+    """Read-only, memory-mapped mapping from record key to record.
+
+    Lookups hash the key, probe the on-disk index and decode only the
+    matching record. Close the view (or use it as a context manager) to
+    release the mapping.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as file_obj:
+            self._map = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, _, _, count, meta_offset, index_offset, slots = HEADER.unpack_from(
+                self._map, 0
+            )
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a binary inventory state file: {self.path}")
+            (meta_length,) = META_LENGTH.unpack_from(self._map, meta_offset)
+            start = meta_offset + META_LENGTH.size
+            meta = json.loads(self._map[start:start + meta_length])
+            self.items_key: str = meta["items_key"]
+            self.key_field: str = meta["key_field"]
+            self.state: dict[str, Any] = meta["state"]
+        except (ValueError, KeyError, struct.error):
+            self._map.close()
+            raise
+        self._count: int = count
+        self._meta_offset: int = meta_offset
+        self._index_offset: int = index_offset
+        self._mask: int = slots - 1
+
+    def __enter__(self) -> "BinaryState":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory mapping."""
+        self._map.close()
+
+    def _find(self, key: str) -> int:
+        """Return the record offset for ``key`` or 0 if it is absent."""
+        encoded = key.encode("utf-8")
+        hashed = key_hash(encoded)
+        slot = hashed & self._mask
+        while True:
+            stored_hash, offset = SLOT.unpack_from(self._map, self._index_offset + 16 * slot)
+            if offset == 0:
+                return 0
+            if stored_hash == hashed:
+                (key_length,) = LENGTH.unpack_from(self._map, offset)
+                start = offset + LENGTH.size
+                if self._map[start:start + key_length] == encoded:
+                    return int(offset)
+            slot = (slot + 1) & self._mask
+
+    def _read_record(self, offset: int) -> tuple[str, Any, int]:
+        """Decode the record at ``offset``; return key, value and next offset."""
+        (key_length,) = LENGTH.unpack_from(self._map, offset)
+        key_start = offset + LENGTH.size
+        value_offset = key_start + key_length
+        (value_length,) = LENGTH.unpack_from(self._map, value_offset)
+        value_start = value_offset + LENGTH.size
+        key = self._map[key_start:value_offset].decode("utf-8")
+        value = json.loads(self._map[value_start:value_start + value_length])
+        return key, value, value_start + value_length
+
+    def __getitem__(self, key: str) -> Any:
+        offset = self._find(key)
+        if not offset:
+            raise KeyError(key)
+        return self._read_record(offset)[1]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key) != 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for key, _ in self.records():
+            yield key
+
+    def records(self) -> Iterator[tuple[str, Any]]:
+        """Yield every (key, record) pair in file order."""
+        offset = HEADER.size
+        while offset < self._meta_offset:
+            key, value, offset = self._read_record(offset)
+            yield key, value
+
+    def to_state(self) -> dict[str, Any]:
+        """Rebuild the full state dictionary (items key plus metadata keys)."""
+        return {**self.state, self.items_key: [value for _, value in self.records()]}
+
+
+def json_to_binary(
+    source: str | Path,
+    destination: str | Path,
+    items_key: str = "items",
+    key_field: str = "sku",
+) -> Path:
+    """Convert a JSON (or line-delimited) state file into the binary format.
+
+    Line-delimited sources are streamed record by record; JSON documents are
+    loaded whole first.
+
+    Args:
+        source: Existing state file
+        destination: Binary file to write
+        items_key: Top-level key holding the record list
+        key_field: Field used as the lookup key of dict records
+
+    Returns:
+        Path to the written binary file
+
+    Raises:
+        ValueError: If the source cannot be read or a dict record has no
+            ``key_field``
+    """
+    state = state_manager.open_state(source)
+    if state is None:
+        raise ValueError(f"Cannot read state file: {source}")
+    try:
+        metadata = {key: state[key] for key in state if key != items_key}
+        if isinstance(state, line_state.LazyState):
+            items: Iterable[Any] = state.iter_items(items_key)
+        else:
+            items = state.get(items_key) or []
+        return write_binary_state(destination, items, metadata, items_key, key_field)
+    finally:
+        if isinstance(state, line_state.LazyState):
+            state.close()
+
+
+def binary_to_json(
+    source: str | Path, destination: str | Path, compact: bool = True
+) -> Path | None:
+    """Convert a binary state file back into a JSON state file.
+
+    Args:
+        source: Binary state file
+        destination: JSON file to write
+        compact: Write minified JSON
+
+    Returns:
+        Path to the written file, or None if saving failed
+    """
+    with BinaryState(source) as binary:
+        return state_manager.save_state(binary.to_state(), destination, compact=compact)
@@ -0,0 +1,117 @@
+"""Streaming compression codecs for state files.
+
+A compressed state file starts with a one-line plain-text header naming the
+codec, followed by the compressed stream of a JSON or line-delimited state::
+
+    #inventory-state-codec gzip
+    <gzip stream>
+
+The header lets ``load_state`` pick the decompressor without trusting the
+file name. Uncompressed files have no header and are read as before.
+"""
+
+import bz2
+import gzip
+import lzma
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Final, NamedTuple, cast
+
+HEADER_PREFIX: Final[bytes] = b"#inventory-state-codec "
+MAX_HEADER_BYTES: Final[int] = 64
+NONE: Final[str] = "none"
+
+
+class Codec(NamedTuple):
+    """A streaming compression codec."""
+
+    name: str
+    extensions: tuple[str, ...]
+    default_level: int
+    opener: Callable[[IO[bytes], str, int], IO[bytes]]
+
+    def header(self) -> bytes:
+        """Return the header line identifying this codec."""
+        return HEADER_PREFIX + self.name.encode("ascii") + b"\n"
+
+    def open(self, file_obj: IO[bytes], mode: str, level: int | None = None) -> IO[bytes]:
+        """Wrap ``file_obj`` in a (de)compressing stream.
+
+        Closing the returned stream finishes the compressed data but leaves
+        ``file_obj`` open.
+
+        Args:
+            file_obj: Underlying binary file, positioned after the header
+            mode: "rb" or "wb"
+            level: Compression level; None uses the codec default
+        """
+        return self.opener(file_obj, mode, self.default_level if level is None else level)
+
+
+def _open_gzip(file_obj: IO[bytes], mode: str, level: int) -> IO[bytes]:
+    # mtime=0 keeps the output byte-for-byte reproducible.
+    return cast(IO[bytes], gzip.GzipFile(fileobj=file_obj, mode=mode, compresslevel=level, mtime=0))
+
+
+def _open_bz2(file_obj: IO[bytes], mode: str, level: int) -> IO[bytes]:
+    if mode.startswith("w"):
+        return cast(IO[bytes], bz2.BZ2File(file_obj, "wb", compresslevel=level))
+    return cast(IO[bytes], bz2.BZ2File(file_obj, "rb"))
+
+
+def _open_lzma(file_obj: IO[bytes], mode: str, level: int) -> IO[bytes]:
+    preset = level if mode.startswith("w") else None
+    return cast(IO[bytes], lzma.LZMAFile(file_obj, mode, preset=preset))
+
+
+CODECS: Final[dict[str, Codec]] = {
+    "gzip": Codec("gzip", (".gz", ".gzip"), 6, _open_gzip),
+    "bz2": Codec("bz2", (".bz2",), 9, _open_bz2),
+    "lzma": Codec("lzma", (".xz", ".lzma"), 6, _open_lzma),
+}
+
+
+def get_codec(name: str) -> Codec | None:
+    """Return the codec called ``name``; ``"none"`` returns None.
+
+    Raises:
+        ValueError: If the codec is unknown
+    """
+    if name == NONE:
+        return None
+    codec = CODECS.get(name)
+    if codec is None:
+        raise ValueError(f"Unknown codec: {name} (expected none, {', '.join(CODECS)})")
+    return codec
+
+
+def codec_for_path(path: Path) -> Codec | None:
+    """Return the codec implied by the file extension, if any."""
+    suffix = path.suffix.lower()
+    for codec in CODECS.values():
+        if suffix in codec.extensions:
+            return codec
+    return None
+
+
+def read_header(file_obj: IO[bytes]) -> Codec | None:
+    """Detect the codec header at the start of ``file_obj``.
+
+    On a match the file is left positioned after the header; otherwise it
+    is rewound to the start.
+
+    Raises:
+        ValueError: If the header names an unknown codec
+    """
+    file_obj.seek(0)
+    line = file_obj.readline(MAX_HEADER_BYTES)
+    if line.startswith(HEADER_PREFIX) and line.endswith(b"\n"):
+        return get_codec(line[len(HEADER_PREFIX):-1].decode("ascii", "replace"))
+    file_obj.seek(0)
+    return None
+
+
+def detect(path: Path) -> Codec | None:
+    """Return the codec recorded in the header of ``path``, if any."""
+    with path.open("rb") as file_obj:
+        return read_header(file_obj)
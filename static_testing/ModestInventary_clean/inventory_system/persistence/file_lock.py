@@ -0,0 +1,231 @@
+"""Advisory inter-process locks for state files.
+
+Locks are ``flock`` locks on a hidden sidecar file (``.<name>.lock``) next
+to the state file. The state file itself cannot be locked, because every
+save atomically replaces it with a new inode. Readers take shared locks and
+writers exclusive ones; the locks are advisory, so only code going through
+this module is coordinated.
+
+Plain ``flock`` lets a steady stream of overlapping readers starve a
+writer. Every request therefore first passes a gate: an exclusive lock on a
+second sidecar (``.<name>.gate``) held only while waiting for the real lock.
+A waiting writer keeps the gate closed, so new readers queue behind it
+while the current ones drain.
+
+``flock`` has no timeout, so acquisition polls with a non-blocking request
+and exponential backoff until the deadline. Locks are reentrant per thread:
+a thread holding the exclusive lock may load and save again (as
+``state_manager.update_state`` does) without deadlocking on itself.
+
+Platforms without ``fcntl`` (Windows) get no-op locks.
+"""
+
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Final, NamedTuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_TIMEOUT: Final[float] = 10.0
+INITIAL_BACKOFF: Final[float] = 0.001
+MAX_BACKOFF: Final[float] = 0.05
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a state lock cannot be acquired within the timeout."""
+
+
+class LockStats(NamedTuple):
+    """Snapshot of lock counters for this process."""
+
+    shared: int
+    exclusive: int
+    contended: int  # acquisitions that had to wait
+    timeouts: int
+    wait_seconds: float  # includes time spent before timeouts
+    max_wait_seconds: float
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        """Average time spent waiting per lock request."""
+        requests = self.shared + self.exclusive + self.timeouts
+        return self.wait_seconds / requests if requests else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters plus mean wait as a JSON-compatible dictionary."""
+        return {**self._asdict(), "mean_wait_seconds": self.mean_wait_seconds}
+
+
+class _Counters:
+    """Process-wide lock counters."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.shared = self.exclusive = self.contended = self.timeouts = 0
+        self.wait_seconds = self.max_wait_seconds = 0.0
+
+    def record(self, exclusive: bool, waited: float, contended: bool) -> None:
+        with self.lock:
+            if exclusive:
+                self.exclusive += 1
+            else:
+                self.shared += 1
+            self.contended += contended
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def record_timeout(self, waited: float) -> None:
+        with self.lock:
+            self.timeouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def snapshot(self) -> LockStats:
+        with self.lock:
+            return LockStats(
+                self.shared,
+                self.exclusive,
+                self.contended,
+                self.timeouts,
+                self.wait_seconds,
+                self.max_wait_seconds,
+            )
+
+
+_counters = _Counters()
+# Per-thread map of held lock path to whether it is exclusive, for reentrancy.
+_held = threading.local()
+
+
+def lock_path_for(state_path: Path) -> Path:
+    """Return the sidecar lock file used for ``state_path``."""
+    return state_path.with_name(f".{state_path.name}.lock")
+
+
+def gate_path_for(state_path: Path) -> Path:
+    """Return the sidecar gate file that queues lock requests for ``state_path``."""
+    return state_path.with_name(f".{state_path.name}.gate")
+
+
+def lock_stats() -> LockStats:
+    """Return the lock counters accumulated by this process."""
+    return _counters.snapshot()
+
+
+def reset_lock_stats() -> None:
+    """Reset the lock counters to zero."""
+    with _counters.lock:
+        _counters.reset()
+
+
+def _open_lock_file(path: Path, exclusive: bool) -> int | None:
+    """Open (creating if needed) the lock file; None if readers cannot."""
+    try:
+        return os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+    except PermissionError:
+        if exclusive:
+            raise
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError:
+        return None  # read-only location without a lock file: read unlocked
+
+
+def _poll(fd: int, operation: int, deadline: float) -> tuple[bool, bool]:
+    """Poll a non-blocking flock until it succeeds or ``deadline`` passes.
+
+    Returns:
+        Whether the lock was acquired and whether it had to wait
+    """
+    backoff = INITIAL_BACKOFF
+    contended = False
+    while True:
+        try:
+            fcntl.flock(fd, operation | fcntl.LOCK_NB)
+            return True, contended
+        except BlockingIOError:
+            contended = True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False, contended
+            time.sleep(min(backoff, remaining))
+            backoff = min(backoff * 2, MAX_BACKOFF)
+
+
+def _acquire(fd: int, gate_fd: int | None, exclusive: bool, timeout: float, path: Path) -> None:
+    """Pass the gate, take the flock on ``fd`` and record the wait.
+
+    Raises:
+        LockTimeout: If the gate or the lock is not acquired within ``timeout``
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    acquired, contended = True, False
+    if gate_fd is not None:
+        acquired, contended = _poll(gate_fd, fcntl.LOCK_EX, deadline)
+    if acquired:
+        try:
+            acquired, waited = _poll(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH, deadline)
+            contended = contended or waited
+        finally:
+            if gate_fd is not None:
+                fcntl.flock(gate_fd, fcntl.LOCK_UN)
+    if not acquired:
+        _counters.record_timeout(time.monotonic() - start)
+        kind = "exclusive" if exclusive else "shared"
+        raise LockTimeout(f"Timed out after {timeout:g}s waiting for {kind} lock on {path}")
+    _counters.record(exclusive, time.monotonic() - start, contended)
+
+
+@contextmanager
+def state_lock(
+    state_path: Path, exclusive: bool = False, timeout: float = DEFAULT_TIMEOUT
+) -> Iterator[None]:
+    """Hold a shared or exclusive lock on a state file for the block.
+
+    Args:
+        state_path: Resolved state file path
+        exclusive: Take the writer lock instead of a shared reader lock
+        timeout: Maximum seconds to wait for the lock
+
+    Raises:
+        LockTimeout: If the lock is not acquired within ``timeout``
+        RuntimeError: If a thread holding a shared lock asks for an exclusive one
+    """
+    if fcntl is None:
+        yield
+        return
+    path = lock_path_for(state_path)
+    held: dict[Path, bool] = _held.__dict__.setdefault("locks", {})
+    if path in held:
+        if exclusive and not held[path]:
+            raise RuntimeError(f"Cannot upgrade a shared lock to exclusive: {path}")
+        yield  # already covered by the lock this thread holds
+        return
+
+    fd = _open_lock_file(path, exclusive)
+    if fd is None:
+        yield
+        return
+    gate_fd = _open_lock_file(gate_path_for(state_path), exclusive)
+    try:
+        _acquire(fd, gate_fd, exclusive, timeout, path)
+        held[path] = exclusive
+        try:
+            yield
+        finally:
+            del held[path]
+    finally:
+        os.close(fd)  # closing the descriptor releases the flock
+        if gate_fd is not None:
+            os.close(gate_fd)
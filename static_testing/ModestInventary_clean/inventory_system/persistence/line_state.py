@@ -0,0 +1,269 @@
+"""Line-delimited state layout for streaming and lazy loading.
+
+The layout stores one top-level key (or one element of a list-valued key)
+per line, so list records can be streamed one at a time and any top-level
+key can be decoded without touching the rest of the file::
+
+    #inventory-state-lines v1
+    "user"\tv\t"test"
+    "items"\ti\t{"sku": "A-1", ...}
+    "items"\ti\t{"sku": "A-2", ...}
+
+Each line is ``<json key> TAB <kind> TAB <json payload>`` where kind ``v`` is
+a whole value and ``i`` is one element of a list. Compact JSON never
+contains a raw tab, so the separators are unambiguous.
+"""
+
+import json
+import threading
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import IO, Any, Final, NamedTuple
+
+HEADER: Final[bytes] = b"#inventory-state-lines v1\n"
+KIND_VALUE: Final[bytes] = b"v"
+KIND_ITEM: Final[bytes] = b"i"
+READ_CHUNK_BYTES: Final[int] = 1024 * 1024
+DECODE_BATCH_RECORDS: Final[int] = 4096
+
+
+class KeySpan(NamedTuple):
+    """Location of one top-level key inside a line-delimited state file."""
+
+    kind: bytes
+    start: int
+    end: int
+    records: int
+
+
+def _encode_line(key: str, kind: bytes, payload: Any) -> bytes:
+    """Encode one state line."""
+    return b"\t".join(
+        (
+            json.dumps(key, ensure_ascii=False).encode("utf-8"),
+            kind,
+            json.dumps(
+                payload, ensure_ascii=False, separators=(",", ":"), default=str
+            ).encode("utf-8"),
+        )
+    ) + b"\n"
+
+
+def write_lines(data: dict[str, Any], file_obj: IO[bytes]) -> None:
+    """Write state in the line-delimited layout.
+
+    List values are written one element per line; every other value is
+    written on a single line.
+
+    Args:
+        data: Dictionary containing application state
+        file_obj: Writable binary file
+    """
+    file_obj.write(HEADER)
+    for key, value in data.items():
+        if isinstance(value, list) and value:
+            file_obj.writelines(_encode_line(key, KIND_ITEM, element) for element in value)
+        else:
+            file_obj.write(_encode_line(key, KIND_VALUE, value))
+
+
+def is_line_state(path: Path) -> bool:
+    """Return True if ``path`` starts with the line-delimited header."""
+    with path.open("rb") as file_obj:
+        return file_obj.read(len(HEADER)) == HEADER
+
+
+def _split_line(line: bytes) -> tuple[bytes, bytes, bytes]:
+    """Split a state line into raw key, kind and payload."""
+    raw_key, kind, payload = line.rstrip(b"\n").split(b"\t", 2)
+    return raw_key, kind, payload
+
+
+def _iter_batches(lines: Iterable[bytes]) -> Iterator[tuple[str, bytes, list[Any]]]:
+    """Decode a stream of state lines in batches of consecutive records.
+
+    Yields:
+        Tuples of key, kind and the decoded payloads of up to
+        ``DECODE_BATCH_RECORDS`` consecutive lines sharing that key and kind
+
+    Raises:
+        ValueError: If the stream does not start with the layout header
+    """
+    iterator = iter(lines)
+    if next(iterator, b"") != HEADER:
+        raise ValueError("Not a line-delimited inventory state file")
+    current: tuple[bytes, bytes] | None = None
+    payloads: list[bytes] = []
+    for line in iterator:
+        raw_key, kind, payload = _split_line(line)
+        if (raw_key, kind) != current or len(payloads) >= DECODE_BATCH_RECORDS:
+            if current is not None:
+                batch = json.loads(b"[" + b",".join(payloads) + b"]")
+                yield json.loads(current[0]), current[1], batch
+            current = (raw_key, kind)
+            payloads = []
+        payloads.append(payload)
+    if current is not None:
+        yield json.loads(current[0]), current[1], json.loads(b"[" + b",".join(payloads) + b"]")
+
+
+def read_lines(lines: Iterable[bytes]) -> dict[str, Any]:
+    """Decode a whole state from a sequential stream of lines.
+
+    Used for sources that cannot seek cheaply, such as decompressing
+    streams; seekable files are better served by ``LazyState``.
+
+    Args:
+        lines: Iterable of raw lines, header first (e.g. a binary file)
+
+    Returns:
+        Decoded state dictionary
+    """
+    state: dict[str, Any] = {}
+    for key, kind, values in _iter_batches(lines):
+        if kind == KIND_ITEM:
+            state.setdefault(key, []).extend(values)
+        else:
+            state[key] = values[0]
+    return state
+
+
+def iter_stream_items(lines: Iterable[bytes], key: str = "items") -> Iterator[Any]:
+    """Stream the elements of a list-valued key from a sequential stream of lines.
+
+    Args:
+        lines: Iterable of raw lines, header first
+        key: Top-level key holding a list
+
+    Yields:
+        Decoded list elements in file order
+    """
+    for batch_key, kind, values in _iter_batches(lines):
+        if batch_key != key:
+            continue
+        if kind == KIND_ITEM:
+            yield from values
+        else:
+            yield from values[0]
+
+
+def build_index(file_obj: IO[bytes]) -> dict[str, KeySpan]:
+    """Scan a state file and record where each top-level key lives.
+
+    Only keys are decoded; payloads are skipped.
+
+    Args:
+        file_obj: Binary file positioned anywhere; it is rewound
+
+    Returns:
+        Mapping of key to its byte span, in file order
+
+    Raises:
+        ValueError: If the file is not in the line-delimited layout
+    """
+    file_obj.seek(0)
+    if file_obj.readline() != HEADER:
+        raise ValueError("Not a line-delimited inventory state file")
+
+    index: dict[str, KeySpan] = {}
+    offset = len(HEADER)
+    current_raw = b""
+    current: KeySpan | None = None
+    current_key = ""
+    for line in file_obj:
+        raw_key, _, rest = line.partition(b"\t")
+        if current is not None and raw_key == current_raw:
+            current = current._replace(end=offset + len(line), records=current.records + 1)
+        else:
+            if current is not None:
+                index[current_key] = current
+            current_raw = raw_key
+            current_key = json.loads(raw_key)
+            current = KeySpan(rest[:1], offset, offset + len(line), 1)
+        offset += len(line)
+    if current is not None:
+        index[current_key] = current
+    return index
+
+
+class LazyState(Mapping[str, Any]):
+    """Read-only mapping over a line-delimited state file.
+
+    Opening the view scans keys only; a value is decoded when its key is
+    accessed, and decoded again on every access (nothing is cached). The
+    file handle stays open so the view keeps reading the same snapshot even
+    if the state file is atomically replaced. Close it when done.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._file: IO[bytes] = self.path.open("rb")
+        self._lock = threading.Lock()
+        try:
+            self._index = build_index(self._file)
+        except (ValueError, UnicodeDecodeError, json.JSONDecodeError):
+            self._file.close()
+            raise
+
+    def __enter__(self) -> "LazyState":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        self._file.close()
+
+    def __getitem__(self, key: str) -> Any:
+        span = self._index[key]
+        if span.kind == KIND_ITEM:
+            return list(self.iter_items(key))
+        with self._lock:
+            self._file.seek(span.start)
+            line = self._file.readline()
+        return json.loads(_split_line(line)[2])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def count(self, key: str) -> int:
+        """Return how many records a list-valued key holds without decoding them."""
+        span = self._index[key]
+        if span.kind == KIND_ITEM:
+            return span.records
+        value = self[key]
+        return len(value) if isinstance(value, list) else 1
+
+    def iter_items(self, key: str = "items") -> Iterator[Any]:
+        """Stream the elements of a list-valued key one record at a time.
+
+        Args:
+            key: Top-level key holding a list
+
+        Yields:
+            Decoded list elements in file order
+        """
+        span = self._index.get(key)
+        if span is None:
+            return
+        if span.kind == KIND_VALUE:
+            yield from self[key]
+            return
+        position = span.start
+        while position < span.end:
+            with self._lock:
+                self._file.seek(position)
+                chunk = self._file.read(min(READ_CHUNK_BYTES, span.end - position))
+                if chunk and not chunk.endswith(b"\n"):
+                    chunk += self._file.readline()  # finish the last partial line
+            if not chunk:
+                return
+            position += len(chunk)
+            # Decoding a chunk of records as one JSON array is far cheaper
+            # than one json.loads call per line.
+            payloads = [line.split(b"\t", 2)[2] for line in chunk.splitlines()]
+            yield from json.loads(b"[" + b",".join(payloads) + b"]")
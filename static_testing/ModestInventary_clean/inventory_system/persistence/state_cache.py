@@ -0,0 +1,176 @@
+"""Validated in-process cache of decoded state files.
+
+Entries are keyed by resolved path and validated against the file's
+``st_mtime_ns``, ``st_size`` and inode on every lookup, so a file changed by
+another process is never served stale. Each entry keeps the state
+deep-frozen (read-only mappings and tuples) for zero-copy views, plus a
+``marshal`` snapshot used to build fresh mutable copies at C speed, so
+nobody can corrupt the cached state.
+"""
+
+import marshal
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, NamedTuple
+
+FileSignature = tuple[int, int, int]
+
+
+class CachedState(NamedTuple):
+    """One cached state: a frozen view and a snapshot for mutable copies."""
+
+    frozen: Any
+    snapshot: bytes
+
+    def copy(self) -> Any:
+        """Return a fresh mutable copy (dicts and lists) of the state."""
+        # The snapshot is produced in-process by marshal.dumps, never read from disk.
+        return marshal.loads(self.snapshot)  # nosec B302
+
+
+class LoadCacheStats(NamedTuple):
+    """Snapshot of state cache counters."""
+
+    hits: int
+    misses: int
+    stale: int
+    write_throughs: int
+    entries: int
+    max_entries: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters plus hit rate as a JSON-compatible dictionary."""
+        return {**self._asdict(), "hit_rate": self.hit_rate}
+
+
+def signature_of(info: os.stat_result) -> FileSignature:
+    """Return the validation signature of a stat result."""
+    return (info.st_mtime_ns, info.st_size, info.st_ino)
+
+
+def file_signature(path: Path) -> FileSignature | None:
+    """Return the validation signature of ``path`` or None if it is missing."""
+    try:
+        return signature_of(os.stat(path))
+    except FileNotFoundError:
+        return None
+
+
+def freeze(value: Any) -> Any:
+    """Deep-freeze JSON data into read-only mappings and tuples.
+
+    Raises:
+        TypeError: If ``value`` is not plain JSON data (str keys, JSON scalars)
+    """
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError("State keys must be strings to be cached")
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def thaw(value: Any) -> Any:
+    """Build a mutable copy (dicts and lists) of frozen data in pure Python."""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class StateCache:
+    """Bounded LRU cache of frozen state, validated by file signature."""
+
+    def __init__(self, max_entries: int = 8) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Path, tuple[FileSignature, CachedState]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._write_throughs = 0
+
+    def get(self, path: Path) -> CachedState | None:
+        """Return the cached state for ``path`` if it is still valid.
+
+        Returns:
+            Cached state, or None on a miss (including stale entries)
+        """
+        signature = file_signature(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self._hits += 1
+                self._entries.move_to_end(path)
+                return entry[1]
+            if entry is not None:
+                self._stale += 1
+                del self._entries[path]
+            self._misses += 1
+            return None
+
+    def put(
+        self, path: Path, signature: FileSignature | None, data: Any, write_through: bool = False
+    ) -> CachedState | None:
+        """Store ``data`` for ``path`` as read at ``signature``.
+
+        Data that cannot be frozen is not cached (and drops any old entry).
+        Tuples are stored as lists, matching what a reload from disk returns.
+
+        Args:
+            path: Resolved state file path
+            signature: File signature observed when ``data`` was read or written
+            data: Decoded state
+            write_through: Whether this store comes from a save
+
+        Returns:
+            The cached state, or None if it was not cached
+        """
+        try:
+            frozen = freeze(data)
+            entry = CachedState(frozen, marshal.dumps(thaw(frozen) if write_through else data))
+        except (TypeError, ValueError):
+            entry = None
+        with self._lock:
+            if entry is None or signature is None:
+                self._entries.pop(path, None)
+                return None
+            self._entries[path] = (signature, entry)
+            self._entries.move_to_end(path)
+            if write_through:
+                self._write_throughs += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def discard(self, path: Path) -> None:
+        """Forget any cached state for ``path``."""
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def stats(self) -> LoadCacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return LoadCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                stale=self._stale,
+                write_throughs=self._write_throughs,
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+            )
@@ -2,15 +2,128 @@
 
 This module handles application state persistence using JSON format,
 which is safe from arbitrary code execution unlike pickle.
+
+Saves are atomic and durable: state is written to a temporary file in the
+target directory, flushed and fsynced, renamed over the target, and the
+directory entry is fsynced. A crash leaves either the old or the new file,
+never a truncated one.
+
+Two layouts are supported: a single JSON document (``"json"``) and the
+line-delimited layout from ``line_state`` (``"lines"``), which can be
+streamed record by record or opened as a lazy mapping. ``load_state``
+detects the layout automatically.
+
+Saves take an exclusive advisory lock on the state file and loads a shared
+one (see ``file_lock``), so concurrent processes never interleave a
+read-modify-write cycle done through ``update_state``. The wait is bounded
+by ``INVENTORY_LOCK_TIMEOUT`` seconds (default 10).
+
+Either layout can be compressed with a streaming codec from ``codecs``
+(gzip, bz2, lzma), chosen by parameter or file extension. The codec is
+recorded in a one-line header, so loading needs no hint.
+
+``enable_load_cache`` turns on an in-process cache of decoded state that is
+validated against the file's mtime, size and inode and updated by
+``save_state`` (write-through). ``load_state`` then returns a fresh copy
+and ``load_state_view`` a read-only view of the cached state.
 """
 
+import io
+import itertools
 import json
+import lzma
+import os
+import stat
+import tempfile
+from collections.abc import Callable, Generator, Iterator, Mapping
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional
+from typing import IO, Any, Final, NamedTuple, Optional
+
+from inventory_system.persistence import codecs, file_lock, line_state
+from inventory_system.persistence.state_cache import (
+    CachedState,
+    LoadCacheStats,
+    StateCache,
+    file_signature,
+    freeze,
+    signature_of,
+)
+
+LAYOUTS: Final[frozenset[str]] = frozenset({"json", "lines"})
+LOCK_TIMEOUT_ENV: Final[str] = "INVENTORY_LOCK_TIMEOUT"
 
 DEFAULT_STATE_FILE: Path = Path(__file__).resolve().parents[2] / "data" / "inventory_state.json"
 
 
+
+class StateFormat(NamedTuple):
+    """How a state file is encoded, as ``save_state`` arguments."""
+
+    layout: str
+    codec: str | None
+    compact: bool
+
+
+# Optional validated cache of decoded state; None disables caching.
+_load_cache: StateCache | None = None
+
+
+def enable_load_cache(max_entries: int = 8) -> None:
+    """Cache decoded state in-process, validated on every load.
+
+    Calling it again replaces the cache (and its counters) with a new one.
+
+    Args:
+        max_entries: Maximum number of state files kept in the cache
+    """
+    global _load_cache  # pylint: disable=global-statement
+    _load_cache = StateCache(max_entries)
+
+
+def disable_load_cache() -> None:
+    """Drop the state cache so every load reads the file again."""
+    global _load_cache  # pylint: disable=global-statement
+    _load_cache = None
+
+
+def load_cache_stats() -> LoadCacheStats | None:
+    """Return the state cache counters, or None if caching is disabled."""
+    return _load_cache.stats() if _load_cache is not None else None
+
+
+def _lock_timeout() -> float:
+    """Return the lock timeout in seconds from the environment or the default.
+
+    Raises:
+        ValueError: If ``INVENTORY_LOCK_TIMEOUT`` is not a number
+    """
+    value = os.getenv(LOCK_TIMEOUT_ENV)
+    return float(value) if value else file_lock.DEFAULT_TIMEOUT
+
+
+@contextmanager
+def locked_state(filepath: str | Path | None = None, exclusive: bool = False) -> Iterator[Path]:
+    """Hold the state file lock for a block of loads and saves.
+
+    Loads and saves inside the block reuse the lock held by this thread.
+
+    Args:
+        filepath: Optional custom path to state file
+        exclusive: Take the writer lock instead of a shared reader lock
+
+    Yields:
+        Resolved state file path
+
+    Raises:
+        LockTimeout: If the lock is not acquired within the timeout
+        ValueError: If ``INVENTORY_LOCK_TIMEOUT`` is not a number
+    """
+    target_path = _resolve_path(filepath)
+    with file_lock.state_lock(target_path, exclusive=exclusive, timeout=_lock_timeout()):
+        yield target_path
+
+
 def _resolve_path(filepath: str | Path | None = None) -> Path:
     """Resolve and create directories for state file path.
 
@@ -26,42 +139,394 @@ def _resolve_path(filepath: str | Path | None = None) -> Path:
     return resolved_path
 
 
-def save_state(data: dict[str, Any], filepath: str | Path | None = None) -> Optional[Path]:
-    """Save application state to a JSON file.
+def _fsync_directory(directory: Path) -> None:
+    """Flush a directory entry to disk where the platform allows it.
+
+    Args:
+        directory: Directory whose entries were changed
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Windows cannot open directories; the rename is still atomic
+    dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def write_atomically(target_path: Path, write: Callable[[IO[bytes]], object]) -> os.stat_result:
+    """Replace ``target_path`` with content produced by ``write``, atomically.
+
+    ``write`` fills a temporary file in the same directory, which is then
+    flushed, fsynced, renamed over the target, and the directory is fsynced.
+    The existing file mode is preserved. On error the target is untouched
+    and the temporary file is removed.
+
+    Args:
+        target_path: Resolved destination path
+        write: Function writing the new content to a binary file
+
+    Returns:
+        Stat result of the written file, taken before it was renamed
+    """
+    fd, temp_name = tempfile.mkstemp(
+        dir=target_path.parent, prefix=f".{target_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as file_obj:
+            write(file_obj)
+            file_obj.flush()
+            os.fsync(file_obj.fileno())
+            written = os.fstat(file_obj.fileno())
+        if target_path.exists():
+            os.chmod(temp_name, stat.S_IMODE(target_path.stat().st_mode))
+        os.replace(temp_name, target_path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    _fsync_directory(target_path.parent)
+    return written
+
+
+def _write_state(data: dict[str, Any], file_obj: IO[bytes], compact: bool, layout: str) -> None:
+    """Encode state into an open binary file.
+
+    Compact JSON is encoded in one shot with the C encoder (fast, holds the
+    encoded document in memory); pretty JSON streams the indented encoding;
+    the lines layout streams one record per line.
+
+    Args:
+        data: Dictionary containing application state
+        file_obj: Writable binary file
+        compact: Whether to use the compact JSON encoding
+        layout: "json" or "lines"
+    """
+    if layout == "lines":
+        line_state.write_lines(data, file_obj)
+    elif compact:
+        encoded = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+        file_obj.write(encoded.encode("utf-8"))
+    else:
+        text_obj = io.TextIOWrapper(file_obj, encoding="utf-8")
+        json.dump(data, text_obj, ensure_ascii=False, indent=2, default=str)
+        text_obj.flush()
+        text_obj.detach()
+
+
+def _write_file(
+    data: dict[str, Any],
+    file_obj: IO[bytes],
+    compact: bool,
+    layout: str,
+    codec: codecs.Codec | None,
+) -> None:
+    """Write state, preceded by the codec header and compressed if requested."""
+    if codec is None:
+        _write_state(data, file_obj, compact, layout)
+        return
+    file_obj.write(codec.header())
+    with codec.open(file_obj, "wb") as stream:
+        _write_state(data, stream, compact, layout)
+
+
+def save_state(
+    data: dict[str, Any],
+    filepath: str | Path | None = None,
+    compact: bool = False,
+    layout: str = "json",
+    codec: str | None = None,
+) -> Optional[Path]:
+    """Atomically save application state to a JSON file.
 
     Args:
         data: Dictionary containing application state
         filepath: Optional custom path where state will be saved
+        compact: Write minified JSON instead of the indented layout
+        layout: "json" for one document, "lines" for the streamable layout
+        codec: "gzip", "bz2", "lzma" or "none"; None picks the codec from
+            the file extension (.gz, .bz2, .xz), defaulting to uncompressed
 
     Returns:
         Path to saved file if successful, None if error occurred
     """
     try:
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown state layout: {layout}")
         target_path = _resolve_path(filepath)
-        with target_path.open("w", encoding="utf-8") as file_obj:
-            json.dump(data, file_obj, ensure_ascii=False, indent=2, default=str)
+        selected = (
+            codecs.get_codec(codec) if codec is not None else codecs.codec_for_path(target_path)
+        )
+        with file_lock.state_lock(target_path, exclusive=True, timeout=_lock_timeout()):
+            written = write_atomically(
+                target_path, lambda file_obj: _write_file(data, file_obj, compact, layout, selected)
+            )
+            cache = _load_cache
+            if cache is not None:
+                cache.put(target_path, signature_of(written), data, write_through=True)
         return target_path
     except (IOError, ValueError, TypeError) as error:
         print(f"Error saving state: {error}")
         return None
 
 
+def _decompressed_lines(
+    target_path: Path, codec: codecs.Codec
+) -> Generator[bytes, None, None]:
+    """Yield the decompressed lines of a compressed state file."""
+    with target_path.open("rb") as file_obj:
+        codecs.read_header(file_obj)
+        with codec.open(file_obj, "rb") as stream:
+            yield from stream
+
+
+def update_state(
+    mutate: Callable[[dict[str, Any]], Optional[dict[str, Any]]],
+    filepath: str | Path | None = None,
+    compact: bool = False,
+    layout: str = "json",
+    codec: str | None = None,
+) -> dict[str, Any] | None:
+    """Load, modify and save state under one exclusive lock.
+
+    Other processes using ``load_state``/``save_state``/``update_state`` on
+    the same file wait until the new state is saved, so concurrent updates
+    are never lost.
+
+    Args:
+        mutate: Function that edits the state in place or returns a new one
+            (a missing file starts as an empty dictionary)
+        filepath: Optional custom path to state file
+        compact: Write minified JSON
+        layout: "json" or "lines"
+        codec: Compression codec, as in ``save_state``
+
+    Returns:
+        The saved state, or None if loading, locking or saving failed
+    """
+    try:
+        with locked_state(filepath, exclusive=True) as target_path:
+            if target_path.exists():
+                data = load_state(target_path)
+                if data is None:
+                    return None
+            else:
+                data = {}
+            result = mutate(data)
+            new_data = result if result is not None else data
+            saved = save_state(new_data, target_path, compact=compact, layout=layout, codec=codec)
+            if saved is None:
+                return None
+        return new_data
+    except (IOError, ValueError) as error:
+        print(f"Error updating state: {error}")
+        return None
+
+
+def _read_head(target_path: Path, codec: codecs.Codec | None, size: int) -> bytes:
+    """Return the first ``size`` bytes of the (decompressed) state document."""
+    with target_path.open("rb") as file_obj:
+        if codec is None:
+            return file_obj.read(size)
+        codecs.read_header(file_obj)
+        with codec.open(file_obj, "rb") as stream:
+            return stream.read(size)
+
+
+def state_format(filepath: str | Path | None = None) -> StateFormat:
+    """Return the layout, codec and JSON style of a state file, for rewriting it alike.
+
+    Returns:
+        ``StateFormat`` for ``save_state``: the codec is a name or ``"none"``
+        for an existing file, None (pick by extension) for a missing one, and
+        ``compact`` tells minified JSON from the indented layout. Binary
+        files report ``"json"``, the layout they load as.
+    """
+    target_path = _resolve_path(filepath)
+    if not target_path.exists():
+        return StateFormat("json", None, False)
+    codec = codecs.detect(target_path)
+    head = _read_head(target_path, codec, len(line_state.HEADER))
+    layout = "lines" if head == line_state.HEADER else "json"
+    # indented JSON always opens with "{\n"; minified JSON never does
+    compact = layout == "json" and not head.startswith(b"{\n")
+    return StateFormat(layout, codec.name if codec else codecs.NONE, compact)
+
+
+def _read_state(target_path: Path) -> Any:
+    """Decode a state file in any supported layout.
+
+    Args:
+        target_path: Existing state file
+
+    Returns:
+        Decoded state
+    """
+    codec = codecs.detect(target_path)
+    if codec is not None:
+        lines = _decompressed_lines(target_path, codec)
+        first = next(lines, b"")
+        if first == line_state.HEADER:
+            return line_state.read_lines(itertools.chain([first], lines))
+        return json.loads(b"".join(itertools.chain([first], lines)))
+
+    if line_state.is_line_state(target_path):
+        with line_state.LazyState(target_path) as lazy:
+            return dict(lazy)
+
+    from inventory_system.persistence import binary_state  # imports this module
+
+    if binary_state.is_binary_state(target_path):
+        with binary_state.BinaryState(target_path) as binary:
+            return binary.to_state()
+
+    with target_path.open("r", encoding="utf-8") as file_obj:
+        return json.load(file_obj)
+
+
+def _load_cached(target_path: Path, cache: StateCache) -> CachedState | None:
+    """Return state from the cache, reading and caching it on a miss.
+
+    Hits are validated against the file signature and served without taking
+    the lock; misses read under a shared lock.
+
+    Returns:
+        Cached state, or None if the file does not exist
+    """
+    entry = cache.get(target_path)
+    if entry is not None:
+        return entry
+    with file_lock.state_lock(target_path, timeout=_lock_timeout()):
+        signature = file_signature(target_path)  # taken before reading, never after
+        if signature is None:
+            return None
+        data = _read_state(target_path)
+    cached = cache.put(target_path, signature, data)
+    if cached is None:
+        raise TypeError(f"State in {target_path} cannot be cached")
+    return cached
+
+
 def load_state(filepath: str | Path | None = None) -> dict[str, Any] | None:
     """Load state from a JSON file.
 
+    Files in the line-delimited layout or the binary format are detected
+    and fully materialized. With the load cache enabled, a valid cached
+    state is returned as a fresh mutable copy.
+
     Args:
         filepath: Optional custom path to state file
 
     Returns:
         Dictionary containing state if file exists and is valid, None otherwise
     """
+    try:
+        target_path = _resolve_path(filepath)
+        cache = _load_cache
+        if cache is not None:
+            entry = _load_cached(target_path, cache)
+            return entry.copy() if entry is not None else None
+
+        with file_lock.state_lock(target_path, timeout=_lock_timeout()):
+            if not target_path.exists():
+                return None
+            data: dict[str, Any] = _read_state(target_path)
+        return data
+    # Truncated or corrupt compressed streams raise EOFError or LZMAError.
+    except (IOError, ValueError, TypeError, EOFError, lzma.LZMAError) as error:
+        print(f"Error loading state: {error}")
+        return None
+
+
+def load_state_view(filepath: str | Path | None = None) -> Mapping[str, Any] | None:
+    """Load state as a deep read-only view (mappings and tuples).
+
+    With the load cache enabled, a valid cached state is returned without
+    copying, which makes repeated loads nearly free.
+
+    Args:
+        filepath: Optional custom path to state file
+
+    Returns:
+        Read-only mapping if the file exists and is valid, None otherwise
+    """
+    try:
+        target_path = _resolve_path(filepath)
+        cache = _load_cache
+        if cache is not None:
+            entry = _load_cached(target_path, cache)
+            return entry.frozen if entry is not None else None
+        with file_lock.state_lock(target_path, timeout=_lock_timeout()):
+            if not target_path.exists():
+                return None
+            frozen: Mapping[str, Any] = freeze(_read_state(target_path))
+        return frozen
+    # Truncated or corrupt compressed streams raise EOFError or LZMAError.
+    except (IOError, ValueError, TypeError, EOFError, lzma.LZMAError) as error:
+        print(f"Error loading state: {error}")
+        return None
+
+
+def open_state(filepath: str | Path | None = None) -> Mapping[str, Any] | None:
+    """Open state for key-by-key access.
+
+    Line-delimited files return a ``LazyState`` view that decodes a key only
+    when it is accessed (close it when done); JSON files are loaded whole.
+
+    Args:
+        filepath: Optional custom path to state file
+
+    Returns:
+        Mapping over the state, or None if the file is missing or invalid
+    """
     try:
         target_path = _resolve_path(filepath)
         if not target_path.exists():
             return None
-
-        with target_path.open("r", encoding="utf-8") as file_obj:
-            return json.load(file_obj)
-    except (IOError, json.JSONDecodeError) as error:
+        if line_state.is_line_state(target_path):
+            return line_state.LazyState(target_path)
+    except (IOError, ValueError) as error:
         print(f"Error loading state: {error}")
         return None
+    return load_state(target_path)
+
+
+def iter_state_items(filepath: str | Path | None = None, key: str = "items") -> Iterator[Any]:
+    """Iterate the records of a list-valued state key.
+
+    Line-delimited files are streamed one record at a time, compressed or
+    not, so memory stays flat regardless of file size; JSON files are loaded
+    whole first.
+
+    Args:
+        filepath: Optional custom path to state file
+        key: Top-level key holding a list
+
+    Yields:
+        Records stored under ``key`` (nothing if the key or file is missing)
+    """
+    try:
+        target_path = _resolve_path(filepath)
+        codec = codecs.detect(target_path) if target_path.exists() else None
+    except (IOError, ValueError) as error:
+        print(f"Error loading state: {error}")
+        return
+    if codec is not None:
+        lines = _decompressed_lines(target_path, codec)
+        first = next(lines, b"")
+        if first == line_state.HEADER:
+            yield from line_state.iter_stream_items(itertools.chain([first], lines), key)
+        else:
+            yield from json.loads(b"".join(itertools.chain([first], lines))).get(key) or []
+        return
+
+    state = open_state(target_path)
+    if state is None:
+        return
+    try:
+        if isinstance(state, line_state.LazyState):
+            yield from state.iter_items(key)
+        else:
+            yield from state.get(key) or []
+    finally:
+        if isinstance(state, line_state.LazyState):
+            state.close()
@@ -0,0 +1,259 @@
+"""Write-behind saver that coalesces frequent state updates.
+
+``WriteBehindSaver`` keeps the current state in memory. ``update`` merges
+top-level keys into it and returns immediately; a background thread writes
+the merged state with ``save_state`` once the debounce interval has passed
+since the first unsaved update, once the unsaved updates exceed a byte
+threshold, or when ``flush``/``close`` is called. Many updates to the same
+key between two writes cost a single write.
+
+Crash semantics:
+    * The state file always holds a complete snapshot, because every write
+      goes through ``save_state`` (temporary file, fsync, atomic rename).
+    * Updates accepted by ``update`` but not yet written are lost if the
+      process dies: at most ``interval`` seconds or ``max_dirty_bytes`` of
+      updates, plus whatever arrived during the write in progress.
+    * When ``flush`` returns True, every update made before the call is on
+      disk. A failed write keeps the updates pending and is retried on the
+      next trigger, but not before ``interval`` (at least
+      ``MIN_RETRY_DELAY``) seconds unless ``flush`` or ``close`` asks for
+      it; ``flush`` returns False and ``last_error`` is set.
+    * Values passed to ``update`` must not be mutated afterwards; the saver
+      stores references, not copies.
+"""
+
+import atexit
+import json
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from inventory_system.persistence import state_manager
+
+# Shortest wait before retrying a failed write, even with interval=0.
+MIN_RETRY_DELAY = 0.1
+
+
+class WriteBehindStats(NamedTuple):
+    """Snapshot of write-behind saver counters."""
+
+    updates: int
+    writes: int
+    failures: int
+    pending_updates: int
+    dirty_bytes: int
+
+    @property
+    def coalescing_ratio(self) -> float:
+        """Average number of updates folded into each successful write."""
+        return (self.updates - self.pending_updates) / self.writes if self.writes else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters plus coalescing ratio as a JSON-compatible dictionary."""
+        return {**self._asdict(), "coalescing_ratio": self.coalescing_ratio}
+
+
+def _estimate_bytes(key: str, value: Any) -> int:
+    """Approximate the encoded size of one update."""
+    return len(key) + len(json.dumps(value, separators=(",", ":"), default=str))
+
+
+class WriteBehindSaver:
+    """Accept state updates without blocking and save them in the background.
+
+    Use it as a context manager, or call ``close`` when done; an ``atexit``
+    hook also flushes pending updates at interpreter exit.
+
+    Args:
+        filepath: State file path (defaults to ``DEFAULT_STATE_FILE``)
+        initial: Starting state; None loads the existing file, if any
+        interval: Seconds between the first unsaved update and its write
+        max_dirty_bytes: Write early once unsaved updates exceed this size
+        compact: Write minified JSON
+        layout: "json" or "lines", as in ``save_state``
+    """
+
+    def __init__(
+        self,
+        filepath: str | Path | None = None,
+        initial: Mapping[str, Any] | None = None,
+        interval: float = 0.5,
+        max_dirty_bytes: int = 1024 * 1024,
+        compact: bool = False,
+        layout: str = "json",
+    ) -> None:
+        if interval < 0:
+            raise ValueError("interval must not be negative")
+        if max_dirty_bytes < 1:
+            raise ValueError("max_dirty_bytes must be at least 1")
+        if layout not in state_manager.LAYOUTS:
+            raise ValueError(f"Unknown state layout: {layout}")
+        self.filepath = filepath
+        self.interval = interval
+        self.max_dirty_bytes = max_dirty_bytes
+        self.compact = compact
+        self.layout = layout
+        if initial is None:
+            initial = state_manager.load_state(filepath) or {}
+        self._state: dict[str, Any] = dict(initial)
+        self.last_error: str | None = None
+
+        self._condition = threading.Condition()
+        self._generation = 0  # bumped by every update
+        self._saved_generation = 0  # generation of the last successful write
+        self._dirty_since: float | None = None
+        self._dirty_bytes = 0
+        self._retry_at: float | None = None  # backoff after a failed write
+        self._flush_requested = False
+        self._closed = False
+        self._writes = 0
+        self._failures = 0
+
+        self._thread = threading.Thread(target=self._run, name="state-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> "WriteBehindSaver":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def update(self, changes: Mapping[str, Any]) -> None:
+        """Merge top-level keys into the state; the write happens later.
+
+        Raises:
+            RuntimeError: If the saver has been closed
+        """
+        size = sum(_estimate_bytes(key, value) for key, value in changes.items())
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("WriteBehindSaver is closed")
+            self._state.update(changes)
+            self._generation += 1
+            self._dirty_bytes += size
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+                self._condition.notify_all()
+            elif self._dirty_bytes >= self.max_dirty_bytes:
+                self._condition.notify_all()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a shallow copy of the current in-memory state."""
+        with self._condition:
+            return dict(self._state)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Write pending updates now and wait until they are on disk.
+
+        Args:
+            timeout: Maximum seconds to wait; None waits indefinitely
+
+        Returns:
+            True if every update made before the call was saved, False if
+            the write failed or the timeout expired
+        """
+        with self._condition:
+            target = self._generation
+            if self._saved_generation >= target:
+                return True
+            failures = self._failures
+            self._flush_requested = True
+            self._condition.notify_all()
+            self._condition.wait_for(
+                lambda: self._saved_generation >= target
+                or self._failures > failures
+                or not self._thread.is_alive(),
+                timeout,
+            )
+            return self._saved_generation >= target
+
+    def close(self) -> bool:
+        """Flush pending updates and stop the background thread.
+
+        Returns:
+            True if the final state was saved
+        """
+        with self._condition:
+            if self._closed:
+                return self._saved_generation >= self._generation
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        atexit.unregister(self.close)
+        with self._condition:
+            return self._saved_generation >= self._generation
+
+    def stats(self) -> WriteBehindStats:
+        """Return a snapshot of the saver counters."""
+        with self._condition:
+            return WriteBehindStats(
+                updates=self._generation,
+                writes=self._writes,
+                failures=self._failures,
+                pending_updates=self._generation - self._saved_generation,
+                dirty_bytes=self._dirty_bytes,
+            )
+
+    def _write_due(self) -> bool:
+        """Return True if pending updates should be written now (lock held)."""
+        if self._dirty_since is None:
+            return False
+        if self._closed or self._flush_requested:
+            return True
+        now = time.monotonic()
+        if self._retry_at is not None and now < self._retry_at:
+            return False
+        return (
+            self._dirty_bytes >= self.max_dirty_bytes
+            or now - self._dirty_since >= self.interval
+        )
+
+    def _timeout(self) -> float | None:
+        """Seconds until the debounce deadline, or None when idle (lock held)."""
+        if self._dirty_since is None:
+            return None
+        now = time.monotonic()
+        if self._retry_at is not None and now < self._retry_at:
+            return self._retry_at - now
+        return max(0.0, self._dirty_since + self.interval - now)
+
+    def _run(self) -> None:
+        """Background loop: wait for a trigger, then write a snapshot."""
+        while True:
+            with self._condition:
+                while not self._write_due():
+                    if self._closed:
+                        return
+                    self._condition.wait(self._timeout())
+                snapshot = dict(self._state)
+                generation = self._generation
+                dirty_bytes = self._dirty_bytes
+                self._dirty_since = None
+                self._dirty_bytes = 0
+                self._flush_requested = False
+
+            saved = state_manager.save_state(
+                snapshot, self.filepath, compact=self.compact, layout=self.layout
+            )
+
+            with self._condition:
+                if saved is not None:
+                    self._writes += 1
+                    self._saved_generation = generation
+                    self._retry_at = None
+                    self.last_error = None
+                else:
+                    self._failures += 1
+                    self.last_error = "save_state failed; updates kept for retry"
+                    self._dirty_bytes += dirty_bytes
+                    # without a delay the byte threshold would retry at once, in a loop
+                    self._retry_at = time.monotonic() + max(self.interval, MIN_RETRY_DELAY)
+                    if self._dirty_since is None:
+                        self._dirty_since = time.monotonic()
+                    if self._closed:
+                        self._condition.notify_all()
+                        return
+                self._condition.notify_all()
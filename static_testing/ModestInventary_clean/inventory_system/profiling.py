@@ -0,0 +1,168 @@
+"""CPU and memory profiling of one CLI run, reported as JSON.
+
+``inventory --profile`` wraps the subcommand in ``cProfile`` and
+``inventory --trace-memory`` in ``tracemalloc``; both can be combined. The
+environment variables ``INVENTORY_PROFILE``, ``INVENTORY_TRACE_MEMORY`` and
+``INVENTORY_PROFILE_OUTPUT`` switch them on for runs started by other tools.
+
+The report is a JSON document with a fixed layout (``version`` is bumped on
+incompatible changes)::
+
+    {
+      "version": 1,
+      "command": ["backup"],
+      "started": "2025-01-01T12:00:00+00:00",
+      "elapsed_seconds": 0.42,
+      "profile": {
+        "total_calls": 12345, "primitive_calls": 12000, "total_seconds": 0.41,
+        "top_functions": [
+          {"function": "path/to/module.py:12(name)", "calls": 10,
+           "primitive_calls": 10, "own_seconds": 0.1, "cumulative_seconds": 0.3}
+        ]
+      },
+      "memory": {
+        "current_bytes": 1024, "peak_bytes": 4096,
+        "top_allocations": [{"site": "path/to/module.py:34", "bytes": 2048, "blocks": 3}]
+      }
+    }
+
+Sections for disabled profilers are ``null``. ``command`` holds the
+subcommand name only, never its arguments, and the report is readable by its
+owner only. When the output path is a directory, each run writes
+``<command>-<UTC timestamp>-<pid>.json`` inside it, so unattended runs never
+overwrite each other.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Final
+
+REPORT_VERSION: Final[int] = 1
+DEFAULT_OUTPUT: Final[str] = "inventory-profile.json"
+TOP_N: Final[int] = 25
+TRACE_FRAMES: Final[int] = 1
+_IGNORED_ALLOCATIONS: Final[tuple[tracemalloc.Filter, ...]] = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def report_path(output: str | Path, command: str | None, now: datetime) -> Path:
+    """Return the report file for this run (a new name inside a directory)."""
+    path = Path(output).expanduser()
+    if path.is_dir():
+        stamp = now.strftime("%Y%m%dT%H%M%S%fZ")
+        return path / f"{command or 'inventory'}-{stamp}-{os.getpid()}.json"
+    return path
+
+
+def _function_name(key: tuple[str, int, str]) -> str:
+    filename, line, name = key
+    return f"{filename}:{line}({name})" if line else name
+
+
+def profile_section(profiler: cProfile.Profile, top: int = TOP_N) -> dict[str, Any]:
+    """Summarize a finished profiler as the report's ``profile`` section."""
+    stats = pstats.Stats(profiler)
+    entries = stats.stats  # type: ignore[attr-defined]
+    rows = sorted(entries.items(), key=lambda item: (-item[1][3], _function_name(item[0])))
+    return {
+        "total_calls": stats.total_calls,  # type: ignore[attr-defined]
+        "primitive_calls": stats.prim_calls,  # type: ignore[attr-defined]
+        "total_seconds": round(stats.total_tt, 6),  # type: ignore[attr-defined]
+        "top_functions": [
+            {
+                "function": _function_name(key),
+                "calls": calls,
+                "primitive_calls": primitive,
+                "own_seconds": round(own, 6),
+                "cumulative_seconds": round(cumulative, 6),
+            }
+            for key, (primitive, calls, own, cumulative, _) in rows[:top]
+        ],
+    }
+
+
+def memory_section(top: int = TOP_N) -> dict[str, Any]:
+    """Summarize the running tracemalloc session as the report's ``memory`` section."""
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_ALLOCATIONS)
+    statistics = snapshot.statistics("lineno")
+    return {
+        "current_bytes": current,
+        "peak_bytes": peak,
+        "top_allocations": [
+            {
+                "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "bytes": stat.size,
+                "blocks": stat.count,
+            }
+            for stat in statistics[:top]
+        ],
+    }
+
+
+class RunProfiler:
+    """Profile everything between ``start`` and ``finish`` and write one report."""
+
+    def __init__(
+        self,
+        output: str | Path = DEFAULT_OUTPUT,
+        cpu: bool = True,
+        memory: bool = False,
+        top: int = TOP_N,
+    ) -> None:
+        self.output = output
+        self.top = top
+        self._profiler = cProfile.Profile() if cpu else None
+        self._memory = memory
+        self._started = datetime.now(timezone.utc)
+        self._start = 0.0
+
+    def start(self) -> None:
+        """Begin tracing allocations and/or profiling calls."""
+        if self._memory and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+        self._start = time.perf_counter()
+        if self._profiler is not None:
+            self._profiler.enable()
+
+    def finish(self, command: list[str]) -> Path:
+        """Stop profiling and write the report.
+
+        Args:
+            command: Subcommand name (as a one-item list), recorded in the report
+
+        Returns:
+            Path of the written report
+        """
+        if self._profiler is not None:
+            self._profiler.disable()
+        elapsed = time.perf_counter() - self._start
+        memory = None
+        if self._memory:
+            memory = memory_section(self.top)
+            tracemalloc.stop()
+        report = {
+            "version": REPORT_VERSION,
+            "command": command,
+            "started": self._started.isoformat(),
+            "elapsed_seconds": round(elapsed, 6),
+            "profile": profile_section(self._profiler, self.top) if self._profiler else None,
+            "memory": memory,
+        }
+        path = report_path(self.output, command[0] if command else None, self._started)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(fd, 0o600)  # O_CREAT's mode does not apply to an existing file
+        with os.fdopen(fd, "w", encoding="utf-8") as file_obj:
+            file_obj.write(json.dumps(report, indent=2) + "\n")
+        return path
@@ -0,0 +1,175 @@
+"""Long-running inventory server over a Unix socket or localhost HTTP.
+
+The server keeps the package loaded and answers JSON requests built by
+``inventory_system.service``. Each connection is handled on its own thread
+and batched requests are fanned out to a shared thread pool.
+
+Unix socket protocol: one JSON document per line in, one JSON line out.
+HTTP protocol: ``POST /`` with a JSON body, JSON response body. Bodies not
+sent as ``Content-Type: application/json`` get 415: that type cannot be sent
+cross-origin without a CORS preflight, so a web page open in a local browser
+cannot drive the server.
+"""
+
+import json
+import os
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Final
+
+from inventory_system import service
+from inventory_system.client import parse_address
+
+DEFAULT_WORKERS: Final[int] = 8
+MAX_REQUEST_BYTES: Final[int] = 16 * 1024 * 1024
+
+
+def _encode(response: Any) -> bytes:
+    """Serialize a response envelope."""
+    return json.dumps(response, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _decode_and_dispatch(raw: bytes, executor: ThreadPoolExecutor, state_file: Path | None) -> Any:
+    """Decode one JSON document and dispatch it."""
+    try:
+        payload = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError) as error:
+        return {"ok": False, "error": f"Invalid JSON: {error}"}
+    return service.dispatch(payload, executor, state_file)
+
+
+class _UnixRequestHandler(socketserver.StreamRequestHandler):
+    """Answer newline-delimited JSON requests on a Unix socket connection."""
+
+    server: "InventoryUnixServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = _decode_and_dispatch(line, self.server.executor, self.server.state_file)
+            self.wfile.write(_encode(response) + b"\n")
+            self.wfile.flush()
+
+
+class InventoryUnixServer(socketserver.ThreadingUnixStreamServer):
+    """Threaded Unix socket server answering inventory requests."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, executor: ThreadPoolExecutor, state_file: Path | None) -> None:
+        self.executor = executor
+        self.state_file = state_file
+        socket_path = Path(path)
+        if socket_path.is_socket():
+            socket_path.unlink()
+        super().__init__(path, _UnixRequestHandler)
+        os.chmod(path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        Path(str(self.server_address)).unlink(missing_ok=True)
+
+
+class _HTTPRequestHandler(BaseHTTPRequestHandler):
+    """Answer JSON requests posted over HTTP."""
+
+    server: "InventoryHTTPServer"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        if self.headers.get_content_type() != "application/json":
+            self.close_connection = True  # the unread body would be parsed as the next request
+            self._reply(415, {"ok": False, "error": "Content-Type must be application/json"})
+            return
+        length = int(self.headers.get("Content-Length", "0"))
+        if length > MAX_REQUEST_BYTES:
+            self._reply(413, {"ok": False, "error": "Request too large"})
+            return
+        response = _decode_and_dispatch(
+            self.rfile.read(length), self.server.executor, self.server.state_file
+        )
+        self._reply(200, response)
+
+    def _reply(self, status: int, response: Any) -> None:
+        body = _encode(response)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        """Silence per-request logging."""
+
+
+class InventoryHTTPServer(ThreadingHTTPServer):
+    """Threaded localhost HTTP server answering inventory requests."""
+
+    daemon_threads = True
+
+    def __init__(
+        self, address: tuple[str, int], executor: ThreadPoolExecutor, state_file: Path | None
+    ) -> None:
+        self.executor = executor
+        self.state_file = state_file
+        super().__init__(address, _HTTPRequestHandler)
+
+
+def create_server(
+    address: str,
+    executor: ThreadPoolExecutor,
+    state_file: Path | None = None,
+) -> socketserver.BaseServer:
+    """Create (but do not start) a server bound to ``address``.
+
+    Args:
+        address: Server address (see parse_address)
+        executor: Thread pool used for batched requests
+        state_file: State file used by save/load (None for the default file)
+
+    Returns:
+        Bound server instance; call ``serve_forever()`` to start it
+    """
+    _, target = parse_address(address)
+    if isinstance(target, str):
+        return InventoryUnixServer(target, executor, state_file)
+    return InventoryHTTPServer(target, executor, state_file)
+
+
+def serve(
+    address: str,
+    workers: int = DEFAULT_WORKERS,
+    state_file: Path | None = None,
+    discount_cache_size: int = 0,
+    state_cache_size: int = 0,
+) -> None:
+    """Preload the package and serve requests until interrupted.
+
+    Args:
+        address: Server address (see parse_address)
+        workers: Number of threads used for batched requests
+        state_file: State file used by save/load (None for the default file)
+        discount_cache_size: Discount result cache size (0 disables caching)
+        state_cache_size: State files kept in the load cache (0 disables it)
+    """
+    service.preload()
+    if discount_cache_size > 0:
+        from inventory_system.logic.discount_calculator import enable_discount_cache
+
+        enable_discount_cache(discount_cache_size)
+    if state_cache_size > 0:
+        from inventory_system.persistence.state_manager import enable_load_cache
+
+        enable_load_cache(state_cache_size)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        server = create_server(address, executor, state_file)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,269 @@
+"""Command handlers shared by the CLI, the server and the thin client.
+
+Each handler receives a dictionary of JSON-compatible parameters and returns
+a JSON-compatible dictionary. Heavy modules are imported inside the handlers
+so that importing this module stays cheap.
+"""
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+    from pathlib import Path
+
+Params = dict[str, Any]
+Handler = Callable[[Params, "Path | None"], Params]
+
+# Requests that change state; with INVENTORY_REQUIRE_LOGIN set on the server
+# they must carry a valid session token.
+ADMIN_COMMANDS: Final[frozenset[str]] = frozenset({"save", "item_add", "item_adjust_stock"})
+
+
+class CommandError(ValueError):
+    """Raised when a request names an unknown command or has bad parameters."""
+
+
+def _handle_discount(params: Params, state_file: "Path | None") -> Params:
+    """Calculate a discount from request parameters."""
+    from inventory_system.logic.discount_calculator import calculate_discount
+
+    try:
+        value = calculate_discount(
+            item_category=str(params["category"]),
+            user_level=str(params["user_level"]),
+            purchase_history_count=int(params["purchase_count"]),
+            is_holiday=bool(params.get("holiday", False)),
+            season=str(params.get("season", "normal")),
+            region=str(params.get("region", "US")),
+        )
+    except KeyError as error:
+        raise CommandError(f"Missing parameter: {error.args[0]}") from error
+    return {"discount": value}
+
+
+def _handle_login(params: Params, state_file: "Path | None") -> Params:
+    """Check admin credentials from request parameters."""
+    from inventory_system.auth import is_admin
+
+    try:
+        return {"authenticated": is_admin(str(params["username"]), str(params["password"]))}
+    except KeyError as error:
+        raise CommandError(f"Missing parameter: {error.args[0]}") from error
+
+
+def _handle_save(params: Params, state_file: "Path | None") -> Params:
+    """Save the request data, or rewrite the current state in the requested format.
+
+    Without ``data`` the item catalog and other keys are kept as they are;
+    ``compact``, ``layout`` and ``codec`` default to the file's current ones.
+    """
+    from inventory_system.logic.item_repository import update_repository
+    from inventory_system.persistence import codecs, state_manager
+
+    layout = params.get("layout")
+    if layout is not None and layout not in state_manager.LAYOUTS:
+        raise CommandError(f"Unknown state layout: {layout}")
+    codec = params.get("codec")
+    if codec is not None and codec != codecs.NONE and codec not in codecs.CODECS:
+        raise CommandError(f"Unknown codec: {codec}")
+    compact = params.get("compact")
+    compact = None if compact is None else bool(compact)
+
+    if "data" not in params:
+        try:
+            count = update_repository(len, state_file, compact=compact, layout=layout, codec=codec)
+        except (ValueError, OSError) as error:
+            raise CommandError(str(error)) from error
+        path = state_manager.DEFAULT_STATE_FILE if state_file is None else state_file
+        return {"path": str(path.expanduser().resolve()), "items": count}
+
+    data = params["data"]
+    if not isinstance(data, dict):
+        raise CommandError("Parameter 'data' must be a JSON object")
+    saved_path = state_manager.save_state(
+        data, state_file, compact=bool(compact), layout=layout or "json", codec=codec
+    )
+    return {"path": str(saved_path) if saved_path else None}
+
+
+def _handle_load(params: Params, state_file: "Path | None") -> Params:
+    """Load the state file."""
+    from inventory_system.persistence import state_manager
+
+    return {"data": state_manager.load_state(state_file)}
+
+
+def _handle_cache_stats(params: Params, state_file: "Path | None") -> Params:
+    """Report discount result, state load and verified-login cache counters."""
+    from inventory_system.credentials import login_cache_stats
+    from inventory_system.logic.discount_calculator import discount_cache_stats
+    from inventory_system.persistence.state_manager import load_cache_stats
+
+    stats = discount_cache_stats()
+    state_stats = load_cache_stats()
+    return {
+        "enabled": stats is not None,
+        "stats": stats.as_dict() if stats else None,
+        "state": state_stats.as_dict() if state_stats else None,
+        "login": login_cache_stats().as_dict(),
+    }
+
+
+def _item_change(change: Callable[[Any], Any], state_file: "Path | None") -> Any:
+    """Apply a change to the item repository, reporting failures as CommandError."""
+    from inventory_system.logic.item_repository import update_repository
+
+    try:
+        return update_repository(change, state_file)
+    except KeyError as error:
+        raise CommandError(f"Unknown SKU: {error.args[0]}") from error
+    except (ValueError, OSError) as error:
+        raise CommandError(str(error)) from error
+
+
+def _handle_item_add(params: Params, state_file: "Path | None") -> Params:
+    """Add a new item to the repository."""
+    from inventory_system.logic.item_repository import make_item
+
+    try:
+        item = make_item(params["sku"], params["category"], params["quantity"], params["price"])
+    except KeyError as error:
+        raise CommandError(f"Missing parameter: {error.args[0]}") from error
+    except ValueError as error:
+        raise CommandError(str(error)) from error
+    return {"item": _item_change(lambda repository: repository.add(item), state_file).as_record()}
+
+
+def _handle_item_adjust_stock(params: Params, state_file: "Path | None") -> Params:
+    """Change the stock of an existing item by a signed delta."""
+    try:
+        sku, delta = str(params["sku"]), int(params["delta"])
+    except KeyError as error:
+        raise CommandError(f"Missing parameter: {error.args[0]}") from error
+    item = _item_change(lambda repository: repository.adjust_stock(sku, delta), state_file)
+    return {"item": item.as_record()}
+
+
+def _handle_item_query(params: Params, state_file: "Path | None") -> Params:
+    """Look items up by SKU, category and/or maximum quantity."""
+    from inventory_system.logic.item_repository import open_repository
+
+    try:
+        repository = open_repository(state_file)
+    except (ValueError, OSError) as error:
+        raise CommandError(str(error)) from error
+    limit = params.get("limit")
+    if params.get("sku") is not None:
+        found = repository.get(str(params["sku"]))
+        items = [found] if found is not None else []
+    else:
+        category = params.get("category")
+        max_quantity = params.get("max_quantity")
+        items = repository.query(
+            category=str(category) if category is not None else None,
+            max_quantity=int(max_quantity) if max_quantity is not None else None,
+            limit=int(limit) if limit is not None else None,
+        )
+    return {
+        "items": [item.as_record() for item in items],
+        "count": len(items),
+        "stock_value": round(sum(item.stock_value for item in items), 2),
+    }
+
+
+HANDLERS: Final[dict[str, Handler]] = {
+    "discount": _handle_discount,
+    "login": _handle_login,
+    "save": _handle_save,
+    "load": _handle_load,
+    "cache_stats": _handle_cache_stats,
+    "item_add": _handle_item_add,
+    "item_adjust_stock": _handle_item_adjust_stock,
+    "item_query": _handle_item_query,
+}
+
+
+def preload() -> None:
+    """Import every module used by the handlers ahead of the first request."""
+    # pylint: disable=import-outside-toplevel,unused-import
+    import inventory_system.auth  # noqa: F401
+    import inventory_system.logic.discount_calculator  # noqa: F401
+    import inventory_system.logic.item_repository  # noqa: F401
+    import inventory_system.persistence.state_manager  # noqa: F401
+
+
+def execute(command: str, params: Params | None = None, state_file: "Path | None" = None) -> Params:
+    """Run a single command and return its result.
+
+    Args:
+        command: Command name (discount, login, save, load, cache_stats, item_*)
+        params: Command parameters
+        state_file: State file used by save/load (None for the default file)
+
+    Returns:
+        JSON-compatible result dictionary
+
+    Raises:
+        CommandError: If the command is unknown or parameters are invalid
+    """
+    handler = HANDLERS.get(command)
+    if handler is None:
+        raise CommandError(f"Unknown command: {command}")
+    return handler(params or {}, state_file)
+
+
+def _authorized(command: str, token: Any) -> bool:
+    """Return whether a request may run ``command`` with the given session token."""
+    if command not in ADMIN_COMMANDS:
+        return True
+    from inventory_system import session
+
+    if not session.login_required():
+        return True
+    return isinstance(token, str) and session.verify_token(token) is not None
+
+
+def _execute_request(request: Any, state_file: "Path | None") -> Params:
+    """Run one request object and wrap the outcome in a response envelope."""
+    if not isinstance(request, dict):
+        return {"ok": False, "error": "Request must be a JSON object"}
+    params = request.get("params", {})
+    if not isinstance(params, dict):
+        return {"ok": False, "error": "Parameter 'params' must be a JSON object"}
+    command = str(request.get("command", ""))
+    if not _authorized(command, request.get("token")):
+        return {"ok": False, "error": "Admin session required: run `inventory login` first"}
+    try:
+        result = execute(command, params, state_file)
+    except (CommandError, ValueError, TypeError) as error:
+        return {"ok": False, "error": str(error)}
+    return {"ok": True, "result": result}
+
+
+def dispatch(
+    payload: Any,
+    executor: "ThreadPoolExecutor | None" = None,
+    state_file: "Path | None" = None,
+) -> Any:
+    """Answer a single request or a batch of requests.
+
+    A request is ``{"command": name, "params": {...}}``, plus ``"token"`` for
+    ``ADMIN_COMMANDS`` when the server runs with ``INVENTORY_REQUIRE_LOGIN``
+    (the token is checked against the server's session directory). A batch is a JSON list
+    of requests; its items run concurrently on ``executor`` when one is given
+    and responses are returned in request order.
+
+    Args:
+        payload: Decoded JSON request or list of requests
+        executor: Optional thread pool used for batch items
+        state_file: State file used by save/load (None for the default file)
+
+    Returns:
+        Response envelope, or a list of envelopes for a batch
+    """
+    if not isinstance(payload, list):
+        return _execute_request(payload, state_file)
+    if executor is None or len(payload) < 2:
+        return [_execute_request(request, state_file) for request in payload]
+    return list(executor.map(lambda request: _execute_request(request, state_file), payload))
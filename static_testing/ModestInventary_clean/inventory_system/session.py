@@ -0,0 +1,219 @@
+"""Locally stored, HMAC-signed session tokens issued by ``inventory login``.
+
+A successful login writes a token to the session directory
+(``INVENTORY_SESSION_DIR``, default ``~/.inventory``). Later commands verify it
+with one HMAC-SHA256 and a constant-time comparison, so scripts running many
+admin commands skip the credential lookup and the password KDF.
+
+Token format: ``<payload>.<signature>``, both base64url without padding; the
+payload is compact JSON with the subject (``sub``), issue and expiry times
+(``iat``/``exp``, Unix seconds) and a random token id (``jti``). The signing
+key is a random 32-byte file created on first login.
+
+Revocation: ``logout`` deletes the token and records its id in the
+revocation list until it would have expired anyway; ``logout --all`` rotates
+the signing key, which invalidates every token issued so far.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import tempfile
+import time
+from pathlib import Path
+from typing import Final, NamedTuple
+
+SESSION_DIR_ENV: Final[str] = "INVENTORY_SESSION_DIR"
+REQUIRE_LOGIN_ENV: Final[str] = "INVENTORY_REQUIRE_LOGIN"
+DEFAULT_SESSION_DIR: Final[Path] = Path("~/.inventory")
+DEFAULT_TTL_SECONDS: Final[int] = 3600
+KEY_FILE: Final[str] = "session.key"
+TOKEN_FILE: Final[str] = "session.token"
+REVOKED_FILE: Final[str] = "session.revoked"
+KEY_BYTES: Final[int] = 32
+
+
+class Session(NamedTuple):
+    """A verified session token."""
+
+    token: str
+    subject: str
+    issued_at: float
+    expires_at: float
+    token_id: str
+
+    def remaining(self, now: float | None = None) -> float:
+        """Seconds until the session expires."""
+        return self.expires_at - (time.time() if now is None else now)
+
+
+def session_dir(directory: str | Path | None = None) -> Path:
+    """Return the session directory (argument, environment or default)."""
+    chosen = directory or os.getenv(SESSION_DIR_ENV) or DEFAULT_SESSION_DIR
+    return Path(chosen).expanduser().resolve()
+
+
+def login_required() -> bool:
+    """Return whether admin commands require a session (``INVENTORY_REQUIRE_LOGIN``)."""
+    return os.getenv(REQUIRE_LOGIN_ENV, "").lower() in ("1", "true", "yes")
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _write_private(path: Path, data: bytes) -> None:
+    """Atomically replace ``path`` with ``data``, readable by the owner only."""
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file_obj:
+            file_obj.write(data)
+            file_obj.flush()
+            os.fsync(file_obj.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def _load_key(directory: Path) -> bytes | None:
+    try:
+        return (directory / KEY_FILE).read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _ensure_key(directory: Path) -> bytes:
+    """Return the signing key, creating it exclusively so concurrent logins agree."""
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    try:
+        fd = os.open(directory / KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        pass
+    else:
+        with os.fdopen(fd, "wb") as file_obj:
+            file_obj.write(secrets.token_bytes(KEY_BYTES))
+            file_obj.flush()
+            os.fsync(file_obj.fileno())
+    key = _load_key(directory)
+    if not key:
+        raise OSError(f"Session key is missing or empty: {directory / KEY_FILE}")
+    return key
+
+
+def _sign(key: bytes, payload: str) -> str:
+    return _b64encode(hmac.new(key, payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def _revoked(directory: Path) -> dict[str, float]:
+    """Return revoked token ids mapped to their expiry."""
+    try:
+        lines = (directory / REVOKED_FILE).read_text(encoding="ascii").splitlines()
+    except FileNotFoundError:
+        return {}
+    revoked = {}
+    for line in lines:
+        token_id, _, expires = line.partition(" ")
+        try:
+            revoked[token_id] = float(expires)
+        except ValueError:
+            revoked[token_id] = float("inf")  # keep revoked even if the line is damaged
+    return revoked
+
+
+def issue_token(
+    subject: str, ttl: float = DEFAULT_TTL_SECONDS, directory: str | Path | None = None
+) -> Session:
+    """Create, store and return a signed session token for ``subject``.
+
+    Args:
+        subject: Authenticated username
+        ttl: Lifetime in seconds
+        directory: Session directory (None for the default)
+
+    Raises:
+        ValueError: If ``ttl`` is not positive
+    """
+    if ttl <= 0:
+        raise ValueError("Session lifetime must be positive")
+    root = session_dir(directory)
+    key = _ensure_key(root)
+    issued_at = int(time.time())
+    expires_at = int(issued_at + ttl)
+    token_id = secrets.token_hex(16)
+    claims = {"sub": subject, "iat": issued_at, "exp": expires_at, "jti": token_id}
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    token = f"{payload}.{_sign(key, payload)}"
+    _write_private(root / TOKEN_FILE, token.encode("ascii"))
+    return Session(token, subject, issued_at, expires_at, token_id)
+
+
+def verify_token(
+    token: str, directory: str | Path | None = None, now: float | None = None
+) -> Session | None:
+    """Return the session for a valid, unexpired, unrevoked token, else None."""
+    root = session_dir(directory)
+    key = _load_key(root)
+    payload, _, signature = token.strip().partition(".")
+    if key is None or not payload or not signature or not token.isascii():
+        return None
+    if not hmac.compare_digest(_sign(key, payload), signature):
+        return None
+    try:
+        claims = json.loads(_b64decode(payload))
+        session = Session(
+            token.strip(),
+            str(claims["sub"]),
+            float(claims["iat"]),
+            float(claims["exp"]),
+            str(claims["jti"]),
+        )
+    except (ValueError, KeyError, TypeError):
+        return None
+    if session.remaining(now) <= 0 or session.token_id in _revoked(root):
+        return None
+    return session
+
+
+def current_session(directory: str | Path | None = None) -> Session | None:
+    """Return the stored session if its token is still valid."""
+    try:
+        token = (session_dir(directory) / TOKEN_FILE).read_text(encoding="ascii")
+    except (FileNotFoundError, UnicodeDecodeError):
+        return None
+    return verify_token(token, directory)
+
+
+def revoke(directory: str | Path | None = None) -> Session | None:
+    """Revoke and delete the stored session token.
+
+    Returns:
+        The revoked session, or None if there was no valid session
+    """
+    root = session_dir(directory)
+    session = current_session(root)
+    if session is not None:
+        now = time.time()
+        revoked = {
+            token_id: expires for token_id, expires in _revoked(root).items() if expires > now
+        }
+        revoked[session.token_id] = session.expires_at
+        lines = "".join(f"{token_id} {expires:.0f}\n" for token_id, expires in revoked.items())
+        _write_private(root / REVOKED_FILE, lines.encode("ascii"))
+    (root / TOKEN_FILE).unlink(missing_ok=True)
+    return session
+
+
+def revoke_all(directory: str | Path | None = None) -> None:
+    """Invalidate every token issued so far by discarding the signing key."""
+    root = session_dir(directory)
+    for name in (KEY_FILE, TOKEN_FILE, REVOKED_FILE):
+        (root / name).unlink(missing_ok=True)
@@ -2,63 +2,615 @@
 
 This module provides safe file backup operations without executing shell commands,
 which prevents command injection vulnerabilities.
+
+Verification never loads whole files: sizes are compared first, then both
+files are streamed in fixed-size chunks and the comparison stops at the first
+difference. ``create_backup(..., manifest=True)`` also writes a SHA-256
+manifest next to the backup (``<backup>.sha256``, in ``sha256sum`` format),
+so later verifications re-hash only the backup and never read the live
+state file.
+
+Snapshot backups (``create_backup(..., snapshot=True)`` or
+``snapshot_backup``) avoid pushing the bytes through userspace. They try, in
+order: a reflink clone (``FICLONE``, copy-on-write on Btrfs/XFS), a hardlink,
+``os.copy_file_range``, ``os.sendfile`` and finally a buffered copy, skipping
+those this platform lacks (no reflink without ``fcntl``). A hardlink is safe
+only because every state writer replaces the file atomically (a save creates
+a new inode and leaves the backup's untouched); pass ``allow_hardlink=False``
+when other tools may edit the state in place.
+
+``fan_out_backup`` writes several destinations (local, secondary disk,
+archive) from a single read of the state file, one writer thread per
+destination, and reports per-destination timings and failures.
+
+``compressed_backup`` compresses the backup on every core into a standard
+``.gz`` or ``.xz`` file; ``decompress_backup`` streams it back.
 """
 
+import errno
+import hashlib
+import lzma
+import os
+import queue
 import shutil
+import time
+import zlib
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import IO, Final, NamedTuple, Optional
 
-from inventory_system.persistence.state_manager import DEFAULT_STATE_FILE
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
 
+from inventory_system.persistence.state_manager import (
+    DEFAULT_STATE_FILE,
+    locked_state,
+    write_atomically,
+)
+from inventory_system.utils.parallel_compress import (
+    CompressionStats,
+    compress_stream,
+    decompress_stream,
+    format_for_name,
+    get_format,
+)
 
-def create_backup(destination_path: str) -> Optional[Path]:
-    """Create a backup by safely copying the state file.
+CHUNK_SIZE: Final[int] = 1024 * 1024
+FAN_OUT_QUEUE_DEPTH: Final[int] = 8
+MANIFEST_SUFFIX: Final[str] = ".sha256"
+FICLONE: Final[int] = 0x40049409  # _IOW(0x94, 9, int) from linux/fs.h
+SNAPSHOT_MODES: Final[tuple[str, ...]] = (
+    "reflink",
+    "hardlink",
+    "copy_file_range",
+    "sendfile",
+    "copy",
+)
+# errors meaning "this mechanism is not available here", not "the copy failed"
+_UNSUPPORTED: Final[frozenset[int]] = frozenset(
+    {
+        errno.EBADF,
+        errno.EINVAL,
+        errno.EMLINK,
+        errno.ENOSYS,
+        errno.ENOTSUP,
+        errno.ENOTTY,
+        errno.EOPNOTSUPP,
+        errno.EPERM,
+        errno.EXDEV,
+    }
+)
 
-    Uses shutil for cross-platform, injection-safe file operations.
-    Never executes shell commands that could be vulnerable to injection.
+
+class DestinationResult(NamedTuple):
+    """Outcome of one destination of a fan-out backup."""
+
+    destination: str
+    path: Path | None
+    seconds: float
+    error: str | None
+
+
+class FanOutResult(NamedTuple):
+    """Outcome of a fan-out backup."""
+
+    source: Path
+    size: int
+    sha256: str
+    read_seconds: float
+    destinations: tuple[DestinationResult, ...]
+
+    @property
+    def failed(self) -> tuple[DestinationResult, ...]:
+        """Destinations that could not be written."""
+        return tuple(result for result in self.destinations if result.error is not None)
+
+
+class SnapshotResult(NamedTuple):
+    """Outcome of a snapshot backup."""
+
+    path: Path
+    mode: str
+    size: int
+    seconds: float
+
+
+def manifest_path_for(backup: Path) -> Path:
+    """Return the checksum manifest path that belongs to ``backup``."""
+    return backup.with_name(backup.name + MANIFEST_SUFFIX)
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as file_obj:
+        while read := file_obj.readinto(buffer):
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+def write_manifest(backup: Path, digest: str | None = None) -> Path:
+    """Atomically write the manifest of ``backup`` next to it.
+
+    Args:
+        backup: Backup file
+        digest: Its hex SHA-256, if already known (hashed from disk otherwise)
+
+    Returns:
+        Path to the manifest file
+    """
+    line = f"{digest or file_sha256(backup)}  {backup.name}\n".encode("utf-8")
+    manifest = manifest_path_for(backup)
+    write_atomically(manifest, lambda file_obj: file_obj.write(line))
+    return manifest
+
+
+def _backup_paths(
+    destination_path: str, source_path: str | Path | None = None
+) -> tuple[Path, Path]:
+    """Resolve the source state file and the backup target path.
+
+    Raises:
+        FileNotFoundError: If the source state file does not exist
+    """
+    source = Path(source_path or DEFAULT_STATE_FILE).expanduser().resolve()
+    target = _backup_target(source, destination_path)
+
+    if not source.exists():
+        msg = f"Source state file does not exist: {source}"
+        raise FileNotFoundError(msg)
+    return source, target
+
+
+def _backup_target(source: Path, destination_path: str) -> Path:
+    """Resolve where the backup of ``source`` goes, creating parent directories."""
+    destination = Path(destination_path).expanduser().resolve()
+
+    if destination.exists() and destination.is_dir():
+        target = destination / source.name
+    else:
+        target = destination
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    return target
+
+
+def _unsupported(error: OSError) -> bool:
+    return error.errno in _UNSUPPORTED
+
+
+def _reflink(source: IO[bytes], target: IO[bytes], _size: int) -> None:
+    fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+
+
+def _copy_file_range(source: IO[bytes], target: IO[bytes], size: int) -> None:
+    remaining = size
+    while remaining > 0:
+        copied = os.copy_file_range(source.fileno(), target.fileno(), remaining)
+        if copied == 0:
+            raise OSError(errno.EIO, "copy_file_range stopped before the end of the file")
+        remaining -= copied
+
+
+def _sendfile(source: IO[bytes], target: IO[bytes], size: int) -> None:
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(target.fileno(), source.fileno(), offset, size - offset)
+        if sent == 0:
+            raise OSError(errno.EIO, "sendfile stopped before the end of the file")
+        offset += sent
+
+
+def _buffered_copy(source: IO[bytes], target: IO[bytes], _size: int) -> None:
+    shutil.copyfileobj(source, target, CHUNK_SIZE)
+
+
+_COPIERS: Final[dict[str, Callable[[IO[bytes], IO[bytes], int], None]]] = {
+    "reflink": _reflink,
+    "copy_file_range": _copy_file_range,
+    "sendfile": _sendfile,
+    "copy": _buffered_copy,
+}
+
+
+def _copy_atomically(
+    source: Path,
+    target: Path,
+    copier: Callable[[IO[bytes], IO[bytes], int], None],
+    strict: bool = False,
+) -> bool:
+    """Replace ``target`` with a copy made by ``copier``.
+
+    Returns:
+        False if the mechanism is unsupported here (the target is untouched);
+        with ``strict`` every error is raised instead
+    """
+    size = source.stat().st_size
+
+    def write(target_file: IO[bytes]) -> None:
+        with open(source, "rb") as source_file:
+            copier(source_file, target_file, size)
+
+    try:
+        write_atomically(target, write)
+    except OSError as error:
+        if _unsupported(error) and not strict:
+            return False
+        raise
+    return True
+
+
+def _hardlink(source: Path, target: Path) -> bool:
+    """Atomically make ``target`` another name for ``source``.
+
+    Returns:
+        False if hardlinks are unsupported here (the target is untouched)
+    """
+    temp = target.with_name(f".{target.name}.{os.getpid()}.link")
+    temp.unlink(missing_ok=True)
+    try:
+        os.link(source, temp)
+    except OSError as error:
+        if _unsupported(error):
+            return False
+        raise
+    try:
+        os.replace(temp, target)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def snapshot_file(
+    source: Path, target: Path, modes: Sequence[str] = SNAPSHOT_MODES
+) -> str:
+    """Atomically copy ``source`` to ``target`` with the cheapest mechanism available.
+
+    Args:
+        source: File to copy
+        target: Destination file (replaced atomically)
+        modes: Mechanisms to try, in order (a subset of SNAPSHOT_MODES)
+
+    Returns:
+        Name of the mechanism used
+
+    Raises:
+        ValueError: If the target is the source or no mode is supported here
+    """
+    if source.resolve() == target.resolve():
+        raise ValueError(f"Backup target is the source file itself: {source}")
+    for mode in modes:
+        if mode == "hardlink":
+            if _hardlink(source, target):
+                return mode  # shares the inode, so the metadata already matches
+            continue
+        if mode not in _COPIERS:
+            raise ValueError(f"Unknown snapshot mode: {mode}")
+        if mode in ("copy_file_range", "sendfile") and not hasattr(os, mode):
+            continue
+        if mode == "reflink" and fcntl is None:
+            continue
+        # the plain copy is the last resort: its errors are real failures
+        if not _copy_atomically(source, target, _COPIERS[mode], strict=mode == "copy"):
+            continue
+        shutil.copystat(source, target)
+        return mode
+    raise ValueError(f"No snapshot mode supported here among: {', '.join(modes)}")
+
+
+def snapshot_backup(
+    destination_path: str,
+    manifest: bool = False,
+    allow_hardlink: bool = True,
+    source_path: str | Path | None = None,
+) -> Optional[SnapshotResult]:
+    """Back up the state file as a snapshot and report how it was made.
+
+    The shared state lock is held while copying, so the snapshot never
+    observes a half-finished save.
 
     Args:
         destination_path: Path where backup will be created
+        manifest: Also write a SHA-256 manifest next to the backup
+        allow_hardlink: Whether the backup may share the state file's inode
+        source_path: File to back up (None for DEFAULT_STATE_FILE)
 
     Returns:
-        Path to created backup file if successful, None otherwise
+        Snapshot result if successful, None otherwise
+    """
+    try:
+        source, target = _backup_paths(destination_path, source_path)
+        start = time.perf_counter()
+        modes = [mode for mode in SNAPSHOT_MODES if allow_hardlink or mode != "hardlink"]
+        with locked_state(source):
+            mode = snapshot_file(source, target, modes)
+        seconds = time.perf_counter() - start
+        if manifest:
+            write_manifest(target)
+        return SnapshotResult(target, mode, target.stat().st_size, seconds)
+    except (FileNotFoundError, IOError, ValueError, shutil.Error) as error:
+        print(f"Error creating backup: {error}")
+        return None
+
+
+def compressed_backup(
+    destination_path: str,
+    format_name: str = "gzip",
+    level: int | None = None,
+    workers: int | None = None,
+    manifest: bool = False,
+    source_path: str | Path | None = None,
+) -> Optional[tuple[Path, CompressionStats]]:
+    """Back up the state file compressed on several cores.
+
+    The backup is a standard ``.gz``/``.xz`` file of independently
+    compressed blocks (see ``parallel_compress``); the suffix is appended to
+    the target name when missing.
+
+    Args:
+        destination_path: Path where backup will be created
+        format_name: "gzip" or "xz"
+        level: Compression level; None uses the format default
+        workers: Compression threads; None uses every CPU
+        manifest: Also write a SHA-256 manifest (of the compressed file)
+        source_path: File to back up (None for DEFAULT_STATE_FILE)
+
+    Returns:
+        Backup path and compression statistics if successful, None otherwise
+    """
+    try:
+        block_format = get_format(format_name)
+        source, target = _backup_paths(destination_path, source_path)
+        if not target.name.endswith(block_format.suffix):
+            target = target.with_name(target.name + block_format.suffix)
+        stats: list[CompressionStats] = []
+
+        def write(file_obj: IO[bytes]) -> None:
+            with open(source, "rb") as source_file:
+                stats.append(
+                    compress_stream(source_file, file_obj, format_name, level, workers)
+                )
+
+        with locked_state(source):
+            write_atomically(target, write)
+        if manifest:
+            write_manifest(target)
+        return target, stats[0]
+    except (FileNotFoundError, IOError, ValueError, lzma.LZMAError, zlib.error) as error:
+        print(f"Error creating backup: {error}")
+        return None
+
+
+def decompress_backup(backup_path: str, destination_path: str) -> Optional[Path]:
+    """Stream a compressed backup back into a plain file, atomically.
+
+    Args:
+        backup_path: ``.gz`` or ``.xz`` backup
+        destination_path: File to write (a directory gets the name without suffix)
+
+    Returns:
+        Path to the restored file if successful, None otherwise
     """
     try:
-        source = DEFAULT_STATE_FILE.expanduser().resolve()
+        backup = Path(backup_path).expanduser().resolve()
+        block_format = format_for_name(backup.name)
+        if block_format is None:
+            raise ValueError(f"Not a compressed backup: {backup}")
         destination = Path(destination_path).expanduser().resolve()
+        if destination.is_dir():
+            destination = destination / backup.name[: -len(block_format.suffix)]
 
-        if destination.exists() and destination.is_dir():
-            target = destination / source.name
-        else:
-            target = destination
+        def write(file_obj: IO[bytes]) -> None:
+            with open(backup, "rb") as source_file:
+                decompress_stream(source_file, file_obj, block_format.name)
 
-        target.parent.mkdir(parents=True, exist_ok=True)
+        write_atomically(destination, write)
+        return destination
+    except (
+        FileNotFoundError, IOError, ValueError, EOFError, lzma.LZMAError, zlib.error
+    ) as error:
+        print(f"Error restoring backup: {error}")
+        return None
 
-        if not source.exists():
-            msg = f"Source state file does not exist: {source}"
-            raise FileNotFoundError(msg)
 
+def create_backup(
+    destination_path: str,
+    manifest: bool = False,
+    snapshot: bool = False,
+    compress: str | None = None,
+    source_path: str | Path | None = None,
+) -> Optional[Path]:
+    """Create a backup by safely copying the state file.
+
+    Uses shutil for cross-platform, injection-safe file operations.
+    Never executes shell commands that could be vulnerable to injection.
+
+    Args:
+        destination_path: Path where backup will be created
+        manifest: Also write a SHA-256 manifest next to the backup
+        snapshot: Use a reflink, hardlink or in-kernel copy (see snapshot_backup)
+        compress: Compress on every core into this format, "gzip" or "xz"
+            (see compressed_backup)
+        source_path: File to back up (None for DEFAULT_STATE_FILE)
+
+    Returns:
+        Path to created backup file if successful, None otherwise
+    """
+    if compress:
+        compressed = compressed_backup(
+            destination_path, compress, manifest=manifest, source_path=source_path
+        )
+        return compressed[0] if compressed else None
+    if snapshot:
+        result = snapshot_backup(destination_path, manifest, source_path=source_path)
+        return result.path if result else None
+    try:
+        source, target = _backup_paths(destination_path, source_path)
         shutil.copy2(source, target)
+        if manifest:
+            write_manifest(target)
         return target
     except (FileNotFoundError, IOError, shutil.Error) as error:
         print(f"Error creating backup: {error}")
         return None
 
 
+def _write_from_queue(
+    source: Path,
+    destination_path: str,
+    chunks: "queue.Queue[bytes | None]",
+    digest: Future[str],
+    manifest: bool,
+    start: float,
+) -> DestinationResult:
+    """Write chunks from ``chunks`` to one destination until the end marker.
+
+    On failure the queue is still drained, so the reader never blocks on a
+    destination that gave up; other destinations are unaffected.
+    """
+    done = False
+
+    def write(file_obj: IO[bytes]) -> None:
+        nonlocal done
+        while (chunk := chunks.get()) is not None:
+            file_obj.write(chunk)
+        done = True
+        digest.result()  # re-raises a read error, discarding the partial copy
+
+    try:
+        target = _backup_target(source, destination_path)
+        write_atomically(target, write)
+        shutil.copystat(source, target)
+        if manifest:
+            write_manifest(target, digest.result())
+        return DestinationResult(destination_path, target, time.perf_counter() - start, None)
+    except (IOError, OSError, ValueError, shutil.Error) as error:
+        if not done:
+            while chunks.get() is not None:
+                pass
+        return DestinationResult(destination_path, None, time.perf_counter() - start, str(error))
+
+
+def fan_out_backup(
+    destination_paths: Sequence[str], manifest: bool = False
+) -> Optional[FanOutResult]:
+    """Back up the state file to several destinations, reading it only once.
+
+    The calling thread reads the state file in CHUNK_SIZE blocks (under the
+    shared state lock) and hands each block to one writer thread per
+    destination through a bounded queue, so memory stays at
+    ``FAN_OUT_QUEUE_DEPTH`` blocks per destination. A destination that
+    fails (missing mount, full disk) is reported and does not stop the
+    others. With ``manifest``, the digest computed while reading is reused
+    for every manifest instead of re-hashing each copy.
+
+    Args:
+        destination_paths: Backup targets, each a file or directory path
+        manifest: Also write a SHA-256 manifest next to each backup
+
+    Returns:
+        Per-destination results, or None if the source could not be read
+    """
+    source = DEFAULT_STATE_FILE.expanduser().resolve()
+    if not source.exists():
+        print(f"Error creating backup: Source state file does not exist: {source}")
+        return None
+    queues: list["queue.Queue[bytes | None]"] = [
+        queue.Queue(FAN_OUT_QUEUE_DEPTH) for _ in destination_paths
+    ]
+    digest: Future[str] = Future()
+    start = time.perf_counter()
+    size = 0
+    with ThreadPoolExecutor(max_workers=max(1, len(queues)), thread_name_prefix="backup") as pool:
+        futures = [
+            pool.submit(_write_from_queue, source, path, chunks, digest, manifest, start)
+            for path, chunks in zip(destination_paths, queues)
+        ]
+        try:
+            hasher = hashlib.sha256() if manifest else None
+            with locked_state(source), open(source, "rb") as file_obj:
+                while chunk := file_obj.read(CHUNK_SIZE):
+                    if hasher:
+                        hasher.update(chunk)
+                    size += len(chunk)
+                    for chunks in queues:
+                        chunks.put(chunk)
+            digest.set_result(hasher.hexdigest() if hasher else "")
+        except (IOError, OSError) as error:
+            digest.set_exception(error)
+        read_seconds = time.perf_counter() - start
+        for chunks in queues:
+            chunks.put(None)
+        results = tuple(future.result() for future in futures)
+    if digest.exception() is not None:
+        print(f"Error creating backup: {digest.exception()}")
+        return None
+    return FanOutResult(source, size, digest.result(), read_seconds, results)
+
+
+def verify_manifest(backup_path: str | Path) -> bool:
+    """Verify a backup against its checksum manifest only.
+
+    Args:
+        backup_path: Path to backup file
+
+    Returns:
+        True if the manifest exists, names this backup and its digest matches
+    """
+    try:
+        backup = Path(backup_path).expanduser().resolve()
+        manifest = manifest_path_for(backup)
+        if not backup.exists() or not manifest.exists():
+            return False
+        expected, _, name = manifest.read_text(encoding="utf-8").strip().partition("  ")
+        return name == backup.name and expected.lower() == file_sha256(backup)
+    except (IOError, OSError, UnicodeDecodeError) as error:
+        print(f"Error verifying backup: {error}")
+        return False
+
+
+def files_equal(first: Path, second: Path) -> bool:
+    """Compare two files by size, then chunk by chunk until the first difference."""
+    first_stat, second_stat = first.stat(), second.stat()
+    if os.path.samestat(first_stat, second_stat):
+        return True  # hardlinked snapshot
+    if first_stat.st_size != second_stat.st_size:
+        return False
+    with open(first, "rb") as first_f, open(second, "rb") as second_f:
+        while True:
+            chunk = first_f.read(CHUNK_SIZE)
+            if chunk != second_f.read(CHUNK_SIZE):
+                return False
+            if not chunk:
+                return True
+
+
 def verify_backup(
     backup_path: str, original_path: str | None = None
 ) -> bool:
     """Verify backup integrity by comparing file contents.
 
+    Without ``original_path``, a backup that has a checksum manifest is
+    verified against the manifest alone, leaving the live state untouched.
+
     Args:
         backup_path: Path to backup file
-        original_path: Path to original file (None to use DEFAULT_STATE_FILE)
+        original_path: Path to original file (None to use the manifest if
+            present, else DEFAULT_STATE_FILE)
 
     Returns:
         True if backup matches original, False otherwise
     """
     try:
         backup = Path(backup_path).expanduser().resolve()
+        if original_path is None and manifest_path_for(backup).exists():
+            return verify_manifest(backup)
         original = (
             Path(original_path).expanduser().resolve()
             if original_path
@@ -68,14 +620,7 @@ def verify_backup(
         if not backup.exists() or not original.exists():
             return False
 
-        # Compare files byte-by-byte
-        with open(original, "rb") as orig_f:
-            original_content = orig_f.read()
-
-        with open(backup, "rb") as backup_f:
-            backup_content = backup_f.read()
-
-        return original_content == backup_content
+        return files_equal(original, backup)
     except (IOError, OSError) as error:
         print(f"Error verifying backup: {error}")
         return False
@@ -0,0 +1,407 @@
+"""Deduplicated incremental backups in a content-addressed chunk store.
+
+The state file is split into content-defined chunks; each unique chunk is
+stored once under its SHA-256 digest, and every backup is a small JSON
+manifest listing its chunks. A backup of a mostly unchanged state therefore
+writes only the chunks around the changed records plus the manifest.
+
+Store layout::
+
+    <store>/chunks/ab/abcdef...    chunk bytes, named by SHA-256
+    <store>/manifests/<id>.json    one manifest per backup
+
+Chunk boundaries are anchored on record separators of the state formats
+(newlines and ``},``): after ``min_size`` bytes, the first anchor whose
+surrounding ``WINDOW`` bytes on each side hash (CRC-32) to zero under
+``mask_bits`` ends the chunk, and ``max_size`` forces a cut. The window
+reaches into the next record because record tails (tags, warehouses) are
+too repetitive to spread cuts evenly on their own. Because boundaries depend only on
+nearby content, inserting or removing a record shifts at most the chunks
+around it. Files without anchors (e.g. compressed states) fall back to
+fixed ``max_size`` chunks, which still deduplicate appends but not inserts.
+
+Backups take a shared lock on the store and pruning an exclusive one, so
+garbage collection never deletes a chunk a running backup just reused.
+"""
+
+import hashlib
+import json
+import re
+import zlib
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import IO, Any, Final, NamedTuple
+
+from inventory_system.persistence import file_lock
+from inventory_system.persistence.state_manager import DEFAULT_STATE_FILE, write_atomically
+
+MANIFEST_VERSION: Final[int] = 1
+READ_SIZE: Final[int] = 4 * 1024 * 1024
+WINDOW: Final[int] = 48
+ANCHOR: Final[re.Pattern[bytes]] = re.compile(rb"\n|\},")
+LATEST: Final[str] = "latest"
+
+
+class ChunkParams(NamedTuple):
+    """Content-defined chunking parameters."""
+
+    min_size: int = 4 * 1024
+    max_size: int = 64 * 1024
+    mask_bits: int = 6  # an anchor ends a chunk with probability 1 / 2**mask_bits
+
+
+DEFAULT_PARAMS: Final[ChunkParams] = ChunkParams()
+
+
+class BackupManifest(NamedTuple):
+    """Description of one incremental backup."""
+
+    backup_id: str
+    created: str
+    source: str
+    size: int
+    sha256: str
+    chunks: tuple[tuple[str, int], ...]
+
+    def to_json(self) -> dict[str, Any]:
+        """Return the manifest as a JSON-compatible dictionary."""
+        chunks = [list(chunk) for chunk in self.chunks]
+        return {"version": MANIFEST_VERSION, **self._asdict(), "chunks": chunks}
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "BackupManifest":
+        """Build a manifest from its JSON form.
+
+        Raises:
+            ValueError: If the manifest version or fields are invalid
+        """
+        if data.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported manifest version: {data.get('version')}")
+        try:
+            return cls(
+                backup_id=str(data["backup_id"]),
+                created=str(data["created"]),
+                source=str(data["source"]),
+                size=int(data["size"]),
+                sha256=str(data["sha256"]),
+                chunks=tuple((str(digest), int(size)) for digest, size in data["chunks"]),
+            )
+        except (KeyError, TypeError) as error:
+            raise ValueError(f"Invalid manifest: {error}") from error
+
+
+class BackupResult(NamedTuple):
+    """Outcome of one incremental backup."""
+
+    manifest: BackupManifest
+    new_chunks: int
+    bytes_written: int
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Source bytes per byte actually written to the chunk store."""
+        return self.manifest.size / self.bytes_written if self.bytes_written else float("inf")
+
+
+class PruneResult(NamedTuple):
+    """Outcome of pruning and garbage collection."""
+
+    removed_backups: tuple[str, ...]
+    removed_chunks: int
+    freed_bytes: int
+
+
+def _find_cut(buffer: bytes, start: int, eof: bool, params: ChunkParams) -> int | None:
+    """Return the end of the chunk starting at ``start``, or None if more data is needed."""
+    limit = min(start + params.max_size, len(buffer))
+    # the hash window reaches WINDOW bytes past the anchor, so leave room for it
+    search_end = limit if eof else min(limit, len(buffer) - WINDOW)
+    position = start + params.min_size
+    mask = (1 << params.mask_bits) - 1
+    while position < search_end:
+        match = ANCHOR.search(buffer, position, search_end)
+        if match is None:
+            break
+        cut = match.end()
+        if zlib.crc32(buffer[cut - WINDOW:cut + WINDOW]) & mask == 0:
+            return cut
+        position = cut
+    if limit == start + params.max_size or eof:
+        return limit
+    return None
+
+
+def iter_chunks(file_obj: IO[bytes], params: ChunkParams = DEFAULT_PARAMS) -> Iterator[bytes]:
+    """Split a binary stream into content-defined chunks.
+
+    Args:
+        file_obj: Readable binary file
+        params: Chunk size limits and cut probability
+
+    Yields:
+        Consecutive chunks whose concatenation is the whole stream
+    """
+    buffer = b""
+    start = 0
+    eof = False
+    while True:
+        if not eof and len(buffer) - start < params.max_size:
+            block = file_obj.read(READ_SIZE)
+            eof = not block
+            buffer = buffer[start:] + block
+            start = 0
+        if start == len(buffer):
+            return
+        cut = _find_cut(buffer, start, eof, params)
+        if cut is None:
+            continue  # need more data before a cut can be decided
+        yield buffer[start:cut]
+        start = cut
+
+
+class ChunkStore:
+    """Content-addressed chunk and manifest directory."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root).expanduser().resolve()
+        self.chunks_dir = self.root / "chunks"
+        self.manifests_dir = self.root / "manifests"
+
+    def lock(self, exclusive: bool = False) -> Any:
+        """Return a context manager holding the store lock."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        return file_lock.state_lock(self.root / "store", exclusive=exclusive)
+
+    def chunk_path(self, digest: str) -> Path:
+        """Return where the chunk with ``digest`` is stored."""
+        return self.chunks_dir / digest[:2] / digest
+
+    def put(self, data: bytes) -> tuple[str, bool]:
+        """Store a chunk unless it is already present.
+
+        Returns:
+            The chunk digest and whether it was newly written
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.chunk_path(digest)
+        if path.exists():
+            return digest, False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomically(path, lambda file_obj: file_obj.write(data))
+        return digest, True
+
+    def get(self, digest: str) -> bytes:
+        """Read a chunk and check it against its digest.
+
+        Raises:
+            ValueError: If the chunk is corrupt
+            FileNotFoundError: If the chunk is missing
+        """
+        data = self.chunk_path(digest).read_bytes()
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Corrupt chunk: {digest}")
+        return data
+
+    def manifest_path(self, backup_id: str) -> Path:
+        """Return where the manifest of ``backup_id`` is stored."""
+        return self.manifests_dir / f"{backup_id}.json"
+
+    def write_manifest(self, manifest: BackupManifest) -> Path:
+        """Atomically write a backup manifest."""
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        encoded = json.dumps(manifest.to_json(), separators=(",", ":")).encode("utf-8")
+        path = self.manifest_path(manifest.backup_id)
+        write_atomically(path, lambda file_obj: file_obj.write(encoded))
+        return path
+
+    def manifests(self) -> list[BackupManifest]:
+        """Return every backup manifest, oldest first."""
+        if not self.manifests_dir.exists():
+            return []
+        manifests = [
+            BackupManifest.from_json(json.loads(path.read_text(encoding="utf-8")))
+            for path in self.manifests_dir.glob("*.json")
+        ]
+        return sorted(manifests, key=lambda manifest: (manifest.created, manifest.backup_id))
+
+    def read_manifest(self, backup_id: str) -> BackupManifest:
+        """Return the manifest of ``backup_id`` (``"latest"`` for the newest).
+
+        Raises:
+            FileNotFoundError: If there is no such backup
+        """
+        if backup_id == LATEST:
+            manifests = self.manifests()
+            if not manifests:
+                raise FileNotFoundError(f"No backups in {self.root}")
+            return manifests[-1]
+        path = self.manifest_path(backup_id)
+        return BackupManifest.from_json(json.loads(path.read_text(encoding="utf-8")))
+
+
+def _new_backup_id(now: datetime) -> str:
+    """Return a sortable backup id for ``now``."""
+    return now.strftime("%Y%m%dT%H%M%S%fZ")
+
+
+def create_incremental_backup(
+    store_root: str | Path,
+    source_path: str | Path | None = None,
+    params: ChunkParams = DEFAULT_PARAMS,
+) -> BackupResult | None:
+    """Back up a state file into a deduplicating chunk store.
+
+    Args:
+        store_root: Chunk store directory (created if missing)
+        source_path: File to back up (None for DEFAULT_STATE_FILE)
+        params: Chunking parameters; keep them stable for a store so
+            unchanged regions produce identical chunks
+
+    Returns:
+        Backup result if successful, None otherwise
+    """
+    try:
+        source = Path(source_path).expanduser().resolve() if source_path else DEFAULT_STATE_FILE
+        if not source.exists():
+            raise FileNotFoundError(f"Source state file does not exist: {source}")
+        store = ChunkStore(store_root)
+        now = datetime.now(timezone.utc)
+        with store.lock():
+            whole = hashlib.sha256()
+            chunks = []
+            new_chunks = bytes_written = size = 0
+            with source.open("rb") as file_obj:
+                for chunk in iter_chunks(file_obj, params):
+                    whole.update(chunk)
+                    digest, written = store.put(chunk)
+                    chunks.append((digest, len(chunk)))
+                    size += len(chunk)
+                    if written:
+                        new_chunks += 1
+                        bytes_written += len(chunk)
+            manifest = BackupManifest(
+                backup_id=_new_backup_id(now),
+                created=now.isoformat(),
+                source=str(source),
+                size=size,
+                sha256=whole.hexdigest(),
+                chunks=tuple(chunks),
+            )
+            bytes_written += store.write_manifest(manifest).stat().st_size
+        return BackupResult(manifest, new_chunks, bytes_written)
+    except (IOError, OSError, ValueError) as error:
+        print(f"Error creating backup: {error}")
+        return None
+
+
+def restore_backup(
+    store_root: str | Path, backup_id: str, destination_path: str | Path
+) -> Path | None:
+    """Rebuild a backed-up file from its chunks.
+
+    Every chunk and the whole file are checked against their SHA-256
+    digests; the destination is replaced atomically only if all match.
+
+    Args:
+        store_root: Chunk store directory
+        backup_id: Backup to restore, or ``"latest"``
+        destination_path: File to write (a directory gets the source file name)
+
+    Returns:
+        Path to the restored file if successful, None otherwise
+    """
+    try:
+        store = ChunkStore(store_root)
+        with store.lock():
+            manifest = store.read_manifest(backup_id)
+            destination = Path(destination_path).expanduser().resolve()
+            if destination.is_dir():
+                destination = destination / Path(manifest.source).name
+            destination.parent.mkdir(parents=True, exist_ok=True)
+
+            def write(file_obj: IO[bytes]) -> None:
+                whole = hashlib.sha256()
+                for digest, _ in manifest.chunks:
+                    data = store.get(digest)
+                    whole.update(data)
+                    file_obj.write(data)
+                if whole.hexdigest() != manifest.sha256:
+                    raise ValueError(f"Restored data does not match backup {manifest.backup_id}")
+
+            write_atomically(destination, write)
+        return destination
+    except (IOError, OSError, ValueError) as error:
+        print(f"Error restoring backup: {error}")
+        return None
+
+
+def prune_backups(
+    store_root: str | Path,
+    keep_last: int = 24,
+    keep_within: timedelta | None = None,
+) -> PruneResult | None:
+    """Delete old backups and garbage-collect chunks nobody references.
+
+    A backup is kept if it is among the newest ``keep_last`` or, when
+    ``keep_within`` is given, younger than that.
+
+    Args:
+        store_root: Chunk store directory
+        keep_last: Number of newest backups always kept
+        keep_within: Also keep backups created within this period
+
+    Returns:
+        What was removed, or None on error
+    """
+    try:
+        if keep_last < 0:
+            raise ValueError("keep_last must not be negative")
+        store = ChunkStore(store_root)
+        with store.lock(exclusive=True):
+            manifests = store.manifests()
+            cutoff = datetime.now(timezone.utc) - keep_within if keep_within else None
+            kept = manifests[-keep_last:] if keep_last else []
+            newest = {manifest.backup_id for manifest in kept}
+            removed = []
+            referenced: set[str] = set()
+            for manifest in manifests:
+                recent = cutoff is not None and datetime.fromisoformat(manifest.created) >= cutoff
+                if manifest.backup_id in newest or recent:
+                    referenced.update(digest for digest, _ in manifest.chunks)
+                else:
+                    store.manifest_path(manifest.backup_id).unlink()
+                    removed.append(manifest.backup_id)
+            removed_chunks, freed = _collect_garbage(store, referenced)
+        return PruneResult(tuple(removed), removed_chunks, freed)
+    except (IOError, OSError, ValueError) as error:
+        print(f"Error pruning backups: {error}")
+        return None
+
+
+def _collect_garbage(store: ChunkStore, referenced: set[str]) -> tuple[int, int]:
+    """Delete chunks not in ``referenced``; return count and bytes freed."""
+    if not store.chunks_dir.exists():
+        return 0, 0
+    removed = freed = 0
+    for fanout in store.chunks_dir.iterdir():
+        for path in fanout.iterdir():
+            if path.name in referenced:
+                continue
+            freed += path.stat().st_size
+            path.unlink()
+            removed += 1
+        if not any(fanout.iterdir()):
+            fanout.rmdir()
+    return removed, freed
+
+
+def store_size(store_root: str | Path) -> int:
+    """Return the bytes used by chunks and manifests in a store."""
+    store = ChunkStore(store_root)
+    return sum(
+        path.stat().st_size
+        for directory in (store.chunks_dir, store.manifests_dir)
+        for path in directory.rglob("*")
+        if path.is_file()
+    )
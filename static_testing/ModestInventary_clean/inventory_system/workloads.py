@@ -0,0 +1,72 @@
+"""Seeded synthetic inventory data shared by ``inventory bench`` and ``benchmarks/``."""
+
+import json
+import random
+from typing import Any
+
+CATEGORIES = ["electronics", "books", "clothing", "furniture", "toys", "garden"]
+WAREHOUSES = ["MEX-01", "MEX-02", "USA-01", "EU-01"]
+USER_LEVELS = ["platinum", "gold", "silver", "bronze", "guest"]
+SEASONS = ["normal", "black_friday", "clearance", "summer", "winter"]
+REGIONS = ["US", "EU", "ASIA"]
+
+Purchase = tuple[str, str, int, bool, str, str]
+
+
+def make_item(index: int, rng: random.Random) -> dict[str, Any]:
+    """Build one inventory record."""
+    category = rng.choice(CATEGORIES)
+    return {
+        "sku": f"SKU-{index:09d}",
+        "name": f"{category.title()} item {index}",
+        "category": category,
+        "quantity": rng.randint(0, 500),
+        "price": round(rng.uniform(1, 2000), 2),
+        "warehouse": rng.choice(WAREHOUSES),
+        "tags": rng.sample(["new", "sale", "fragile", "bulk", "imported"], k=2),
+    }
+
+
+def make_state(target_bytes: int, seed: int = 42) -> dict[str, Any]:
+    """Build a state whose compact JSON encoding is roughly ``target_bytes``.
+
+    Args:
+        target_bytes: Approximate compact size of the generated state
+        seed: Random seed, so runs are reproducible
+
+    Returns:
+        State dictionary with an ``items`` list and a few metadata keys
+    """
+    rng = random.Random(seed)
+    sample_size = len(json.dumps(make_item(0, random.Random(seed)), separators=(",", ":")))
+    count = max(1, target_bytes // (sample_size + 1))
+    return {
+        "user": "benchmark",
+        "version": 1,
+        "warehouses": WAREHOUSES,
+        "items": [make_item(index, rng) for index in range(count)],
+    }
+
+
+def make_purchases(count: int, seed: int = 42) -> list[Purchase]:
+    """Build ``count`` argument tuples for ``calculate_discount``.
+
+    Args:
+        count: Number of purchases
+        seed: Random seed, so runs are reproducible
+
+    Returns:
+        (category, user level, purchase count, holiday, season, region) tuples
+    """
+    rng = random.Random(seed)
+    return [
+        (
+            rng.choice(CATEGORIES),
+            rng.choice(USER_LEVELS),
+            rng.randint(0, 40),
+            rng.random() < 0.1,
+            rng.choice(SEASONS),
+            rng.choice(REGIONS),
+        )
+        for _ in range(count)
+    ]
@@ -0,0 +1,15 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_session_dir(tmp_path_factory, monkeypatch):
+    """Keep login session tokens out of the real home directory."""
+    monkeypatch.setenv("INVENTORY_SESSION_DIR", str(tmp_path_factory.mktemp("session")))
+    monkeypatch.delenv("INVENTORY_REQUIRE_LOGIN", raising=False)
+
+
+@pytest.fixture(autouse=True)
+def _no_ambient_profiling(monkeypatch):
+    """Ignore profiling switches exported in the developer's shell."""
+    for name in ("INVENTORY_PROFILE", "INVENTORY_TRACE_MEMORY", "INVENTORY_PROFILE_OUTPUT"):
+        monkeypatch.delenv(name, raising=False)
@@ -0,0 +1,201 @@
+import errno
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from inventory_system.cli import cli
+from inventory_system.persistence import state_manager
+from inventory_system.utils import backup_manager
+from inventory_system.utils.backup_manager import (
+    create_backup,
+    files_equal,
+    manifest_path_for,
+    verify_backup,
+)
+
+
+@pytest.fixture
+def state_file(tmp_path, monkeypatch):
+    source = tmp_path / "inventory_state.json"
+    source.write_bytes(b"x" * (3 * backup_manager.CHUNK_SIZE + 17))
+    monkeypatch.setattr(backup_manager, "DEFAULT_STATE_FILE", source)
+    return source
+
+
+def test_streaming_compare_detects_late_difference(state_file, tmp_path):
+    copy = create_backup(str(tmp_path / "copy.json"))
+    assert verify_backup(str(copy))
+
+    data = bytearray(copy.read_bytes())
+    data[-1] ^= 1
+    copy.write_bytes(bytes(data))
+    assert not verify_backup(str(copy))
+
+
+def test_size_mismatch_never_reads_contents(state_file, tmp_path, monkeypatch):
+    shorter = tmp_path / "shorter.json"
+    shorter.write_bytes(b"x" * 10)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("file contents were read")
+
+    monkeypatch.setattr(backup_manager, "open", fail, raising=False)
+    assert not files_equal(state_file, shorter)
+
+
+def test_manifest_verification_ignores_live_state(state_file, tmp_path):
+    backup = create_backup(str(tmp_path / "backups"), manifest=True)
+    manifest = manifest_path_for(backup)
+
+    assert manifest.read_text(encoding="utf-8").endswith(f"  {backup.name}\n")
+    state_file.unlink()
+    assert verify_backup(str(backup))
+
+    backup.write_bytes(b"tampered")
+    assert not verify_backup(str(backup))
+
+
+def test_manifest_must_name_its_backup(state_file, tmp_path):
+    backup = create_backup(str(tmp_path / "backups"), manifest=True)
+    renamed = backup.with_name("other.json")
+    backup.rename(renamed)
+    manifest_path_for(backup).rename(manifest_path_for(renamed))
+
+    assert not backup_manager.verify_manifest(renamed)
+
+
+def test_snapshot_falls_back_through_modes(state_file, tmp_path, monkeypatch):
+    target = tmp_path / "snap.json"
+    for mode in ("copy_file_range", "sendfile", "copy"):
+        assert backup_manager.snapshot_file(state_file, target, [mode]) == mode
+        assert target.read_bytes() == state_file.read_bytes()
+        assert not target.samefile(state_file)
+        assert target.stat().st_mtime == state_file.stat().st_mtime
+
+    def unsupported(*args, **kwargs):
+        raise OSError(errno.EOPNOTSUPP, "unsupported")
+
+    monkeypatch.setitem(backup_manager._COPIERS, "reflink", unsupported)
+    monkeypatch.setitem(backup_manager._COPIERS, "copy_file_range", unsupported)
+    monkeypatch.setattr(backup_manager.os, "link", unsupported)
+    assert backup_manager.snapshot_file(state_file, target) == "sendfile"
+    assert not list(tmp_path.glob(".snap.json.*"))
+    with pytest.raises(ValueError):
+        backup_manager.snapshot_file(state_file, target, ["reflink", "hardlink"])
+
+
+def test_snapshot_without_fcntl_skips_reflink(state_file, tmp_path, monkeypatch):
+    monkeypatch.setattr(backup_manager, "fcntl", None)
+    target = tmp_path / "snap.json"
+
+    assert backup_manager.snapshot_file(state_file, target, ["reflink", "copy"]) == "copy"
+    assert target.read_bytes() == state_file.read_bytes()
+
+
+def test_hardlink_snapshot_survives_atomic_save(tmp_path, monkeypatch):
+    source = tmp_path / "inventory_state.json"
+    monkeypatch.setattr(backup_manager, "DEFAULT_STATE_FILE", source)
+    state_manager.save_state({"items": [1]}, source)
+
+    result = backup_manager.snapshot_backup(str(tmp_path / "backups"), manifest=True)
+    state_manager.save_state({"items": [2]}, source)
+
+    assert result.mode in ("reflink", "hardlink")
+    assert json.loads(result.path.read_text(encoding="utf-8")) == {"items": [1]}
+    assert verify_backup(str(result.path))
+
+    copied = backup_manager.snapshot_backup(str(tmp_path / "copy.json"), allow_hardlink=False)
+    assert copied.mode != "hardlink" and not copied.path.samefile(source)
+
+
+@pytest.mark.parametrize("options", [{}, {"snapshot": True}, {"compress": "gzip"}])
+def test_backup_of_an_explicit_source_leaves_the_state_file_alone(tmp_path, options):
+    source = tmp_path / "other.json"
+    source.write_bytes(b"other state")
+
+    backup = create_backup(str(tmp_path / "backups" / "copy.json"), source_path=source, **options)
+
+    assert backup is not None
+    if options.get("compress"):
+        backup = backup_manager.decompress_backup(str(backup), str(tmp_path / "restored.json"))
+    assert backup.read_bytes() == b"other state"
+
+
+def test_cli_snapshot_reports_mode(state_file, tmp_path):
+    result = CliRunner().invoke(cli, ["backup", "--snapshot", "--no-hardlink", str(tmp_path / "b")])
+    assert result.exit_code == 0
+    assert any(mode in result.output for mode in ("reflink", "copy_file_range", "sendfile", "copy"))
+    assert "hardlink" not in result.output
+
+
+def test_fan_out_reads_once_and_isolates_failures(state_file, tmp_path, monkeypatch):
+    reads = []
+    real_open = open
+
+    def counting_open(path, *args, **kwargs):
+        if path == state_file:
+            reads.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(backup_manager, "open", counting_open, raising=False)
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("file")
+    destinations = [
+        str(tmp_path / "local"),
+        str(blocker / "x.json"),
+        str(tmp_path / "archive.json"),
+    ]
+    (tmp_path / "local").mkdir()
+
+    result = backup_manager.fan_out_backup(destinations, manifest=True)
+
+    assert reads == [state_file]
+    assert [item.error is None for item in result.destinations] == [True, False, True]
+    assert result.failed[0].destination == destinations[1]
+    for item in result.destinations:
+        if item.path:
+            assert files_equal(state_file, item.path)
+            assert backup_manager.verify_manifest(item.path)
+            assert item.seconds >= 0
+
+
+def test_fan_out_discards_copies_when_source_read_fails(state_file, tmp_path, monkeypatch):
+    real_open = open
+
+    class Broken:
+        def __init__(self, path):
+            self._file = real_open(path, "rb")
+            self._reads = 0
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self._file.close()
+
+        def read(self, size):
+            self._reads += 1
+            if self._reads > 2:
+                raise OSError(errno.EIO, "disk error")
+            return self._file.read(size)
+
+    monkeypatch.setattr(
+        backup_manager,
+        "open",
+        lambda path, *a, **k: Broken(path) if path == state_file else real_open(path, *a, **k),
+        raising=False,
+    )
+    destinations = [str(tmp_path / "a.json"), str(tmp_path / "b.json")]
+    assert backup_manager.fan_out_backup(destinations) is None
+    assert sorted(p.name for p in tmp_path.iterdir() if not p.name.startswith(".")) == [
+        "inventory_state.json"
+    ]
+
+
+def test_cli_fan_out_reports_each_destination(state_file, tmp_path):
+    result = CliRunner().invoke(
+        cli, ["backup", str(tmp_path / "a.json"), str(tmp_path / "b.json")]
+    )
+    assert result.exit_code == 0
+    assert result.output.count("created at:") == 2
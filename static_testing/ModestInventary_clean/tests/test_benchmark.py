@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from inventory_system import benchmark
+from inventory_system.cli import cli
+from inventory_system.utils import backup_manager
+
+
+def _report(**metrics):
+    return {"version": benchmark.REPORT_VERSION, "metrics": metrics}
+
+
+def test_measure_reports_distribution_and_peak():
+    result = benchmark.measure(lambda: bytearray(1024 * 1024), repeat=3)
+
+    assert len(result["samples"]) == 3
+    assert result["min_seconds"] <= result["median_seconds"] <= result["max_seconds"]
+    assert result["peak_bytes"] >= 1024 * 1024
+    with pytest.raises(ValueError):
+        benchmark.measure(lambda: None, repeat=0)
+
+
+def test_compare_flags_growth_beyond_threshold_and_noise_floor():
+    baseline = _report(
+        slow={"median_seconds": 0.100, "peak_bytes": 10 * 1024 * 1024},
+        tiny={"median_seconds": 0.0001, "peak_bytes": 100},
+        removed={"median_seconds": 1.0, "peak_bytes": 0},
+    )
+    current = _report(
+        slow={"median_seconds": 0.150, "peak_bytes": 10 * 1024 * 1024},
+        tiny={"median_seconds": 0.0003, "peak_bytes": 300},
+        added={"median_seconds": 1.0, "peak_bytes": 0},
+    )
+
+    comparisons = benchmark.compare(current, baseline)
+    regressed = {(item.metric, item.field) for item in comparisons if item.regressed(0.10)}
+
+    assert {item.metric for item in comparisons} == {"slow", "tiny"}
+    assert regressed == {("slow", "median_seconds")}
+    assert not any(item.regressed(0.60) for item in comparisons)
+    with pytest.raises(ValueError):
+        benchmark.compare({"version": 0, "metrics": {}}, baseline)
+
+
+def test_backup_suite_uses_seeded_files_and_leaves_state_path_alone(tmp_path):
+    original = backup_manager.DEFAULT_STATE_FILE
+    report = benchmark.run_suites(["backup"], repeat=1, quick=True, directory=tmp_path)
+
+    assert backup_manager.DEFAULT_STATE_FILE == original
+    assert sorted(report["metrics"]) == sorted(
+        f"backup.{action}.size={benchmark.size_label(size)}"
+        for action in ("create", "verify")
+        for size in benchmark.QUICK_SIZES["backup"]
+    )
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_bench_command_exits_non_zero_on_regression(tmp_path):
+    runner = CliRunner()
+    first = tmp_path / "baseline.json"
+    args = ["bench", "--suite", "discount", "--quick", "--repeat", "1"]
+
+    result = runner.invoke(cli, [*args, "--output", str(first)])
+    assert result.exit_code == 0
+    baseline = json.loads(first.read_text(encoding="utf-8"))
+    assert set(baseline["metrics"]) == {"discount.batch=1000", "discount.batch=10000"}
+
+    compared = runner.invoke(cli, [*args, "--baseline", str(first), "--threshold", "100"])
+    assert compared.exit_code == 0
+
+    baseline["metrics"]["discount.batch=10000"]["median_seconds"] = 1e-6
+    first.write_text(json.dumps(baseline), encoding="utf-8")
+    result = runner.invoke(cli, [*args, "--baseline", str(first)])
+    assert result.exit_code == 1
+    assert "REGRESSION discount.batch=10000" in result.output
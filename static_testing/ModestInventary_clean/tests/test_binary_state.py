@@ -0,0 +1,61 @@
+import pytest
+
+from inventory_system.persistence import binary_state, state_manager
+from inventory_system.persistence.binary_state import BinaryState
+
+PAYLOAD = {
+    "user": "tester",
+    "items": [
+        {"sku": "A-1", "name": "lápiz", "quantity": 3},
+        {"sku": "A-2", "name": "goma", "quantity": 0},
+        {"sku": "B-9", "name": "regla", "quantity": 12},
+    ],
+}
+
+
+@pytest.mark.parametrize("layout", ["json", "lines"])
+def test_json_to_binary_point_lookup(tmp_path, layout):
+    source = tmp_path / "state.json"
+    state_manager.save_state(PAYLOAD, source, layout=layout)
+
+    target = binary_state.json_to_binary(source, tmp_path / "state.bin")
+
+    with BinaryState(target) as binary:
+        assert len(binary) == 3
+        assert binary["B-9"] == {"sku": "B-9", "name": "regla", "quantity": 12}
+        assert "A-1" in binary
+        assert "Z-0" not in binary
+        with pytest.raises(KeyError):
+            binary["Z-0"]
+        assert binary.state == {"user": "tester"}
+
+
+def test_binary_round_trips_to_json(tmp_path):
+    binary_path = binary_state.write_binary_state(
+        tmp_path / "state.bin", PAYLOAD["items"], {"user": "tester"}
+    )
+
+    restored = binary_state.binary_to_json(binary_path, tmp_path / "restored.json")
+
+    assert state_manager.load_state(restored) == PAYLOAD
+    assert state_manager.load_state(binary_path) == PAYLOAD
+
+
+def test_plain_string_items_and_empty_state(tmp_path):
+    path = binary_state.write_binary_state(tmp_path / "a.bin", ["laptop", "mouse"])
+    empty = binary_state.write_binary_state(tmp_path / "b.bin", [])
+
+    with BinaryState(path) as binary, BinaryState(empty) as nothing:
+        assert list(binary) == ["laptop", "mouse"]
+        assert binary["mouse"] == "mouse"
+        assert len(nothing) == 0
+        assert "laptop" not in nothing
+
+
+def test_record_without_key_field_raises_value_error(tmp_path):
+    source = tmp_path / "state.json"
+    state_manager.save_state({"items": [{"sku": "A-1"}, {"name": "sin sku"}]}, source)
+
+    with pytest.raises(ValueError, match="Record 1"):
+        binary_state.json_to_binary(source, tmp_path / "state.bin")
+    assert not (tmp_path / "state.bin").exists()
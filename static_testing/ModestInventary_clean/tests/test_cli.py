@@ -0,0 +1,59 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import click
+
+from benchmarks.bench_import import parse_importtime
+from inventory_system.cli import LAZY_COMMANDS, cli
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _modules_loaded_by(*args):
+    code = (
+        "import sys\n"
+        "from inventory_system.cli import cli\n"
+        f"cli.main({list(args)!r}, standalone_mode=False)\n"
+        "print(','.join(sorted(m for m in sys.modules if m.startswith('inventory_system'))))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    return set(completed.stdout.strip().splitlines()[-1].split(","))
+
+
+def test_help_does_not_import_command_modules():
+    assert _modules_loaded_by("--help") == {"inventory_system", "inventory_system.cli"}
+
+
+def test_login_imports_only_auth():
+    loaded = _modules_loaded_by("login", "admin", "wrong")
+
+    assert "inventory_system.auth" in loaded
+    assert "inventory_system.logic.discount_calculator" not in loaded
+    assert "inventory_system.persistence.state_manager" not in loaded
+    assert "inventory_system.utils.backup_manager" not in loaded
+
+
+def test_lazy_registry_matches_commands():
+    ctx = click.Context(cli)
+    for name, entry in LAZY_COMMANDS.items():
+        command = cli.get_command(ctx, name)
+
+        assert isinstance(command, click.Command)
+        assert command.get_short_help_str(limit=200) == entry.short_help
+
+
+def test_parse_importtime_collects_package_modules():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 | click\n"
+        "import time:        20 |         20 |   inventory_system.auth\n"
+        "import time:        30 |         50 | inventory_system.commands.login\n"
+    )
+
+    assert parse_importtime(stderr) == (
+        150,
+        ["inventory_system.auth", "inventory_system.commands.login"],
+    )
@@ -0,0 +1,41 @@
+import pytest
+
+from inventory_system.persistence import codecs, state_manager
+
+DATA = {
+    "user": "test",
+    "items": [{"sku": f"SKU-{index}", "quantity": index} for index in range(500)],
+}
+
+
+@pytest.mark.parametrize("name", ["state.json.gz", "state.bz2", "state.xz"])
+@pytest.mark.parametrize("layout", ["json", "lines"])
+def test_codec_from_extension_round_trips(tmp_path, name, layout):
+    filepath = state_manager.save_state(DATA, tmp_path / name, layout=layout)
+
+    assert codecs.detect(filepath) is codecs.codec_for_path(filepath)
+    assert state_manager.load_state(filepath) == DATA
+    assert list(state_manager.iter_state_items(filepath)) == DATA["items"]
+
+
+def test_header_is_detected_regardless_of_extension(tmp_path):
+    filepath = state_manager.save_state(DATA, tmp_path / "state.json", codec="bz2")
+
+    assert filepath.read_bytes().startswith(b"#inventory-state-codec bz2\n")
+    assert state_manager.load_state(filepath) == DATA
+
+
+def test_codec_none_overrides_extension(tmp_path):
+    filepath = state_manager.save_state(DATA, tmp_path / "state.json.gz", codec="none")
+
+    assert codecs.detect(filepath) is None
+    assert state_manager.load_state(filepath) == DATA
+
+
+def test_truncated_stream_fails_cleanly(tmp_path, capsys):
+    filepath = state_manager.save_state(DATA, tmp_path / "state.xz")
+    filepath.write_bytes(filepath.read_bytes()[:80])
+
+    assert state_manager.load_state(filepath) is None
+    assert "Error loading state" in capsys.readouterr().out
+    assert state_manager.save_state(DATA, tmp_path / "other.json", codec="zip") is None
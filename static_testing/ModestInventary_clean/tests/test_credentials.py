@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from inventory_system import credentials
+from inventory_system.cli import cli
+from inventory_system.persistence import state_manager
+from inventory_system.credentials import (
+    CredentialStore,
+    VerifiedLoginCache,
+    hash_password,
+    verify_password,
+)
+
+
+def _write(path, users):
+    path.write_text(json.dumps({"version": 1, "users": users}), encoding="utf-8")
+
+
+@pytest.mark.parametrize("algorithm, cost", [("scrypt", 2**10), ("pbkdf2_sha256", 1000)])
+def test_hashes_are_salted_and_verified(algorithm, cost):
+    first = hash_password("s3cret", algorithm, cost)
+    second = hash_password("s3cret", algorithm, cost)
+
+    assert first != second and "s3cret" not in first
+    assert verify_password("s3cret", first) and verify_password("s3cret", second)
+    assert not verify_password("S3cret", first)
+    with pytest.raises(ValueError):
+        verify_password("s3cret", "md5$abc")
+
+
+def test_cache_skips_kdf_for_repeated_logins(tmp_path, monkeypatch):
+    path = tmp_path / "users.json"
+    _write(path, {"alice": hash_password("pw", cost=2**10)})
+    store = CredentialStore(path, VerifiedLoginCache(ttl=60, maxsize=2))
+    calls = []
+    real_derive = credentials._derive
+    monkeypatch.setattr(
+        credentials, "_derive", lambda *args: calls.append(args[1]) or real_derive(*args)
+    )
+
+    assert store.verify("alice", "pw") and store.verify("alice", "pw")
+    assert not store.verify("alice", "wrong") and not store.verify("mallory", "pw")
+    assert len(calls) == 3  # first login, wrong password, unknown user
+    assert store.cache.stats().hits == 1
+
+    _write(path, {"alice": hash_password("new", cost=2**10)})
+    assert not store.verify("alice", "pw")
+    assert store.verify("alice", "new")
+
+
+def test_cache_entries_expire_and_hold_no_plaintext(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(credentials.time, "monotonic", lambda: now[0])
+    cache = VerifiedLoginCache(ttl=5, maxsize=2)
+    for user in ("a", "b", "c"):
+        cache.add(user, "password-" + user, "hash")
+
+    assert cache.stats().size == 2
+    assert not cache.contains("a", "password-a", "hash")
+    assert cache.contains("c", "password-c", "hash")
+    assert all(b"password" not in key for key in cache._entries)
+    now[0] += 6
+    assert not cache.contains("c", "password-c", "hash")
+    assert cache.stats().expired == 1
+
+
+def test_cli_set_password_then_login(tmp_path, monkeypatch):
+    path = tmp_path / "users.json"
+    monkeypatch.setenv("INVENTORY_CREDENTIALS_FILE", str(path))
+    monkeypatch.delenv("INVENTORY_ADMIN_USER", raising=False)
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["set-password", "alice"], input="pw\npw\n")
+    assert result.exit_code == 0
+    assert (path.stat().st_mode & 0o777) == 0o600
+    assert "Welcome, alice" in runner.invoke(cli, ["login", "alice", "pw"]).output
+    assert "Login failed" in runner.invoke(cli, ["login", "alice", "nope"]).output
+
+
+def test_concurrent_set_password_keeps_every_user(tmp_path, monkeypatch):
+    path = tmp_path / "users.json"
+    monkeypatch.setattr(credentials, "hash_password", lambda password, algorithm: f"x${password}")
+    real_write = state_manager.write_atomically
+
+    def slow_write(*args):
+        time.sleep(0.01)  # widen the read-modify-write window
+        return real_write(*args)
+
+    monkeypatch.setattr(state_manager, "write_atomically", slow_write)
+    names = [f"user{index}" for index in range(16)]
+    threads = [
+        threading.Thread(target=credentials.set_password, args=(path, name, "pw")) for name in names
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(json.loads(path.read_text(encoding="utf-8"))["users"]) == sorted(names)
+
+
+def test_set_password_rejects_file_without_users(tmp_path):
+    path = tmp_path / "users.json"
+    path.write_text(json.dumps({"version": 1}), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="no users"):
+        credentials.set_password(path, "alice", "pw")
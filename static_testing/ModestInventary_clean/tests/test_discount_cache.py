@@ -0,0 +1,61 @@
+import pytest
+from click.testing import CliRunner
+
+from inventory_system.cli import cli
+from inventory_system.logic import discount_calculator
+from inventory_system.logic.discount_cache import LRUCache
+from inventory_system.logic.discount_calculator import calculate_discount
+
+
+@pytest.fixture
+def discount_cache():
+    discount_calculator.enable_discount_cache(maxsize=2)
+    yield
+    discount_calculator.disable_discount_cache()
+
+
+def test_cached_results_match_uncached():
+    expected = calculate_discount("books", "gold", 12, True, "summer", "EU")
+    discount_calculator.enable_discount_cache()
+    try:
+        assert calculate_discount("books", "gold", 12, True, "summer", "EU") == expected
+        assert calculate_discount("books", "gold", 12, True, "summer", "EU") == expected
+    finally:
+        discount_calculator.disable_discount_cache()
+
+
+def test_normalized_inputs_share_cache_entry(discount_cache):
+    calculate_discount("books", "gold", 25, False)
+    calculate_discount(" Books ", "GOLD", 99, False, " Normal", "us")
+
+    stats = discount_calculator.discount_cache_stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("c", lambda: 3)
+
+    assert cache.get_or_compute("a", lambda: -1) == 1
+    assert cache.get_or_compute("b", lambda: -2) == -2
+    assert cache.stats().evictions == 2
+
+
+def test_rule_table_change_invalidates_cache(discount_cache, monkeypatch):
+    before = calculate_discount("books", "silver", 0, False)
+    monkeypatch.setitem(discount_calculator.CATEGORY_BONUS, "books", 0.0)
+
+    after = calculate_discount("books", "silver", 0, False)
+
+    assert after == pytest.approx(before - 0.08)
+    assert discount_calculator.discount_cache_stats().invalidations == 1
+
+
+def test_cache_stats_command_reports_disabled():
+    result = CliRunner().invoke(cli, ["cache-stats"])
+
+    assert result.exit_code == 0
+    assert "Discount cache disabled." in result.output
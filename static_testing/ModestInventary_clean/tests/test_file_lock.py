@@ -0,0 +1,83 @@
+import multiprocessing
+import os
+
+import pytest
+
+from inventory_system.persistence import file_lock, state_manager
+
+# file_lock degrades to no-op locks without fcntl, so these tests need it
+fcntl = pytest.importorskip("fcntl")
+
+WRITERS = 4
+INCREMENTS = 25
+
+
+def _increment(state):
+    state["counter"] = state.get("counter", 0) + 1
+    state["history"] = state.get("history", []) + [os.getpid()]
+
+
+def _writer(path):
+    for _ in range(INCREMENTS):
+        if state_manager.update_state(_increment, path) is None:
+            raise SystemExit(1)
+
+
+def _reader(path, stop):
+    last = 0
+    while not stop.is_set():
+        state = state_manager.load_state(path)
+        if state is None or state["counter"] < last or len(state["history"]) != state["counter"]:
+            raise SystemExit(1)
+        last = state["counter"]
+
+
+def test_concurrent_updates_are_never_lost(tmp_path):
+    path = tmp_path / "state.json"
+    state_manager.save_state({"counter": 0, "history": []}, path)
+    stop = multiprocessing.Event()
+    readers = [multiprocessing.Process(target=_reader, args=(path, stop)) for _ in range(4)]
+    writers = [multiprocessing.Process(target=_writer, args=(path,)) for _ in range(WRITERS)]
+    for process in readers + writers:
+        process.start()
+    for process in writers:
+        process.join(60)
+    stop.set()
+    for process in readers:
+        process.join(60)
+
+    assert [process.exitcode for process in readers + writers] == [0] * 8
+    assert state_manager.load_state(path)["counter"] == WRITERS * INCREMENTS
+
+
+def _hold_lock(path, operation):
+    fd = os.open(file_lock.lock_path_for(path), os.O_RDWR | os.O_CREAT)
+    fcntl.flock(fd, operation)
+    return fd
+
+
+def test_writer_times_out_while_lock_is_held(tmp_path, monkeypatch):
+    path = tmp_path / "state.json"
+    state_manager.save_state({"counter": 1}, path)
+    monkeypatch.setenv(state_manager.LOCK_TIMEOUT_ENV, "0.05")
+    before = file_lock.lock_stats()
+
+    fd = _hold_lock(path, fcntl.LOCK_SH)
+    try:
+        assert state_manager.load_state(path) == {"counter": 1}
+        assert state_manager.save_state({"counter": 2}, path) is None
+    finally:
+        os.close(fd)
+
+    stats = file_lock.lock_stats()
+    assert stats.timeouts == before.timeouts + 1
+    assert stats.wait_seconds - before.wait_seconds >= 0.05
+    assert state_manager.save_state({"counter": 2}, path) == path
+
+
+def test_shared_lock_cannot_be_upgraded(tmp_path):
+    path = tmp_path / "state.json"
+    with file_lock.state_lock(path):
+        with pytest.raises(RuntimeError):
+            with file_lock.state_lock(path, exclusive=True):
+                pass
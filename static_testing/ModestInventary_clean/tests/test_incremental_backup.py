@@ -0,0 +1,108 @@
+import io
+import random
+
+import pytest
+from click.testing import CliRunner
+
+from inventory_system.cli import cli
+from inventory_system.utils import incremental_backup
+from inventory_system.utils.incremental_backup import (
+    ChunkParams,
+    ChunkStore,
+    create_incremental_backup,
+    iter_chunks,
+    prune_backups,
+    restore_backup,
+)
+
+PARAMS = ChunkParams(min_size=256, max_size=4096, mask_bits=4)
+
+
+def _records(count, seed=1):
+    rng = random.Random(seed)
+    return [
+        f'{{"sku":"SKU-{index}","quantity":{rng.randint(0, 99)},"price":{rng.random():.4f}}}\n'
+        for index in range(count)
+    ]
+
+
+def test_chunks_reassemble_and_resync_after_insert():
+    records = _records(2000)
+    original = "".join(records).encode()
+    chunks = list(iter_chunks(io.BytesIO(original), PARAMS))
+    assert b"".join(chunks) == original
+    assert all(len(chunk) <= PARAMS.max_size for chunk in chunks)
+
+    edited = "".join(records[:1000] + ['{"sku":"NEW"}\n'] + records[1000:]).encode()
+    changed = set(iter_chunks(io.BytesIO(edited), PARAMS)) - set(chunks)
+    assert len(changed) <= 2
+
+
+def test_incremental_backup_writes_only_changed_chunks(tmp_path):
+    source = tmp_path / "state.jsonl"
+    records = _records(5000)
+    source.write_text("".join(records))
+    store = tmp_path / "store"
+
+    first = create_incremental_backup(store, source, PARAMS)
+    records[2500] = '{"sku":"SKU-2500","quantity":0,"price":0}\n'
+    source.write_text("".join(records))
+    second = create_incremental_backup(store, source, PARAMS)
+
+    assert first.new_chunks == len(set(first.manifest.chunks))
+    assert 1 <= second.new_chunks <= 2
+    assert second.bytes_written < first.bytes_written / 10
+
+    restored = restore_backup(store, first.manifest.backup_id, tmp_path / "old.jsonl")
+    assert restored.read_bytes() != source.read_bytes()
+    latest = restore_backup(store, "latest", tmp_path / "new.jsonl")
+    assert latest.read_bytes() == source.read_bytes()
+
+
+def test_restore_rejects_corrupt_chunk(tmp_path):
+    source = tmp_path / "state.json"
+    source.write_text("".join(_records(500)))
+    result = create_incremental_backup(tmp_path / "store", source, PARAMS)
+    chunk = ChunkStore(tmp_path / "store").chunk_path(result.manifest.chunks[0][0])
+    chunk.write_bytes(b"garbage")
+
+    destination = tmp_path / "restored.json"
+    destination.write_text("keep me")
+    assert restore_backup(tmp_path / "store", "latest", destination) is None
+    assert destination.read_text() == "keep me"
+
+
+def test_prune_keeps_chunks_of_remaining_backups(tmp_path):
+    source = tmp_path / "state.json"
+    store = tmp_path / "store"
+    for seed in range(3):
+        source.write_text("".join(_records(800, seed)))
+        create_incremental_backup(store, source, PARAMS)
+
+    result = prune_backups(store, keep_last=1)
+    remaining = ChunkStore(store).manifests()
+    assert len(result.removed_backups) == 2 and len(remaining) == 1
+    assert result.removed_chunks > 0
+    restored = restore_backup(store, "latest", tmp_path / "out.json")
+    assert restored.read_bytes() == source.read_bytes()
+    assert prune_backups(store, keep_last=1).removed_chunks == 0
+    with pytest.raises(FileNotFoundError):
+        ChunkStore(store).read_manifest("missing")
+
+
+def test_cli_incremental_backup_restore_and_prune(tmp_path, monkeypatch):
+    source = tmp_path / "inventory_state.json"
+    source.write_text("".join(_records(200)))
+    monkeypatch.setattr(incremental_backup, "DEFAULT_STATE_FILE", source)
+    runner = CliRunner()
+    store = str(tmp_path / "store")
+
+    assert "new" in runner.invoke(cli, ["backup", "--incremental", store]).output
+    assert ", 0 new" in runner.invoke(cli, ["backup", "--incremental", store]).output
+    assert len(runner.invoke(cli, ["prune-backups", store, "--list"]).output.splitlines()) == 2
+
+    result = runner.invoke(cli, ["restore-backup", store, str(tmp_path / "out")])
+    assert result.exit_code == 0
+    assert (tmp_path / "out").read_bytes() == source.read_bytes()
+    pruned = runner.invoke(cli, ["prune-backups", store, "--keep-last", "1"])
+    assert "Removed 1 backup(s)" in pruned.output
@@ -0,0 +1,157 @@
+import json
+import random
+
+import pytest
+from click.testing import CliRunner
+
+from inventory_system.cli import cli
+from inventory_system.logic.item_repository import (
+    ItemRepository,
+    SortedIndex,
+    make_item,
+    open_repository,
+    update_repository,
+)
+from inventory_system.persistence import state_manager
+
+
+def _repository():
+    return ItemRepository(
+        [
+            make_item("A-1", "Books", 5, 10.0),
+            make_item("A-2", "books", 0, 20.0),
+            make_item("B-1", "toys", 3, 7.5),
+            make_item("B-2", "toys", 40, 1.0),
+        ]
+    )
+
+
+def test_indexes_answer_queries_and_follow_updates():
+    repository = _repository()
+
+    assert [item.sku for item in repository.low_stock(5)] == ["A-2", "B-1", "A-1"]
+    assert [item.sku for item in repository.by_category("BOOKS")] == ["A-1", "A-2"]
+    assert [item.sku for item in repository.query(category="toys", max_quantity=10)] == ["B-1"]
+
+    repository.adjust_stock("B-2", -39)
+    repository.reprice_category("toys", -10)
+
+    assert [item.sku for item in repository.low_stock(1, limit=2)] == ["A-2", "B-2"]
+    assert repository.get("B-1").price == 6.75
+    assert repository.get("A-1").price == 10.0
+    with pytest.raises(ValueError):
+        repository.adjust_stock("A-2", -1)
+    with pytest.raises(ValueError):
+        repository.add(make_item("A-1", "books", 1, 1.0))
+
+
+def test_sorted_index_matches_sorted_list():
+    rng = random.Random(7)
+    values = [(rng.randint(0, 50), f"SKU-{index}") for index in range(3000)]
+    index = SortedIndex(values)
+    for value in rng.sample(values, 1000):
+        index.remove(value)
+        values.remove(value)
+    for number in range(3000, 4000):
+        value = (rng.randint(0, 50), f"SKU-{number}")
+        index.add(value)
+        values.append(value)
+
+    assert list(index) == sorted(values)
+    assert list(index.below((10,))) == sorted(value for value in values if value[0] < 10)
+    assert len(index) == len(values)
+
+
+def test_updates_persist_and_keep_other_state(tmp_path):
+    path = tmp_path / "state.json"
+    state_manager.save_state({"user": "test", "items": []}, path)
+
+    update_repository(lambda repository: repository.add(make_item("A-1", "books", 2, 9.5)), path)
+    first = open_repository(path)
+    assert open_repository(path) is first
+
+    with pytest.raises(KeyError):
+        update_repository(lambda repository: repository.adjust_stock("missing", 1), path)
+
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved == {
+        "user": "test",
+        "items": [{"sku": "A-1", "category": "books", "quantity": 2, "price": 9.5}],
+    }
+
+    saved["items"][0]["quantity"] = 7
+    state_manager.save_state(saved, path)
+    assert open_repository(path).get("A-1").quantity == 7
+
+
+def test_updates_never_change_a_repository_being_read(tmp_path):
+    path = tmp_path / "state.json"
+    record = {"sku": "A-1", "category": "books", "quantity": 2, "price": 9.5}
+    state_manager.save_state({"items": [record]}, path)
+    reading = open_repository(path)
+
+    update_repository(lambda repository: repository.adjust_stock("A-1", 5), path)
+    with pytest.raises(ValueError):
+        update_repository(lambda repository: repository.adjust_stock("A-1", -100), path)
+
+    assert reading.get("A-1").quantity == 2
+    assert reading.low_stock(2) == [reading.get("A-1")]
+    assert open_repository(path).get("A-1").quantity == 7
+
+
+@pytest.mark.parametrize(
+    ("name", "layout", "codec", "compact"),
+    [
+        ("state.json", "lines", None, False),
+        ("state.json", "json", None, False),
+        ("state.json", "json", "gzip", True),
+        ("state.gz", "lines", "none", False),
+    ],
+)
+def test_updates_keep_the_file_format(tmp_path, name, layout, codec, compact):
+    path = tmp_path / name
+    state = {"user": "test", "items": []}
+    state_manager.save_state(state, path, compact=compact, layout=layout, codec=codec)
+    before = state_manager.state_format(path)
+
+    update_repository(lambda repository: repository.add(make_item("A-1", "books", 2, 9.5)), path)
+
+    assert state_manager.state_format(path) == before
+    assert (before.layout, before.compact) == (layout, compact)
+    assert len(state_manager.load_state(path)["items"]) == 1
+
+    update_repository(len, path, compact=not compact, layout="json", codec="none")
+    assert state_manager.state_format(path) == ("json", "none", not compact)
+
+
+def test_cli_add_adjust_and_query(tmp_path, monkeypatch):
+    monkeypatch.setattr(state_manager, "DEFAULT_STATE_FILE", tmp_path / "state.json")
+    runner = CliRunner()
+
+    assert runner.invoke(cli, ["add", "A-1", "books", "4", "12.5"]).exit_code == 0
+    assert runner.invoke(cli, ["add", "B-1", "toys", "30", "2"]).exit_code == 0
+    assert "A-1: 1 in stock" in runner.invoke(cli, ["adjust-stock", "A-1", "-3"]).output
+
+    result = runner.invoke(cli, ["query", "--low-stock", "5"])
+    assert "A-1" in result.output and "B-1" not in result.output
+    assert "1 item(s), stock value 12.50" in result.output
+
+    failed = runner.invoke(cli, ["adjust-stock", "A-1", "-2"])
+    assert failed.exit_code == 1
+    assert "cannot go below zero" in failed.output
+
+
+def test_cli_save_keeps_the_catalog(tmp_path, monkeypatch):
+    path = tmp_path / "state.json"
+    monkeypatch.setattr(state_manager, "DEFAULT_STATE_FILE", path)
+    runner = CliRunner()
+
+    assert runner.invoke(cli, ["add", "AB-1", "tools", "3", "9.5"]).exit_code == 0
+    saved = runner.invoke(cli, ["save", "--layout", "lines"])
+    assert saved.exit_code == 0 and "(1 item(s))" in saved.output
+    assert state_manager.state_format(path).layout == "lines"
+
+    result = runner.invoke(cli, ["query"])
+    assert result.exit_code == 0 and "AB-1" in result.output
+    assert runner.invoke(cli, ["add", "AB-2", "tools", "1", "2"]).exit_code == 0
+    assert "2 item(s)" in runner.invoke(cli, ["query"]).output
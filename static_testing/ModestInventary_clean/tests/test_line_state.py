@@ -0,0 +1,52 @@
+from inventory_system.persistence import line_state, state_manager
+
+PAYLOAD = {
+    "user": "tester",
+    "items": [{"sku": "A-1", "name": "lápiz\ttab"}, {"sku": "A-2", "name": "goma"}],
+    "tags": [],
+    "meta": {"version": 2},
+}
+
+
+def test_lines_layout_round_trip(tmp_path):
+    filepath = tmp_path / "state.jsonl"
+
+    state_manager.save_state(PAYLOAD, filepath, layout="lines")
+
+    assert line_state.is_line_state(filepath)
+    assert state_manager.load_state(filepath) == PAYLOAD
+
+
+def test_iter_state_items_streams_records(tmp_path):
+    filepath = tmp_path / "state.jsonl"
+    state_manager.save_state(PAYLOAD, filepath, layout="lines")
+
+    assert list(state_manager.iter_state_items(filepath)) == PAYLOAD["items"]
+    assert list(state_manager.iter_state_items(filepath, key="missing")) == []
+
+
+def test_iter_state_items_reads_plain_json(tmp_path):
+    filepath = tmp_path / "state.json"
+    state_manager.save_state(PAYLOAD, filepath)
+
+    assert list(state_manager.iter_state_items(filepath)) == PAYLOAD["items"]
+
+
+def test_lazy_state_decodes_only_requested_keys(tmp_path, monkeypatch):
+    filepath = tmp_path / "state.jsonl"
+    state_manager.save_state(PAYLOAD, filepath, layout="lines")
+    decoded = []
+    real_loads = line_state.json.loads
+
+    def tracking_loads(raw):
+        value = real_loads(raw)
+        decoded.append(value)
+        return value
+
+    with state_manager.open_state(filepath) as lazy:
+        monkeypatch.setattr(line_state.json, "loads", tracking_loads)
+
+        assert list(lazy) == ["user", "items", "tags", "meta"]
+        assert lazy.count("items") == 2
+        assert lazy["meta"] == {"version": 2}
+        assert decoded == [{"version": 2}]
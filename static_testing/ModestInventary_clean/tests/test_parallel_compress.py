@@ -0,0 +1,82 @@
+import gzip
+import io
+import lzma
+import random
+
+import pytest
+from click.testing import CliRunner
+
+from inventory_system.cli import cli
+from inventory_system.persistence import state_manager
+from inventory_system.utils import backup_manager
+from inventory_system.utils.parallel_compress import compress_stream, decompress_stream
+
+
+def _data(size):
+    rng = random.Random(3)
+    words = [b"sku", b"books", b"toys", b"quantity", b"price", b"warehouse"]
+    return b" ".join(rng.choice(words) for _ in range(size // 6))[:size]
+
+
+@pytest.mark.parametrize(
+    "format_name, opener", [("gzip", gzip.decompress), ("xz", lzma.decompress)]
+)
+def test_blocks_form_a_standard_stream(format_name, opener):
+    data = _data(300_000)
+    compressed = io.BytesIO()
+    stats = compress_stream(io.BytesIO(data), compressed, format_name, workers=3, block_size=64_000)
+
+    assert stats.blocks == 5 and stats.bytes_in == len(data)
+    assert stats.bytes_out == len(compressed.getvalue()) and stats.ratio > 1
+    assert opener(compressed.getvalue()) == data
+
+    restored = io.BytesIO()
+    compressed.seek(0)
+    assert decompress_stream(compressed, restored, format_name) == len(data)
+    assert restored.getvalue() == data
+
+
+def test_output_does_not_depend_on_worker_count():
+    data = _data(200_000)
+    outputs = set()
+    for workers in (1, 2, 5):
+        compressed = io.BytesIO()
+        compress_stream(io.BytesIO(data), compressed, workers=workers, block_size=10_000)
+        outputs.add(compressed.getvalue())
+    assert len(outputs) == 1
+
+    empty = io.BytesIO()
+    compress_stream(io.BytesIO(b""), empty)
+    assert gzip.decompress(empty.getvalue()) == b""
+
+
+def test_compressed_backup_round_trip(tmp_path, monkeypatch):
+    source = tmp_path / "inventory_state.json"
+    monkeypatch.setattr(backup_manager, "DEFAULT_STATE_FILE", source)
+    state_manager.save_state({"items": [{"sku": str(index)} for index in range(5000)]}, source)
+    runner = CliRunner()
+
+    result = runner.invoke(
+        cli, ["backup", str(tmp_path / "b"), "--compress", "xz", "--workers", "2"]
+    )
+    assert result.exit_code == 0 and "2 worker(s)" in result.output
+    backup = tmp_path / "b.xz"
+    assert lzma.decompress(backup.read_bytes()) == source.read_bytes()
+
+    result = runner.invoke(cli, ["restore-backup", str(backup), str(tmp_path / "restored.json")])
+    assert result.exit_code == 0
+    assert state_manager.load_state(tmp_path / "restored.json") == state_manager.load_state(source)
+    assert backup_manager.decompress_backup(str(source), str(tmp_path / "x")) is None
+
+
+def test_invalid_compression_level_is_rejected(tmp_path, monkeypatch):
+    source = tmp_path / "inventory_state.json"
+    monkeypatch.setattr(backup_manager, "DEFAULT_STATE_FILE", source)
+    state_manager.save_state({"items": []}, source)
+
+    assert backup_manager.compressed_backup(str(tmp_path / "b"), "gzip", level=12) is None
+    result = CliRunner().invoke(
+        cli, ["backup", str(tmp_path / "b"), "--compress", "gzip", "--level", "12"]
+    )
+    assert result.exit_code == 2
+    assert not any(path.name.startswith("b") for path in tmp_path.iterdir())
@@ -0,0 +1,82 @@
+import json
+
+from click.testing import CliRunner
+
+from inventory_system import profiling
+from inventory_system.cli import cli
+
+
+def test_profile_report_has_stable_layout(tmp_path):
+    report = tmp_path / "profile.json"
+    result = CliRunner().invoke(
+        cli, ["--profile", "--profile-output", str(report), "discount", "electronics", "gold", "15"]
+    )
+
+    assert result.exit_code == 0
+    assert "Discount: 31.0%" in result.output
+    data = json.loads(report.read_text(encoding="utf-8"))
+    assert sorted(data) == [
+        "command", "elapsed_seconds", "memory", "profile", "started", "version"
+    ]
+    assert data["version"] == profiling.REPORT_VERSION
+    assert data["command"] == ["discount"]
+    assert report.stat().st_mode & 0o777 == 0o600
+    assert data["memory"] is None
+    top = data["profile"]["top_functions"]
+    assert 0 < len(top) <= profiling.TOP_N
+    assert sorted(top[0]) == [
+        "calls", "cumulative_seconds", "function", "own_seconds", "primitive_calls"
+    ]
+    cumulative = [row["cumulative_seconds"] for row in top]
+    assert cumulative == sorted(cumulative, reverse=True)
+
+
+def test_trace_memory_from_environment_writes_one_report_per_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("INVENTORY_TRACE_MEMORY", "1")
+    monkeypatch.setenv("INVENTORY_PROFILE_OUTPUT", str(tmp_path))
+    runner = CliRunner()
+
+    for _ in range(2):
+        assert runner.invoke(cli, ["discount", "electronics", "gold", "15"]).exit_code == 0
+
+    reports = sorted(tmp_path.glob("discount-*.json"))
+    assert len(reports) == 2
+    data = json.loads(reports[0].read_text(encoding="utf-8"))
+    assert data["profile"] is None
+    memory = data["memory"]
+    assert memory["peak_bytes"] >= memory["current_bytes"] > 0
+    assert all(set(site) == {"site", "bytes", "blocks"} for site in memory["top_allocations"])
+
+
+def test_report_is_written_when_the_command_fails(tmp_path):
+    report = tmp_path / "failed.json"
+    result = CliRunner().invoke(
+        cli, ["--profile", "--profile-output", str(report), "load", "unexpected-argument"]
+    )
+
+    assert result.exit_code == 2
+    assert json.loads(report.read_text(encoding="utf-8"))["command"][0] == "load"
+
+
+def test_no_report_without_options(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert CliRunner().invoke(cli, ["discount", "electronics", "gold", "15"]).exit_code == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_report_never_records_command_arguments(tmp_path, monkeypatch):
+    monkeypatch.setenv("INVENTORY_ADMIN_USER", "admin")
+    monkeypatch.setenv("INVENTORY_ADMIN_PASSWORD", "s3cret")
+    report = tmp_path / "login.json"
+    report.write_text("{}", encoding="utf-8")
+    report.chmod(0o644)
+
+    result = CliRunner().invoke(
+        cli, ["--profile", "--profile-output", str(report), "login", "admin", "s3cret"]
+    )
+
+    assert result.exit_code == 0
+    text = report.read_text(encoding="utf-8")
+    assert "s3cret" not in text
+    assert json.loads(text)["command"] == ["login"]
+    assert report.stat().st_mode & 0o777 == 0o600
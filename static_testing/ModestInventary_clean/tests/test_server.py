@@ -0,0 +1,92 @@
+import http.client
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from click.testing import CliRunner
+
+from inventory_system import service
+from inventory_system.cli import cli
+from inventory_system.client import InventoryClient, parse_address
+from inventory_system.server import create_server
+
+
+@pytest.fixture(params=["unix", "http"])
+def server_address(request, tmp_path):
+    if request.param == "unix":
+        address = f"unix:{tmp_path / 'inventory.sock'}"
+    else:
+        address = "http://127.0.0.1:0"
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        server = create_server(address, executor, tmp_path / "state.json")
+        if request.param == "http":
+            address = f"http://127.0.0.1:{server.server_address[1]}"
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield address
+        server.shutdown()
+        server.server_close()
+
+
+def test_dispatch_batch_preserves_order():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        responses = service.dispatch(
+            [
+                {
+                    "command": "discount",
+                    "params": {"category": "books", "user_level": "gold", "purchase_count": 0},
+                },
+                {"command": "unknown"},
+            ],
+            executor,
+        )
+
+    assert responses[0]["ok"] is True
+    assert 0.0 <= responses[0]["result"]["discount"] <= 0.50
+    assert responses[1] == {"ok": False, "error": "Unknown command: unknown"}
+
+
+def test_parse_address_rejects_remote_hosts():
+    assert parse_address("unix:/tmp/inventory.sock") == ("unix", "/tmp/inventory.sock")
+    with pytest.raises(ValueError):
+        parse_address("http://10.0.0.1:8765")
+
+
+def test_server_save_and_load_round_trip(server_address):
+    with InventoryClient(server_address) as client:
+        saved = client.call("save", {"data": {"items": ["desk"]}})
+        loaded = client.call("load")
+
+    assert saved["path"].endswith("state.json")
+    assert loaded["data"] == {"items": ["desk"]}
+
+
+def test_cli_forwards_commands_to_server(server_address):
+    runner = CliRunner()
+
+    local = runner.invoke(cli, ["discount", "books", "silver", "5"])
+    remote = runner.invoke(cli, ["--server", server_address, "discount", "books", "silver", "5"])
+
+    assert remote.exit_code == 0
+    assert remote.output == local.output
+
+
+@pytest.mark.parametrize("content_type", [None, "text/plain", "application/x-www-form-urlencoded"])
+def test_http_server_rejects_non_json_content_types(tmp_path, content_type):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        server = create_server("http://127.0.0.1:0", executor, tmp_path / "state.json")
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+            headers = {"Content-Type": content_type} if content_type else {}
+            connection.request("POST", "/", body=b'{"command": "save"}', headers=headers)
+            response = connection.getresponse()
+            body = json.loads(response.read())
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    assert response.status == 415 and body["ok"] is False
+    assert not (tmp_path / "state.json").exists()
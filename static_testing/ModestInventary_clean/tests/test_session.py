@@ -0,0 +1,70 @@
+import pytest
+from click.testing import CliRunner
+
+from inventory_system import credentials, service, session
+from inventory_system.cli import cli
+from inventory_system.persistence import state_manager
+
+
+def test_token_round_trip_and_tampering(tmp_path):
+    issued = session.issue_token("alice", ttl=60, directory=tmp_path)
+
+    assert session.current_session(tmp_path) == issued
+    assert session.verify_token(issued.token, tmp_path).subject == "alice"
+    assert session.verify_token(issued.token, tmp_path, now=issued.expires_at + 1) is None
+
+    payload, _, signature = issued.token.partition(".")
+    forged = session._b64encode(b'{"sub":"root","iat":0,"exp":9999999999,"jti":"x"}')
+    assert session.verify_token(f"{forged}.{signature}", tmp_path) is None
+    assert session.verify_token(f"{payload}.{signature[:-2]}AA", tmp_path) is None
+    assert session.verify_token("garbage", tmp_path) is None
+    assert (tmp_path / session.TOKEN_FILE).stat().st_mode & 0o777 == 0o600
+    with pytest.raises(ValueError):
+        session.issue_token("alice", ttl=0, directory=tmp_path)
+
+
+def test_revoke_one_and_revoke_all(tmp_path):
+    first = session.issue_token("alice", directory=tmp_path)
+    assert session.revoke(tmp_path) == first
+    assert session.verify_token(first.token, tmp_path) is None
+
+    second = session.issue_token("alice", directory=tmp_path)
+    assert session.verify_token(second.token, tmp_path) == second
+    session.revoke_all(tmp_path)
+    session.issue_token("bob", directory=tmp_path)
+    assert session.verify_token(second.token, tmp_path) is None
+
+
+def test_admin_commands_use_token_without_credentials(tmp_path, monkeypatch):
+    monkeypatch.setenv("INVENTORY_REQUIRE_LOGIN", "1")
+    monkeypatch.setenv("INVENTORY_ADMIN_USER", "admin")
+    monkeypatch.setenv("INVENTORY_ADMIN_PASSWORD", "securepass")
+    monkeypatch.setattr(state_manager, "DEFAULT_STATE_FILE", tmp_path / "state.json")
+    runner = CliRunner()
+
+    denied = runner.invoke(cli, ["add", "A-1", "books", "1", "2"])
+    assert denied.exit_code == 1 and "Admin session required" in denied.output
+
+    assert "Session valid" in runner.invoke(cli, ["login", "admin", "securepass"]).output
+    monkeypatch.delenv("INVENTORY_ADMIN_PASSWORD")
+    monkeypatch.setattr(credentials, "verify_password", lambda *args: pytest.fail("KDF used"))
+    assert runner.invoke(cli, ["add", "A-1", "books", "1", "2"]).exit_code == 0
+
+    assert "Logged out admin" in runner.invoke(cli, ["logout"]).output
+    assert runner.invoke(cli, ["adjust-stock", "A-1", "1"]).exit_code == 1
+
+
+def test_server_requires_token_for_admin_requests(tmp_path, monkeypatch):
+    monkeypatch.setenv("INVENTORY_REQUIRE_LOGIN", "1")
+    state_file = tmp_path / "state.json"
+    request = {"command": "save", "params": {"data": {"user": "x"}}}
+
+    denied = service.dispatch(request, state_file=state_file)
+    assert denied == {"ok": False, "error": "Admin session required: run `inventory login` first"}
+    assert service.dispatch({**request, "token": "garbage"}, state_file=state_file)["ok"] is False
+    assert not state_file.exists()
+    assert service.dispatch({"command": "load"}, state_file=state_file)["ok"] is True
+
+    issued = session.issue_token("admin")
+    assert service.dispatch({**request, "token": issued.token}, state_file=state_file)["ok"]
+    assert state_file.exists()
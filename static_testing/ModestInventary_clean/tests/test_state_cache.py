@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from inventory_system.persistence import state_manager
+
+
+@pytest.fixture
+def load_cache():
+    state_manager.enable_load_cache()
+    yield
+    state_manager.disable_load_cache()
+
+
+def test_repeated_loads_hit_cache_and_return_copies(tmp_path, load_cache):
+    filepath = tmp_path / "state.json"
+    filepath.write_text('{"items": ["desk"]}', encoding="utf-8")
+
+    first = state_manager.load_state(filepath)
+    first["items"].append("chair")
+    second = state_manager.load_state(filepath)
+
+    assert second == {"items": ["desk"]}
+    stats = state_manager.load_cache_stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+def test_view_is_read_only(tmp_path, load_cache):
+    filepath = tmp_path / "state.json"
+    state_manager.save_state({"items": ["desk"]}, filepath)
+
+    view = state_manager.load_state_view(filepath)
+
+    assert view["items"] == ("desk",)
+    with pytest.raises(TypeError):
+        view["user"] = "intruder"
+    assert state_manager.load_cache_stats().write_throughs == 1
+    assert state_manager.load_cache_stats().hits == 1
+
+
+def test_external_change_invalidates_entry(tmp_path, load_cache):
+    filepath = tmp_path / "state.json"
+    state_manager.save_state({"items": ["desk"]}, filepath)
+    filepath.write_text('{"items": ["lamp", "sofa"]}', encoding="utf-8")
+    os.utime(filepath, ns=(1, 1))
+
+    assert state_manager.load_state(filepath) == {"items": ["lamp", "sofa"]}
+    assert state_manager.load_cache_stats().stale == 1
+
+
+def test_unserializable_values_are_not_cached(tmp_path, load_cache):
+    filepath = tmp_path / "state.json"
+    state_manager.save_state({1: "int key"}, filepath)
+
+    assert state_manager.load_state(filepath) == {"1": "int key"}
+    assert state_manager.load_cache_stats().write_throughs == 0
@@ -64,3 +64,32 @@ def test_backup_copies_state_file(tmp_path, monkeypatch):
 def test_discount_calculator_caps_maximum_discount():
     value = calculate_discount("books", "gold", 99, True)
     assert value <= 0.30
+
+
+def test_save_state_compact_round_trip(tmp_path):
+    filepath = tmp_path / "state.json"
+    payload = {"items": ["book", "lápiz"], "user": "tester"}
+
+    state_manager.save_state(payload, filepath, compact=True)
+
+    assert filepath.read_text(encoding="utf-8") == '{"items":["book","lápiz"],"user":"tester"}'
+    assert state_manager.load_state(filepath) == payload
+
+
+def test_save_state_failure_keeps_previous_file(tmp_path, monkeypatch):
+    filepath = tmp_path / "state.json"
+    state_manager.save_state({"items": ["old"]}, filepath)
+
+    def crash(data, file_obj, compact, layout):
+        file_obj.write(b'{"items": [')
+        raise ValueError("simulated crash")
+
+    monkeypatch.setattr(state_manager, "_write_state", crash)
+
+    assert state_manager.save_state({"items": ["new"]}, filepath) is None
+    assert state_manager.load_state(filepath) == {"items": ["old"]}
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        ".state.json.gate",
+        ".state.json.lock",
+        "state.json",
+    ]
@@ -0,0 +1,69 @@
+import json
+import time
+
+import pytest
+
+from inventory_system.persistence import state_manager
+from inventory_system.persistence.write_behind import WriteBehindSaver
+
+
+def test_updates_are_coalesced_into_one_write(tmp_path):
+    filepath = tmp_path / "state.json"
+    with WriteBehindSaver(filepath, initial={"user": "test"}, interval=60) as saver:
+        for count in range(1000):
+            saver.update({"counter": count})
+        assert saver.flush(timeout=5)
+        stats = saver.stats()
+
+    assert json.loads(filepath.read_text(encoding="utf-8")) == {"user": "test", "counter": 999}
+    assert (stats.updates, stats.writes, stats.pending_updates) == (1000, 1, 0)
+
+
+def test_close_writes_pending_updates(tmp_path):
+    filepath = tmp_path / "state.json"
+    saver = WriteBehindSaver(filepath, initial={}, interval=60)
+    saver.update({"items": ["desk"]})
+
+    assert saver.close()
+    assert state_manager.load_state(filepath) == {"items": ["desk"]}
+    with pytest.raises(RuntimeError):
+        saver.update({"items": []})
+
+
+def test_dirty_bytes_threshold_triggers_write(tmp_path):
+    filepath = tmp_path / "state.json"
+    with WriteBehindSaver(filepath, initial={}, interval=60, max_dirty_bytes=64) as saver:
+        saver.update({"note": "x" * 100})
+        deadline = time.monotonic() + 5
+        while saver.stats().writes == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert saver.stats().writes == 1
+        assert filepath.exists()
+
+
+def test_failed_write_keeps_updates_pending(tmp_path, monkeypatch):
+    filepath = tmp_path / "state.json"
+    monkeypatch.setattr(state_manager, "save_state", lambda *args, **kwargs: None)
+    saver = WriteBehindSaver(filepath, initial={}, interval=60)
+    saver.update({"counter": 1})
+
+    assert not saver.flush(timeout=5)
+    assert saver.last_error is not None
+    assert saver.stats().pending_updates == 1
+
+    monkeypatch.undo()
+    assert saver.flush(timeout=5)
+    assert saver.close()
+    assert state_manager.load_state(filepath) == {"counter": 1}
+
+
+def test_failed_write_over_byte_threshold_backs_off(tmp_path, monkeypatch):
+    monkeypatch.setattr(state_manager, "save_state", lambda *args, **kwargs: None)
+    saver = WriteBehindSaver(tmp_path / "state.json", initial={}, interval=0.2, max_dirty_bytes=8)
+    saver.update({"note": "x" * 100})
+    time.sleep(0.5)
+
+    assert 1 <= saver.stats().failures <= 4
+    monkeypatch.undo()
+    assert saver.close()